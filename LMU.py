@@ -1,6 +1,10 @@
-from mastermind import *
+import random
+from player import Player
+from scsa import list_to_str
 
 class LMU(Player):
+    exact_only = True # Only last_response[0] and last_response[2] are read
+
     def __init__(self):
         self.player_name = "LMU Advanced Pairwise Deduction"
         
@@ -0,0 +1,124 @@
+# File contains the mapping between the symbols used as colors and dense color indices.
+# Codes stay strings with one symbol per peg; the engine scores them through the indices.
+
+# Symbols used for the colors of a game, the first 26 are the classic "A" to "Z"
+# (string.ascii_uppercase + string.ascii_lowercase + string.digits + "+/", spelled out since string imports re)
+DEFAULT_SYMBOLS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+
+
+def default_colors(num_colors: int) -> list[str]:
+    """Gets the default colors for a number of colors
+
+    Args:
+        num_colors (int): Number of colors, between 1 and len(DEFAULT_SYMBOLS).
+
+    Raises:
+        ValueError: There are not enough default symbols.
+
+    Returns:
+        list[str]: Returns the first num_colors symbols of DEFAULT_SYMBOLS.
+    """
+
+    if num_colors < 1 or num_colors > len(DEFAULT_SYMBOLS):
+
+        raise ValueError(
+            "Number of colors must be between 1 and "
+            + str(len(DEFAULT_SYMBOLS))
+            + "."
+        )
+
+    return list(DEFAULT_SYMBOLS[:num_colors])
+
+
+class Alphabet:
+    """Maps colors (single-character symbols) to indices 0 to len(colors) - 1"""
+
+    def __init__(self, colors: list[str]):
+        """Constructor for Alphabet
+
+        Args:
+            colors (list[str]): All possible colors, each a single character.
+
+        Raises:
+            ValueError: A color is not a single character or appears twice.
+        """
+
+        if any(len(color) != 1 for color in colors):
+
+            raise ValueError("Colors must be single characters.")
+
+        if len(set(colors)) != len(colors):
+
+            raise ValueError("Colors must be distinct.")
+
+        self.colors = list(colors)
+        self.index = {color: i for i, color in enumerate(colors)}
+
+        # Up to 255 colors below code point 256 are translated by bytes.translate in C
+        self.fast = len(colors) < 256 and all(ord(color) < 256 for color in colors)
+
+        if self.fast:
+
+            self.invalid = 255
+            table = bytearray([self.invalid]) * 256
+
+            for i, color in enumerate(colors):
+
+                table[ord(color)] = i
+
+            self.table = bytes(table)
+
+        else:
+
+            self.invalid = len(colors)
+            self.table = None
+
+    def __len__(self) -> int:
+
+        return len(self.colors)
+
+    def encode(self, code: str):
+        """Converts a code to the indices of its colors in a single pass
+
+        Args:
+            code (str): Code to convert.
+
+        Returns:
+            bytes or list[int]: Returns index of the color of each peg, self.invalid for pegs that are not colors.
+        """
+
+        if self.fast:
+
+            try:
+
+                return code.encode("latin-1").translate(self.table)
+
+            except UnicodeEncodeError:
+
+                return [self.index.get(peg, self.invalid) for peg in code]
+
+        return [self.index.get(peg, self.invalid) for peg in code]
+
+    def decode(self, indices) -> str:
+        """Converts indices of colors to a code
+
+        Args:
+            indices (iterable[int]): Index of the color of each peg.
+
+        Returns:
+            str: Returns code.
+        """
+
+        return "".join(self.colors[i] for i in indices)
+
+    def is_valid(self, code: str) -> bool:
+        """Checks whether every peg of a code is a color
+
+        Args:
+            code (str): Code to check.
+
+        Returns:
+            bool: Returns True if every peg is one of the colors and False otherwise.
+        """
+
+        return self.invalid not in self.encode(code)
@@ -0,0 +1,255 @@
+# File contains a player that searches for codes consistent with all feedback by simulated annealing.
+# It is meant for mid-size boards, where enumerating all codes is too slow and LMU's swaps waste guesses.
+
+import math
+import random
+import time
+from consistent import ConsistentSearchPlayer
+
+
+class Annealing(ConsistentSearchPlayer):
+    """Mastermind Player that anneals permutations of the known colors until one is consistent with all feedback
+
+    A move swaps two pegs of different colors and is scored in O(history) by the change of the exact pins of
+    the two positions. Moves that make the code less consistent are accepted with probability exp(-change / T),
+    where the temperature T falls from initial_temperature to final_temperature over the time of each guess.
+    The time of each guess is a share of the time left in the round, out of time_cutoff seconds, which is
+    Round.time_cutoff if a planner configures the player (see planning.py) and must be given to match it
+    otherwise.
+    """
+
+    def __init__(
+        self,
+        initial_temperature: float = 2.0,
+        final_temperature: float = 0.1,
+        cooling: str = "geometric",
+        time_cutoff: float = 5,
+        time_share: float = 0.8,
+        turn_share: float = 0.05,
+        count_colors: bool = True,
+    ):
+        """Constructor for Annealing
+
+        Args:
+            initial_temperature (float, optional): Temperature at the start of each guess. Defaults to 2.0.
+            final_temperature (float, optional): Temperature at the end of the time of each guess. Defaults to 0.1.
+            cooling (str, optional): "geometric" or "linear" decrease of the temperature over time. Defaults to "geometric".
+            time_cutoff (float, optional): Seconds allowed per round, as Round.time_cutoff. Defaults to 5.
+            time_share (float, optional): Share of time_cutoff the player uses, the rest is a safety margin. Defaults to 0.8.
+            turn_share (float, optional): Share of the remaining time of the round used per guess. Defaults to 0.05.
+            count_colors (bool, optional): Whether to learn the count of every color first. Defaults to True.
+
+        Raises:
+            ValueError: Cooling schedule is not recognized.
+        """
+
+        super().__init__(count_colors)
+
+        if cooling not in ["geometric", "linear"]:
+
+            raise ValueError("Unrecognized cooling schedule.")
+
+        self.player_name = "Annealing"
+        self.initial_temperature = initial_temperature
+        self.final_temperature = final_temperature
+        self.cooling = cooling
+        self.time_cutoff = time_cutoff
+        self.time_share = time_share
+        self.turn_share = turn_share
+
+        self.time_used = 0.0  # Seconds spent in make_guess this round
+        self.current = None  # Code the annealing continues from in the next guess
+
+    def configure(self, plan) -> None:
+        """Takes the time allowed per round from the plan of a geometry
+
+        Args:
+            plan (Plan): Plan of the geometry, see planning.py.
+        """
+
+        self.time_cutoff = plan.round_time
+
+        return
+
+    def start_round(self) -> None:
+        """Forgets the previous round"""
+
+        super().start_round()
+
+        self.time_used = 0.0
+        self.current = None
+
+        return
+
+    def start_search(self) -> None:
+        """Forgets the code annealed before the counts of the colors were known"""
+
+        self.current = None
+
+        return
+
+    def temperature(self, progress: float) -> float:
+        """Computes the temperature of the cooling schedule
+
+        Args:
+            progress (float): Share of the time of the guess used so far, between 0 and 1.
+
+        Returns:
+            float: Returns temperature.
+        """
+
+        if self.cooling == "geometric":
+
+            return self.initial_temperature * (
+                self.final_temperature / self.initial_temperature
+            ) ** progress
+
+        return self.initial_temperature + progress * (
+            self.final_temperature - self.initial_temperature
+        )
+
+    def neighbor(self, code: list[str], colors: list[str]) -> list[str]:
+        """Changes one peg of a code, for when the counts of the colors are not known
+
+        Args:
+            code (list[str]): Code to change.
+            colors (list[str]): All possible colors that can be used to generate a code.
+
+        Returns:
+            list[str]: Returns changed copy of code.
+        """
+
+        code = list(code)
+        code[random.randrange(len(code))] = random.choice(colors)
+
+        return code
+
+    def search(self, board_length: int, colors: list[str]) -> str:
+        """Anneals from the best code of the last guess until a consistent code is found or the time runs out
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]): All possible colors that can be used to generate a code.
+
+        Returns:
+            str: Returns consistent code, or the best code that has not been guessed.
+        """
+
+        start = time.perf_counter()
+        budget = max(0.0, self.time_cutoff * self.time_share - self.time_used)
+        budget *= self.turn_share
+        deadline = start + budget
+
+        code = self.current
+
+        if code is None:
+
+            code = self.random_code(board_length, colors)
+
+        code = list(code)
+        permutation = bool(self.colors_left)
+
+        if permutation:
+
+            missing = self.missing_exact(code)
+            cost = sum(abs(lacking) for _, lacking in missing)
+
+        else:
+
+            cost = self.fitness("".join(code))
+
+        best = list(code)
+        best_cost = cost
+        temperature = self.initial_temperature
+        step = 0
+
+        # Once the share of the round is used up, the best code of the last guess is guessed right away
+        while best_cost > 0 and budget > 0:
+
+            # The clock is only read every few moves, as a move takes about as long as reading it
+            if step % 32 == 0:
+
+                now = time.perf_counter()
+
+                if now > deadline:
+
+                    break
+
+                temperature = self.temperature((now - start) / budget)
+
+            step += 1
+
+            if permutation:
+
+                i = random.randrange(board_length)
+                j = random.randrange(board_length)
+                a = code[i]
+                b = code[j]
+
+                if a == b:
+
+                    continue
+
+                change, moves = self.swap_change(missing, i, j, a, b)
+
+            else:
+
+                candidate = self.neighbor(code, colors)
+                change = self.fitness("".join(candidate)) - cost
+
+            if change <= 0 or random.random() < math.exp(-change / temperature):
+
+                if permutation:
+
+                    code[i] = b
+                    code[j] = a
+                    missing = moves
+
+                else:
+
+                    code = candidate
+
+                cost += change
+
+                if cost < best_cost:
+
+                    best = list(code)
+                    best_cost = cost
+
+        self.current = best
+        guess = "".join(best)
+        guessed = {guess for guess, _, _, _ in self.history}
+
+        while guess in guessed:
+
+            guess = "".join(self.random_code(board_length, colors))
+
+        return guess
+
+    def make_guess(
+        self,
+        board_length: int,
+        colors: list[str],
+        scsa_name: str,
+        last_response: tuple[int, int, int],
+    ) -> str:
+        """Makes a guess of the secret code for Mastermind
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]]): All possible colors that can be used to generate a code.
+            scsa_name (str): Name of SCSA used to generate secret code.
+            last_response (tuple[int, int, int]): (First element in tuple is the number of pegs that match exactly with the secret
+                                           code for the previous guess, the second element is the number of pegs that are
+                                           the right color, but in the wrong location for the previous guess, and the third
+                                           element is the number of guesses so far.)
+
+        Returns:
+            str: Returns guess
+        """
+
+        start = time.perf_counter()
+        guess = super().make_guess(board_length, colors, scsa_name, last_response)
+        self.time_used += time.perf_counter() - start
+
+        return guess
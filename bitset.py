@@ -0,0 +1,251 @@
+# File contains sets of codes stored as bits of a Python int, where bit r is set if the code of rank r is in the set.
+# Constraints of a response are built from one bitset per (position, color) with AND, OR and popcount,
+# so pruning the codes consistent with a response takes a few operations on len(colors) ** board_length bits.
+# Example: 7 pegs and 5 colors make 78125 codes, which fit in about 10 KB of bits.
+
+from codes import code_space_size, feedback, iterate_codes
+
+
+class CodeIndex:
+    """Bitsets of the codes with each color at each position, for all codes of a geometry"""
+
+    def __init__(self, board_length: int, colors: list[str], codes=None):
+        """Constructor for CodeIndex
+
+        Args:
+            board_length (int): Number of pegs.
+            colors (list[str]): All possible colors that can be used to generate a code.
+            codes (sequence of str, optional): All codes in rank order, e.g. SharedCodes published by another
+                                               process, None to enumerate them. Defaults to None.
+        """
+
+        self.board_length = board_length
+        self.colors = list(colors)
+        self.color_index = {color: i for i, color in enumerate(colors)}
+        self.size = code_space_size(board_length, len(colors))
+        self.full = (1 << self.size) - 1
+        self.codes = codes
+
+        if codes is None:
+
+            self.codes = [
+                code for chunk in iterate_codes(board_length, colors) for code in chunk
+            ]
+
+        # Ranks with color c at position i form runs of num_colors ** (board_length - 1 - i) codes,
+        # one run in every num_colors times longer period
+        num_colors = len(colors)
+        self.position_color = []
+
+        for i in range(board_length):
+
+            run = num_colors ** (board_length - 1 - i)
+            period = run * num_colors
+            repeats = self.size // period
+            spread = ((1 << (period * repeats)) - 1) // ((1 << period) - 1)
+
+            self.position_color.append(
+                [(((1 << run) - 1) << (c * run)) * spread for c in range(num_colors)]
+            )
+
+    def at_least(self, bitsets: list[int], most: int) -> list[int]:
+        """Counts in how many of several bitsets each code is
+
+        Args:
+            bitsets (list[int]): Sets of codes.
+            most (int): Largest count of interest.
+
+        Returns:
+            list[int]: Returns sets of codes in at least m of the bitsets, for m from 0 to most.
+        """
+
+        counts = [self.full] + [0] * most
+
+        for bits in bitsets:
+
+            for m in range(most, 0, -1):
+
+                counts[m] |= counts[m - 1] & bits
+
+        return counts
+
+    def exact_mask(self, guess: str, exact: int) -> int:
+        """Finds the codes with a number of pegs that match a guess exactly
+
+        Args:
+            guess (str): Guess of secret code.
+            exact (int): Number of pegs that match exactly.
+
+        Returns:
+            int: Returns set of codes with exactly that many exact matches.
+        """
+
+        bitsets = [
+            self.position_color[i][self.color_index[peg]]
+            for i, peg in enumerate(guess)
+        ]
+        counts = self.at_least(bitsets, exact + 1)
+
+        return counts[exact] & ~counts[exact + 1]
+
+    def common_mask(self, guess: str, common: int) -> int:
+        """Finds the codes that have a number of colors in common with a guess, counted like Round.process_guess
+
+        Args:
+            guess (str): Guess of secret code.
+            common (int): Sum over colors of the smaller of the counts of the color in the guess and the code.
+
+        Returns:
+            int: Returns set of codes with that many colors in common.
+        """
+
+        # sums[t] is the set of codes with t colors in common with the colors of the guess handled so far
+        sums = {0: self.full}
+
+        for color in set(guess):
+
+            guess_count = guess.count(color)
+            c = self.color_index[color]
+            counts = self.at_least(
+                [self.position_color[i][c] for i in range(self.board_length)],
+                guess_count,
+            )
+            counts.append(0)  # Common colors are capped at the count in the guess
+
+            new_sums = {}
+
+            for total, bits in sums.items():
+
+                for m in range(guess_count + 1):
+
+                    if total + m > common:
+
+                        break
+
+                    matches = bits & counts[m] & ~counts[m + 1]
+
+                    if matches:
+
+                        new_sums[total + m] = new_sums.get(total + m, 0) | matches
+
+            sums = new_sums
+
+        return sums.get(common, 0)
+
+    def ranks(self, bits: int):
+        """Enumerates the ranks of the codes in a set in increasing order
+
+        Args:
+            bits (int): Set of codes.
+
+        Yields:
+            int: Rank of code.
+        """
+
+        data = bits.to_bytes((self.size + 7) // 8, "little")
+
+        for offset, byte in enumerate(data):
+
+            while byte:
+
+                low = byte & -byte
+                yield offset * 8 + low.bit_length() - 1
+                byte ^= low
+
+
+class CandidateSet:
+    """Immutable set of the codes consistent with a history, as a bitset over a CodeIndex"""
+
+    __slots__ = ("index", "bits")
+
+    # Sets with at most one code per this many codes of the geometry are filtered by scoring each code,
+    # which is then cheaper than operations on bitsets of the whole code space
+    FALLBACK_RATIO = 1024
+
+    def __init__(self, index: CodeIndex, bits: int = None):
+        """Constructor for CandidateSet
+
+        Args:
+            index (CodeIndex): Index of all codes of the geometry.
+            bits (int, optional): Set of codes, None for all codes. Defaults to None.
+        """
+
+        self.index = index
+        self.bits = index.full if bits is None else bits
+
+    def __len__(self) -> int:
+
+        return self.bits.bit_count()
+
+    def __contains__(self, code: str) -> bool:
+
+        rank = 0
+
+        for peg in code:
+
+            rank = rank * len(self.index.colors) + self.index.color_index[peg]
+
+        return (self.bits >> rank) & 1 == 1
+
+    def __iter__(self):
+
+        codes = self.index.codes
+
+        return (codes[rank] for rank in self.index.ranks(self.bits))
+
+    def codes(self) -> list[str]:
+        """Lists the codes of the set
+
+        Returns:
+            list[str]: Returns codes in rank order.
+        """
+
+        return list(self)
+
+    def filter(self, guess: str, exact: int, other: int) -> "CandidateSet":
+        """Keeps the codes that would have given the same response as Round.process_guess
+
+        Args:
+            guess (str): Guess that was made.
+            exact (int): Number of pegs that matched exactly.
+            other (int): Number of pegs that were the right color, but in the wrong location.
+
+        Returns:
+            CandidateSet: Returns set of the codes that are still possible.
+        """
+
+        if len(self) * self.FALLBACK_RATIO <= self.index.size:
+
+            return self.filter_codes(guess, exact, other)
+
+        bits = self.bits & self.index.exact_mask(guess, exact)
+
+        if bits:
+
+            bits &= self.index.common_mask(guess, exact + other)
+
+        return CandidateSet(self.index, bits)
+
+    def filter_codes(self, guess: str, exact: int, other: int) -> "CandidateSet":
+        """Keeps the codes that would have given the same response by scoring every code of the set
+
+        Args:
+            guess (str): Guess that was made.
+            exact (int): Number of pegs that matched exactly.
+            other (int): Number of pegs that were the right color, but in the wrong location.
+
+        Returns:
+            CandidateSet: Returns set of the codes that are still possible.
+        """
+
+        response = (exact, other)
+        codes = self.index.codes
+        bits = 0
+
+        for rank in self.index.ranks(self.bits):
+
+            if feedback(guess, codes[rank]) == response:
+
+                bits |= 1 << rank
+
+        return CandidateSet(self.index, bits)
@@ -0,0 +1,371 @@
+# File contains utilities to enumerate and index the space of secret codes.
+# Codes are strings of colors, ranked as numbers in base len(colors) with the first peg as most significant digit.
+
+import functools
+import itertools
+import math
+from operator import eq
+
+
+def code_space_size(board_length: int, num_colors: int) -> int:
+    """Computes number of possible codes
+
+    Args:
+        board_length (int): Number of pegs.
+        num_colors (int): Number of colors.
+
+    Returns:
+        int: Returns num_colors ** board_length.
+    """
+
+    return num_colors**board_length
+
+
+@functools.lru_cache(maxsize=64)
+def color_index(colors: tuple[str]) -> dict[str, int]:
+    """Maps each color to its digit in ranks, built once per tuple of colors
+
+    Args:
+        colors (tuple[str]): All possible colors that can be used to generate a code.
+
+    Returns:
+        dict[str, int]: Returns position of every color, which must not be modified.
+    """
+
+    return {color: i for i, color in enumerate(colors)}
+
+
+def rank_code(code: str, colors: list[str]) -> int:
+    """Converts a code to its position in the enumeration of all codes
+
+    Args:
+        code (str): Code to rank.
+        colors (list[str]): All possible colors that can be used to generate a code.
+
+    Returns:
+        int: Returns rank of code, between 0 and len(colors) ** len(code) - 1.
+    """
+
+    index = color_index(tuple(colors))
+    num_colors = len(colors)
+    rank = 0
+
+    for peg in code:
+
+        rank = rank * num_colors + index[peg]
+
+    return rank
+
+
+def unrank_code(rank: int, board_length: int, colors: list[str]) -> str:
+    """Converts a position in the enumeration of all codes to the code
+
+    Args:
+        rank (int): Rank of code, between 0 and len(colors) ** board_length - 1.
+        board_length (int): Number of pegs.
+        colors (list[str]): All possible colors that can be used to generate a code.
+
+    Returns:
+        str: Returns code with the given rank.
+    """
+
+    num_colors = len(colors)
+    code = [colors[0]] * board_length
+
+    for i in range(board_length - 1, -1, -1):
+
+        rank, digit = divmod(rank, num_colors)
+        code[i] = colors[digit]
+
+    return "".join(code)
+
+
+def product_from(symbols, board_length: int, start: int = 0):
+    """Enumerates tuples of symbols in the order of itertools.product, from the tuple of a given rank
+
+    The tuple of rank start is found by unranking it, so that later ranges cost no more than earlier ones.
+    The tuples that follow are the product of the remaining positions after every prefix of that tuple.
+
+    Args:
+        symbols (list): Symbols of every position.
+        board_length (int): Number of positions.
+        start (int, optional): Rank of first tuple. Defaults to 0.
+
+    Returns:
+        iterator: Returns iterator of tuples of length board_length.
+    """
+
+    num_symbols = len(symbols)
+
+    if start == 0:
+
+        return itertools.product(symbols, repeat=board_length)
+
+    if start >= num_symbols**board_length:
+
+        return iter(())
+
+    digits = [0] * board_length
+
+    for i in range(board_length - 1, -1, -1):
+
+        start, digits[i] = divmod(start, num_symbols)
+
+    segments = []
+
+    # Position i takes the values after its digit (from its digit for the last position)
+    # behind the prefix of the first tuple, followed by every suffix
+    for i in range(board_length - 1, -1, -1):
+
+        prefix = tuple(symbols[digit] for digit in digits[:i])
+        first = digits[i] if i == board_length - 1 else digits[i] + 1
+
+        for value in range(first, num_symbols):
+
+            head = prefix + (symbols[value],)
+            segments.append(
+                map(
+                    head.__add__,
+                    itertools.product(symbols, repeat=board_length - 1 - i),
+                )
+            )
+
+    return itertools.chain.from_iterable(segments)
+
+
+def iterate_codes(
+    board_length: int,
+    colors: list[str],
+    chunk_size: int = 4096,
+    start: int = 0,
+    stop: int = None,
+):
+    """Enumerates codes in rank order in chunks of bounded size
+
+    Args:
+        board_length (int): Number of pegs.
+        colors (list[str]): All possible colors that can be used to generate a code.
+        chunk_size (int, optional): Maximum number of codes per chunk. Defaults to 4096.
+        start (int, optional): Rank of first code. Defaults to 0.
+        stop (int, optional): Rank after last code, None for all codes. Defaults to None.
+
+    Yields:
+        list[str]: Chunk of consecutive codes.
+    """
+
+    codes = product_from(colors, board_length, start)
+
+    if stop is not None:
+
+        codes = itertools.islice(codes, max(0, stop - start))
+
+    while True:
+
+        chunk = ["".join(code) for code in itertools.islice(codes, chunk_size)]
+
+        if len(chunk) == 0:
+
+            return
+
+        yield chunk
+
+
+def iterate_code_blocks(
+    board_length: int,
+    num_colors: int,
+    chunk_size: int = 4096,
+    start: int = 0,
+    stop: int = None,
+):
+    """Enumerates codes in rank order as blocks of color indices
+
+    Each block holds up to chunk_size codes, stored one after the other as board_length bytes
+    with the index of the color of each peg.
+
+    Args:
+        board_length (int): Number of pegs.
+        num_colors (int): Number of colors, at most 256.
+        chunk_size (int, optional): Maximum number of codes per block. Defaults to 4096.
+        start (int, optional): Rank of first code. Defaults to 0.
+        stop (int, optional): Rank after last code, None for all codes. Defaults to None.
+
+    Yields:
+        bytes: Block of consecutive codes.
+    """
+
+    codes = product_from(range(num_colors), board_length, start)
+
+    if stop is not None:
+
+        codes = itertools.islice(codes, max(0, stop - start))
+
+    while True:
+
+        block = bytes(
+            itertools.chain.from_iterable(itertools.islice(codes, chunk_size))
+        )
+
+        if len(block) == 0:
+
+            return
+
+        yield block
+
+
+def codes_with_k_colors(board_length: int, colors: list[str], k: int):
+    """Enumerates codes that use exactly k distinct colors
+
+    Args:
+        board_length (int): Number of pegs.
+        colors (list[str]): All possible colors that can be used to generate a code.
+        k (int): Number of distinct colors.
+
+    Yields:
+        str: Code using exactly k colors.
+    """
+
+    for code in itertools.product(colors, repeat=board_length):
+
+        if len(set(code)) == k:
+
+            yield "".join(code)
+
+
+def count_codes_with_k_colors(board_length: int, num_colors: int, k: int) -> int:
+    """Computes number of codes that use exactly k distinct colors
+
+    Args:
+        board_length (int): Number of pegs.
+        num_colors (int): Number of colors.
+        k (int): Number of distinct colors.
+
+    Returns:
+        int: Returns C(num_colors, k) times the number of surjections from the pegs onto k colors.
+    """
+
+    surjections = sum(
+        (-1) ** i * math.comb(k, i) * (k - i) ** board_length for i in range(k + 1)
+    )
+
+    return math.comb(num_colors, k) * surjections
+
+
+def codes_without_repeats(board_length: int, colors: list[str]):
+    """Enumerates codes the OnlyOnce SCSA can generate
+
+    If there are at least board_length colors no color is repeated. Otherwise, like OnlyOnce, the first
+    len(colors) pegs use every color once and the remaining pegs are unrestricted.
+
+    Args:
+        board_length (int): Number of pegs.
+        colors (list[str]): All possible colors that can be used to generate a code.
+
+    Yields:
+        str: Code without repeated colors.
+    """
+
+    if len(colors) >= board_length:
+
+        for code in itertools.permutations(colors, board_length):
+
+            yield "".join(code)
+
+        return
+
+    for prefix in itertools.permutations(colors):
+
+        for suffix in itertools.product(colors, repeat=board_length - len(colors)):
+
+            yield "".join(prefix) + "".join(suffix)
+
+
+def count_codes_without_repeats(board_length: int, num_colors: int) -> int:
+    """Computes number of codes the OnlyOnce SCSA can generate
+
+    Args:
+        board_length (int): Number of pegs.
+        num_colors (int): Number of colors.
+
+    Returns:
+        int: Returns number of codes enumerated by codes_without_repeats.
+    """
+
+    if num_colors >= board_length:
+
+        return math.perm(num_colors, board_length)
+
+    return math.factorial(num_colors) * num_colors ** (board_length - num_colors)
+
+
+def codes_first_last(board_length: int, colors: list[str]):
+    """Enumerates codes the FirstLast SCSA can generate (first and last pegs have the same color)
+
+    Args:
+        board_length (int): Number of pegs, at least 2.
+        colors (list[str]): All possible colors that can be used to generate a code.
+
+    Yields:
+        str: Code whose first and last colors are the same.
+    """
+
+    for code in itertools.product(colors, repeat=board_length - 1):
+
+        yield "".join(code) + code[0]
+
+
+def count_codes_first_last(board_length: int, num_colors: int) -> int:
+    """Computes number of codes the FirstLast SCSA can generate
+
+    Args:
+        board_length (int): Number of pegs, at least 2.
+        num_colors (int): Number of colors.
+
+    Returns:
+        int: Returns num_colors ** (board_length - 1).
+    """
+
+    return num_colors ** (board_length - 1)
+
+
+def feedback(guess: str, answer: str) -> tuple[int, int]:
+    """Scores a guess against an answer like Round.process_guess
+
+    Args:
+        guess (str): Guess of secret code.
+        answer (str): Secret code.
+
+    Returns:
+        tuple[int, int]: (number of pegs that match exactly with the answer,
+                         number of pegs that are the right color, but in the wrong location)
+    """
+
+    exact = sum(map(eq, guess, answer))
+    common = sum(min(guess.count(color), answer.count(color)) for color in set(guess))
+
+    return (exact, common - exact)
+
+
+def partition_counts(guess: str, answers: list[str]) -> dict[tuple[int, int], int]:
+    """Counts how many answers give each feedback to a guess
+
+    Args:
+        guess (str): Guess of secret code.
+        answers (list[str]): Possible secret codes.
+
+    Returns:
+        dict[tuple[int, int], int]: Returns {(exact, other): number of answers giving that feedback}.
+    """
+
+    counts = {}
+
+    # feedback() inlined, since this is the inner loop of every player that scores guesses
+    guess_counts = [(color, guess.count(color)) for color in set(guess)]
+
+    for answer in answers:
+
+        exact = sum(map(eq, guess, answer))
+        common = sum(min(count, answer.count(color)) for color, count in guess_counts)
+        response = (exact, common - exact)
+        counts[response] = counts.get(response, 0) + 1
+
+    return counts
@@ -0,0 +1,241 @@
+# File contains the base of players that search for codes consistent with all feedback.
+# See evolution.py and annealing.py for players that search for them without enumerating all codes.
+
+import random
+from abc import abstractmethod
+from operator import eq
+from player import Player
+
+
+class ConsistentSearchPlayer(Player):
+    """Mastermind Player that counts the colors first and then guesses codes found by a search of its subclass
+
+    Like LMU, the player first guesses one color at a time to learn how often every color appears (colors_left),
+    unless count_colors is False. Afterwards, search should return a code that is consistent with every response
+    if it finds one, and the code that is closest to consistent otherwise.
+    """
+
+    def __init__(self, count_colors: bool = True):
+        """Constructor for ConsistentSearchPlayer
+
+        Args:
+            count_colors (bool, optional): Whether to learn the count of every color first. Defaults to True.
+        """
+
+        self.player_name = ""
+        self.count_colors = count_colors
+
+        self.history = []  # (guess, exact, other, color counts of guess) for every guess of the round
+        self.colors_left = {}  # Number of pegs of each color, once known
+        self.counts = {}  # Number of pegs of each color counted so far
+        self.counted = 0  # Number of colors counted so far
+        self.last_guess = None
+
+    @abstractmethod
+    def search(self, board_length: int, colors: list[str]) -> str:
+        """Searches for a code that is consistent with the history
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]): All possible colors that can be used to generate a code.
+
+        Raises:
+            NotImplementedError: Function must be implemented by subclasses.
+
+        Returns:
+            str: Returns consistent code, or the best code that has not been guessed.
+        """
+
+        raise NotImplementedError
+
+    def start_round(self) -> None:
+        """Forgets the previous round"""
+
+        self.history = []
+        self.colors_left = {}
+        self.counts = {}
+        self.counted = 0
+
+        return
+
+    def start_search(self) -> None:
+        """Prepares the search once the counts of the colors are known"""
+
+        return
+
+    def fitness(self, code: str) -> int:
+        """Measures how far a code is from being consistent with the history
+
+        Args:
+            code (str): Code that could be the answer.
+
+        Returns:
+            int: Returns sum of |exact - exact'| + |other - other'| over the history, where (exact', other')
+                 is the response the guess would have received if code were the answer; 0 if code is consistent.
+        """
+
+        if self.colors_left:
+
+            # Permutations of the known colors only differ in their exact pins, as other = common - exact
+            # where common is the same for the code and the answer
+            return sum(
+                abs(sum(map(eq, guess, code)) - exact)
+                for guess, exact, _, guess_counts in self.history
+                if len(guess_counts) > 1
+            )
+
+        code_counts = {}
+
+        for peg in code:
+
+            code_counts[peg] = code_counts.get(peg, 0) + 1
+
+        total = 0
+
+        for guess, exact, other, guess_counts in self.history:
+
+            code_exact = sum(map(eq, guess, code))
+            common = 0
+
+            for color, count in guess_counts.items():
+
+                common += min(count, code_counts.get(color, 0))
+
+            total += abs(code_exact - exact) + abs(common - code_exact - other)
+
+        return total
+
+    def random_code(self, board_length: int, colors: list[str]) -> list[str]:
+        """Creates a random code that uses the known colors
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]): All possible colors that can be used to generate a code.
+
+        Returns:
+            list[str]: Returns color of each peg.
+        """
+
+        if self.colors_left:
+
+            code = [
+                color for color, count in self.colors_left.items() for _ in range(count)
+            ]
+            random.shuffle(code)
+
+            return code
+
+        return random.choices(colors, k=board_length)
+
+    def missing_exact(self, code: str) -> list[tuple[str, int]]:
+        """Finds how many exact pins a permutation of the known colors lacks for each guess that is not one color
+
+        Args:
+            code (str): Code that uses the known colors.
+
+        Returns:
+            list[tuple[str, int]]: Returns (guess, exact - exact') for each guess, negative if code has too many.
+        """
+
+        return [
+            (guess, exact - sum(map(eq, guess, code)))
+            for guess, exact, _, guess_counts in self.history
+            if len(guess_counts) > 1
+        ]
+
+    @staticmethod
+    def swap_change(
+        missing: list[tuple[str, int]], i: int, j: int, a: str, b: str
+    ) -> tuple[int, list[tuple[str, int]]]:
+        """Scores swapping two pegs of different colors in O(history), as only the exact pins of i and j change
+
+        Args:
+            missing (list[tuple[str, int]]): Result of missing_exact for the code.
+            i (int): Position of first peg.
+            j (int): Position of second peg.
+            a (str): Color at position i.
+            b (str): Color at position j.
+
+        Returns:
+            tuple[int, list[tuple[str, int]]]: (change of fitness, result of missing_exact after the swap).
+        """
+
+        change = 0
+        moves = []
+
+        for guess, lacking in missing:
+
+            gained = (guess[i] == b) + (guess[j] == a)
+            gained -= (guess[i] == a) + (guess[j] == b)
+            change += abs(lacking - gained) - abs(lacking)
+            moves.append((guess, lacking - gained))
+
+        return (change, moves)
+
+    def make_guess(
+        self,
+        board_length: int,
+        colors: list[str],
+        scsa_name: str,
+        last_response: tuple[int, int, int],
+    ) -> str:
+        """Makes a guess of the secret code for Mastermind
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]]): All possible colors that can be used to generate a code.
+            scsa_name (str): Name of SCSA used to generate secret code.
+            last_response (tuple[int, int, int]): (First element in tuple is the number of pegs that match exactly with the secret
+                                           code for the previous guess, the second element is the number of pegs that are
+                                           the right color, but in the wrong location for the previous guess, and the third
+                                           element is the number of guesses so far.)
+
+        Returns:
+            str: Returns guess
+        """
+
+        if last_response[2] == 0:
+
+            self.start_round()
+
+        else:
+
+            guess_counts = {}
+
+            for peg in self.last_guess:
+
+                guess_counts[peg] = guess_counts.get(peg, 0) + 1
+
+            self.history.append(
+                (self.last_guess, last_response[0], last_response[1], guess_counts)
+            )
+
+        if self.count_colors and not self.colors_left:
+
+            # The last guess was all one color, so its exact pins count that color
+            if last_response[2] > 0:
+
+                if last_response[0] > 0:
+
+                    self.counts[colors[self.counted]] = last_response[0]
+
+                self.counted += 1
+
+            found = sum(self.counts.values())
+
+            if found < board_length and self.counted < len(colors) - 1:
+
+                self.last_guess = colors[self.counted] * board_length
+
+                return self.last_guess
+
+            if found < board_length:
+
+                self.counts[colors[-1]] = board_length - found
+
+            self.colors_left = self.counts
+            self.start_search()
+
+        self.last_guess = self.search(board_length, colors)
+
+        return self.last_guess
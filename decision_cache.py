@@ -0,0 +1,547 @@
+# File contains a persistent cache of the guesses a deterministic player makes for each history.
+# Example: player = CachedPlayer(Minimax(time_budget=None), DecisionCache("minimax.cache")); play rounds;
+# player.cache.save()
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+from collections import OrderedDict
+from player import GameState, Player, StatelessPlayer
+
+# File format: header, index of (digest, offset) sorted by digest, then records from least to most recently used.
+# Each record is key length, guess length, key and guess. Lookups bisect the index of the memory-mapped file.
+MAGIC = b"MMDC"
+VERSION = 1
+HEADER = struct.Struct("<4sHI")  # magic, version, number of records
+INDEX_ENTRY = struct.Struct("<QI")  # digest of key, offset of record
+RECORD = struct.Struct("<HH")  # length of key, length of guess
+
+# SCSAs that treat all colors alike, so that histories differing by a relabeling of colors share a decision
+SYMMETRIC_SCSAS = {
+    "InsertColors",
+    "TwoColor",
+    "TwoColorAlternating",
+    "OnlyOnce",
+    "FirstLast",
+    "UsuallyFewer",
+    "PreferFewer",
+}
+
+logger = logging.getLogger(__name__)
+
+
+def make_key(
+    player_name: str,
+    board_length: int,
+    colors: list[str],
+    scsa_name: str,
+    history: tuple,
+) -> bytes:
+    """Builds the canonical key of a decision
+
+    Args:
+        player_name (str): Name of player.
+        board_length (int): Number of pegs of secret code.
+        colors (list[str]): All possible colors that can be used to generate a code.
+        scsa_name (str): Name of SCSA used to generate secret code.
+        history (tuple): (guess, exact, other) for every guess made so far.
+
+    Returns:
+        bytes: Returns key that is equal for equal arguments only.
+    """
+
+    fields = [player_name, str(board_length), "".join(colors), scsa_name]
+    fields += [
+        guess + " " + str(exact) + " " + str(other) for guess, exact, other in history
+    ]
+
+    return "\x1f".join(fields).encode("utf-8")
+
+
+def canonical_colors(colors: list[str], history: tuple) -> dict:
+    """Relabels colors in the order of their first use in a history
+
+    Args:
+        colors (list[str]): All possible colors that can be used to generate a code.
+        history (tuple): (guess, exact, other) for every guess made so far.
+
+    Returns:
+        dict: Returns color -> canonical color, where the i-th color used is colors[i] and unused colors keep
+              their order.
+    """
+
+    relabel = {}
+
+    for guess, _, _ in history:
+
+        for color in guess:
+
+            if color not in relabel:
+
+                relabel[color] = colors[len(relabel)]
+
+    rest = iter(colors[len(relabel) :])
+
+    for color in colors:
+
+        if color not in relabel:
+
+            relabel[color] = next(rest)
+
+    return relabel
+
+
+def relabel_guess(guess: str, relabel: dict) -> str:
+
+    return "".join(relabel.get(color, color) for color in guess)
+
+
+def digest(key: bytes) -> int:
+
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+class DecisionCache:
+    """Size-bounded map from keys of histories to guesses, with least recently used eviction, stored in a file"""
+
+    def __init__(self, path: str, max_entries: int = 100000):
+        """Constructor for DecisionCache
+
+        Args:
+            path (str): File the cache is loaded from, if it exists, and saved to.
+            max_entries (int, optional): Largest number of decisions kept. Defaults to 100000.
+
+        Raises:
+            ValueError: File is not a decision cache.
+        """
+
+        self.path = path
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # Decisions used or added since loading, least recently used first
+        self.hits = 0
+        self.misses = 0
+
+        self.file = None
+        self.map = None
+        self.size = 0  # Number of records in the file
+
+        self.open()
+
+    def open(self) -> None:
+        """Maps the file of the cache into memory, if it exists and is not empty"""
+
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+
+            return
+
+        self.file = open(self.path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.size = HEADER.unpack_from(self.map, 0)
+
+        if magic != MAGIC or version != VERSION:
+
+            self.close()
+
+            raise ValueError("Not a decision cache: " + self.path)
+
+    def close(self) -> None:
+        """Unmaps the file of the cache without saving"""
+
+        if self.map is not None:
+
+            self.map.close()
+            self.file.close()
+
+        self.file = None
+        self.map = None
+        self.size = 0
+
+    def read_record(self, offset: int) -> tuple[bytes, str]:
+        """Reads a record of the file
+
+        Args:
+            offset (int): Offset of the record.
+
+        Returns:
+            tuple[bytes, str]: (key, guess).
+        """
+
+        key_length, guess_length = RECORD.unpack_from(self.map, offset)
+        start = offset + RECORD.size
+        key = self.map[start : start + key_length]
+        guess = self.map[start + key_length : start + key_length + guess_length]
+
+        return (key, guess.decode("utf-8"))
+
+    def lookup(self, key: bytes) -> str:
+        """Looks a key up in the file by bisecting its index
+
+        Args:
+            key (bytes): Key of decision.
+
+        Returns:
+            str: Returns guess, None if the key is not in the file.
+        """
+
+        if self.map is None:
+
+            return None
+
+        target = digest(key)
+        low = 0
+        high = self.size
+
+        while low < high:
+
+            middle = (low + high) // 2
+            entry = INDEX_ENTRY.unpack_from(
+                self.map, HEADER.size + middle * INDEX_ENTRY.size
+            )
+
+            if entry[0] < target:
+
+                low = middle + 1
+
+            else:
+
+                high = middle
+
+        # Keys with the same digest are next to each other
+        for i in range(low, self.size):
+
+            entry_digest, offset = INDEX_ENTRY.unpack_from(
+                self.map, HEADER.size + i * INDEX_ENTRY.size
+            )
+
+            if entry_digest != target:
+
+                break
+
+            record_key, guess = self.read_record(offset)
+
+            if record_key == key:
+
+                return guess
+
+        return None
+
+    def get(self, key: bytes) -> str:
+        """Gets the decision for a key and marks it as most recently used
+
+        Args:
+            key (bytes): Key of decision.
+
+        Returns:
+            str: Returns guess, None if the decision is not cached.
+        """
+
+        if key in self.entries:
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+
+            return self.entries[key]
+
+        guess = self.lookup(key)
+
+        if guess is None:
+
+            self.misses += 1
+
+            return None
+
+        self.hits += 1
+        self.put(key, guess)
+
+        return guess
+
+    def put(self, key: bytes, guess: str) -> None:
+        """Adds a decision as most recently used
+
+        Args:
+            key (bytes): Key of decision.
+            guess (str): Guess made for the key.
+        """
+
+        self.entries[key] = guess
+        self.entries.move_to_end(key)
+
+        if len(self.entries) > self.max_entries:
+
+            self.entries.popitem(last=False)
+
+    def records(self):
+        """Enumerates all decisions, from least to most recently used
+
+        Yields:
+            tuple[bytes, str]: (key, guess).
+        """
+
+        if self.map is not None:
+
+            # Records follow the index, in order of use
+            offset = HEADER.size + self.size * INDEX_ENTRY.size
+
+            for _ in range(self.size):
+
+                key, guess = self.read_record(offset)
+                offset += RECORD.size + len(key) + len(guess.encode("utf-8"))
+
+                if key not in self.entries:
+
+                    yield (key, guess)
+
+        yield from self.entries.items()
+
+    def __len__(self) -> int:
+
+        return sum(1 for _ in self.records())
+
+    def save(self) -> None:
+        """Writes the max_entries most recently used decisions to the file, replacing it atomically"""
+
+        records = list(self.records())[-self.max_entries :]
+
+        if self.max_entries == 0:
+
+            records = []
+
+        data = bytearray()
+        index = []
+        start = HEADER.size + len(records) * INDEX_ENTRY.size
+
+        for key, guess in records:
+
+            encoded = guess.encode("utf-8")
+            index.append((digest(key), start + len(data)))
+            data += RECORD.pack(len(key), len(encoded)) + key + encoded
+
+        index.sort()
+
+        temporary = self.path + ".tmp"
+
+        with open(temporary, "wb") as file:
+
+            file.write(HEADER.pack(MAGIC, VERSION, len(records)))
+
+            for entry in index:
+
+                file.write(INDEX_ENTRY.pack(*entry))
+
+            file.write(data)
+
+        self.close()
+        os.replace(temporary, self.path)
+        self.entries.clear()
+        self.open()
+
+
+class CachedPlayer(Player):
+    """Plays a deterministic Player or StatelessPlayer, skipping its search for histories in a DecisionCache
+
+    Decisions of a StatelessPlayer are keyed by the canonical history, in which colors are relabeled in the
+    order of their first use if the SCSA treats all colors alike (see SYMMETRIC_SCSAS), and stored in
+    canonical colors. A stateful Player is keyed by the history as played, as it is replayed through its
+    guesses.
+
+    After a cached guess a stateful Player has missed turns, so on the next miss of the round it is replayed
+    through the whole history. A StatelessPlayer is given a state with the history only instead. If the
+    replayed Player guesses differently than the cache, the stale decision is overwritten and the Player
+    plays the rest of the round from scratch, without the cache.
+    """
+
+    def __init__(self, player, cache: DecisionCache):
+        """Constructor for CachedPlayer
+
+        Args:
+            player (Player or StatelessPlayer): Deterministic player to cache the decisions of.
+            cache (DecisionCache): Cache of decisions, which may be shared with other cached players.
+
+        Raises:
+            ValueError: Player is not deterministic.
+        """
+
+        if not getattr(player, "deterministic", False):
+
+            raise ValueError(
+                player.player_name
+                + " is not deterministic, its decisions can not be cached."
+            )
+
+        self.player = player
+        self.cache = cache
+        self.player_name = player.player_name
+
+        self.history = ()
+        self.keys = []  # Key of the history before every guess of the round
+        self.last_guess = None
+        self.state = GameState()  # State of a StatelessPlayer, None if it missed the last turn
+        self.synced = True  # Whether a Player made every guess of the round so far
+        self.restarted = None  # Guesses of the round before the Player was restarted, None if it was not
+
+    def canonicalize(self, colors: list[str], scsa_name: str, history: tuple) -> dict:
+        """Finds the relabeling of colors of the canonical history
+
+        Args:
+            colors (list[str]]): All possible colors that can be used to generate a code.
+            scsa_name (str): Name of SCSA used to generate secret code.
+            history (tuple): (guess, exact, other) for every guess made so far.
+
+        Returns:
+            dict: Returns color -> canonical color, empty for a stateful Player or an SCSA that does not treat
+                  all colors alike.
+        """
+
+        if (
+            not isinstance(self.player, StatelessPlayer)
+            or scsa_name not in SYMMETRIC_SCSAS
+        ):
+
+            return {}
+
+        return canonical_colors(colors, history)
+
+    def search(self, board_length: int, colors: list[str], scsa_name: str) -> str:
+        """Makes a guess with the wrapped player
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]]): All possible colors that can be used to generate a code.
+            scsa_name (str): Name of SCSA used to generate secret code.
+
+        Returns:
+            str: Returns guess of the wrapped player.
+        """
+
+        if isinstance(self.player, StatelessPlayer):
+
+            state = self.state if self.state is not None else GameState(self.history)
+            guess, self.state = self.player.next_guess(
+                board_length, colors, scsa_name, state
+            )
+
+            return guess
+
+        if self.synced:
+
+            last_response = (0, 0, 0)
+
+            if len(self.history) > 0:
+
+                _, exact, other = self.history[-1]
+                last_response = (exact, other, len(self.history))
+
+            return self.player.make_guess(
+                board_length, colors, scsa_name, last_response
+            )
+
+        guess = self.player.make_guess(board_length, colors, scsa_name, (0, 0, 0))
+
+        for i, (previous_guess, exact, other) in enumerate(self.history):
+
+            # The responses of the history belong to other guesses than the player's own, so it starts over
+            if guess != previous_guess:
+
+                logger.warning(
+                    "%s guessed %s instead of the cached %s, overwriting the decision",
+                    self.player_name,
+                    guess,
+                    previous_guess,
+                )
+                self.cache.put(self.keys[i], guess)
+                self.restarted = len(self.history)
+
+                return self.player.make_guess(
+                    board_length, colors, scsa_name, (0, 0, 0)
+                )
+
+            guess = self.player.make_guess(
+                board_length, colors, scsa_name, (exact, other, i + 1)
+            )
+
+        self.synced = True
+
+        return guess
+
+    def make_guess(
+        self,
+        board_length: int,
+        colors: list[str],
+        scsa_name: str,
+        last_response: tuple[int, int, int],
+    ) -> str:
+        """Makes a guess of the secret code for Mastermind
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]]): All possible colors that can be used to generate a code.
+            scsa_name (str): Name of SCSA used to generate secret code.
+            last_response (tuple[int, int, int]): (First element in tuple is the number of pegs that match exactly with the secret
+                                           code for the previous guess, the second element is the number of pegs that are
+                                           the right color, but in the wrong location for the previous guess, and the third
+                                           element is the number of guesses so far.)
+
+        Returns:
+            str: Returns guess
+        """
+
+        if last_response[2] == 0:
+
+            self.history = ()
+            self.keys = []
+            self.state = GameState()
+            self.synced = True
+            self.restarted = None
+
+        elif self.restarted is not None:
+
+            # The restarted Player counts its guesses from its restart, and is not cached
+            self.last_guess = self.player.make_guess(
+                board_length,
+                colors,
+                scsa_name,
+                (last_response[0], last_response[1], last_response[2] - self.restarted),
+            )
+
+            return self.last_guess
+
+        else:
+
+            self.history += ((self.last_guess, last_response[0], last_response[1]),)
+
+            if self.state is not None:
+
+                self.state = self.state.record(
+                    self.last_guess, last_response[0], last_response[1]
+                )
+
+        relabel = self.canonicalize(colors, scsa_name, self.history)
+        history = tuple(
+            (relabel_guess(guess, relabel), exact, other)
+            for guess, exact, other in self.history
+        )
+        key = make_key(self.player_name, board_length, colors, scsa_name, history)
+        self.keys.append(key)
+        guess = self.cache.get(key)
+
+        if guess is None:
+
+            guess = self.search(board_length, colors, scsa_name)
+
+            if self.restarted is None:
+
+                self.cache.put(key, relabel_guess(guess, relabel))
+
+        else:
+
+            unlabel = {canonical: color for color, canonical in relabel.items()}
+            guess = relabel_guess(guess, unlabel)
+            self.state = None
+            self.synced = False
+
+        self.last_guess = guess
+
+        return guess
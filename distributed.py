@@ -0,0 +1,604 @@
+# File contains a tournament whose rounds are played by workers on any number of machines.
+# A coordinator serves batches of round ids over TCP, workers play them and send back the result of every round.
+# Example: python main.py coordinator --board_length 7 --num_colors 5 --player_name LMU --scsa_name InsertColors
+#          --num_rounds 1000000 --port 5555, then python main.py worker --host <coordinator> --port 5555 on every node.
+#
+# The answer of round r is generated after seeding random with (seed, r), so a round is the same whichever worker
+# plays it, and the rounds are aggregated into Results in round order, whatever the order they arrive in.
+# Delivery is at least once: a batch that is not reported within lease_timeout seconds, e.g. because its worker
+# died, is served again, and results of rounds that were already recorded are ignored.
+#
+# Messages are JSON objects prefixed with their uint32 little-endian byte length:
+#   worker -> coordinator: {"type": "request"} or {"type": "results", "batch_id", "rounds": [[round, result,
+#                          guesses, seconds], ...]}
+#   coordinator -> worker: {"type": "batch", "batch_id", "start", "stop", "seed", "config"},
+#                          {"type": "wait", "seconds"}, {"type": "done"} or {"type": "ack"}
+
+import argparse
+import array
+import collections
+import json
+import multiprocessing
+import random
+import socket
+import socketserver
+import struct
+import threading
+import time
+from mastermind import UINT32, Mastermind, Result, Results, Round
+
+LENGTH = struct.Struct("<I")
+
+
+def send_message(connection: socket.socket, message: dict) -> None:
+    """Sends a message
+
+    Args:
+        connection (socket.socket): Connected socket.
+        message (dict): Message, which can be encoded as JSON.
+    """
+
+    data = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    connection.sendall(LENGTH.pack(len(data)) + data)
+
+    return
+
+
+def receive_message(file) -> dict:
+    """Receives a message
+
+    Args:
+        file (file): Binary file object of a connected socket, see socket.makefile.
+
+    Returns:
+        dict: Returns message, None if the connection was closed.
+    """
+
+    header = file.read(LENGTH.size)
+
+    if len(header) < LENGTH.size:
+
+        return None
+
+    (length,) = LENGTH.unpack(header)
+    data = file.read(length)
+
+    if len(data) < length:
+
+        return None
+
+    return json.loads(data.decode("utf-8"))
+
+
+def round_seed(seed: int, round_id: int) -> str:
+    """Computes the seed of random for a round, which fixes its answer and the random choices of the player
+
+    Args:
+        seed (int): Seed of the tournament.
+        round_id (int): Round, from 0.
+
+    Returns:
+        str: Returns seed for random.seed.
+    """
+
+    return str(seed) + "/" + str(round_id)
+
+
+def play_batch(config: dict, start: int, stop: int, seed: int) -> list[list]:
+    """Plays the rounds of a batch, with a player that is kept for the next batches of the same configuration
+
+    Args:
+        config (dict): Configuration of the tournament, see Coordinator.config.
+        start (int): First round of the batch.
+        stop (int): Round after the last round of the batch.
+        seed (int): Seed of the tournament.
+
+    Returns:
+        list[list]: Returns [round, value of Result, guesses, seconds] for every round of the batch.
+    """
+
+    from sweep import get_player, get_scsa
+
+    board_length = config["board_length"]
+    colors = config["colors"]
+    player = get_player(config["player_name"], board_length, len(colors))
+    scsa = get_scsa(config["scsa_name"])
+    rounds = []
+
+    for round_id in range(start, stop):
+
+        random.seed(round_seed(seed, round_id))
+        code = scsa.generate_codes(board_length, colors, 1)[0]
+
+        round = Round(
+            board_length,
+            colors,
+            code,
+            scsa.name,
+            config["guess_cutoff"],
+            config["round_time_cutoff"],
+        )
+
+        start_time = time.time()
+        result, guesses = round.play_round(player)
+        end_time = time.time()
+
+        rounds.append([round_id, result.value, guesses, end_time - start_time])
+
+    return rounds
+
+
+class CoordinatorHandler(socketserver.StreamRequestHandler):
+    """Serves the messages of one worker connection"""
+
+    def handle(self) -> None:
+
+        coordinator = self.server.coordinator
+
+        while True:
+
+            message = receive_message(self.rfile)
+
+            if message is None:
+
+                return
+
+            if message["type"] == "request":
+
+                send_message(self.connection, coordinator.next_batch())
+
+            elif message["type"] == "results":
+
+                coordinator.record(message["batch_id"], message["rounds"])
+                send_message(self.connection, {"type": "ack"})
+
+            else:
+
+                return
+
+
+class CoordinatorServer(socketserver.ThreadingTCPServer):
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class Coordinator:
+    """Hands out batches of rounds to workers and collects the result of every round"""
+
+    def __init__(
+        self,
+        mastermind: Mastermind,
+        player_name: str,
+        scsa_name: str,
+        num_rounds: int,
+        batch_size: int = 100,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        lease_timeout: float = 300,
+        poll_interval: float = 0.5,
+    ):
+        """Constructor for Coordinator, which listens on the address but does not serve until start
+
+        Args:
+            mastermind (Mastermind): Game that is played, which scores the rounds.
+            player_name (str): Name of player, see main.PLAYERS.
+            scsa_name (str): Name of SCSA used to generate secret codes.
+            num_rounds (int): Number of rounds of the tournament.
+            batch_size (int, optional): Number of rounds per batch. Defaults to 100.
+            seed (int, optional): Seed of the tournament, see round_seed. Defaults to 0.
+            host (str, optional): Address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): Port to listen on, 0 for any free port. Defaults to 0.
+            lease_timeout (float, optional): Seconds after which a batch that was not reported is served again.
+                                             Defaults to 300.
+            poll_interval (float, optional): Seconds a worker waits before asking again while every remaining
+                                             batch is leased. Defaults to 0.5.
+        """
+
+        self.mastermind = mastermind
+        self.num_rounds = num_rounds
+        self.seed = seed
+        self.lease_timeout = lease_timeout
+        self.poll_interval = poll_interval
+        self.config = {
+            "board_length": mastermind.board_length,
+            "colors": list(mastermind.colors),
+            "player_name": player_name,
+            "scsa_name": scsa_name,
+            "guess_cutoff": mastermind.guess_cutoff,
+            "round_time_cutoff": mastermind.round_time_cutoff,
+        }
+
+        self.batches = [
+            (start, min(start + batch_size, num_rounds))
+            for start in range(0, num_rounds, batch_size)
+        ]
+        self.pending = collections.deque(range(len(self.batches)))
+        self.leases = {}  # batch id -> time after which the batch is served again
+        self.remaining = [stop - start for start, stop in self.batches]
+
+        # Columns with one entry per round, filled in as results arrive
+        self.done = bytearray(num_rounds)
+        self.outcomes = array.array("B", bytes(num_rounds))
+        self.guesses = array.array(UINT32, bytes(4 * num_rounds))
+        self.durations = array.array("d", bytes(8 * num_rounds))
+        self.num_done = 0
+        self.duplicates = 0  # Results of rounds that were already recorded
+
+        self.condition = threading.Condition()
+        self.server = CoordinatorServer((host, port), CoordinatorHandler)
+        self.server.coordinator = self
+        self.thread = None
+
+    def __enter__(self) -> "Coordinator":
+
+        self.start()
+
+        return self
+
+    def __exit__(self, *exc) -> None:
+
+        self.close()
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """(host, port) the coordinator listens on"""
+
+        return self.server.server_address[:2]
+
+    def start(self) -> None:
+        """Serves workers in a background thread"""
+
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, daemon=True
+        )
+        self.thread.start()
+
+        return
+
+    def close(self) -> None:
+        """Stops serving, workers that ask for a batch afterwards see the connection close"""
+
+        if self.thread is not None:
+
+            self.server.shutdown()
+            self.thread.join()
+            self.thread = None
+
+        self.server.server_close()
+
+        return
+
+    def next_batch(self) -> dict:
+        """Leases the next batch to a worker
+
+        Returns:
+            dict: Returns "batch" message, "wait" if every remaining batch is leased, "done" if all rounds are in.
+        """
+
+        with self.condition:
+
+            now = time.monotonic()
+
+            if not self.pending:
+
+                # Batches whose worker did not report in time are served again
+                for batch_id, deadline in sorted(self.leases.items()):
+
+                    if deadline <= now:
+
+                        self.pending.append(batch_id)
+
+            # A batch served again can be reported by its first worker before it is served
+            while self.pending and self.remaining[self.pending[0]] == 0:
+
+                self.pending.popleft()
+
+            if not self.pending:
+
+                if self.num_done == self.num_rounds:
+
+                    return {"type": "done"}
+
+                return {"type": "wait", "seconds": self.poll_interval}
+
+            batch_id = self.pending.popleft()
+            self.leases[batch_id] = now + self.lease_timeout
+            start, stop = self.batches[batch_id]
+
+        return {
+            "type": "batch",
+            "batch_id": batch_id,
+            "start": start,
+            "stop": stop,
+            "seed": self.seed,
+            "config": self.config,
+        }
+
+    def record(self, batch_id: int, rounds: list[list]) -> None:
+        """Records the results of a batch, ignoring rounds that were already recorded
+
+        Args:
+            batch_id (int): Batch the rounds were served in.
+            rounds (list[list]): [round, value of Result, guesses, seconds] for every round played.
+        """
+
+        start, stop = self.batches[batch_id]
+
+        with self.condition:
+
+            for round_id, outcome, guesses, duration in rounds:
+
+                if not start <= round_id < stop:
+
+                    continue
+
+                if self.done[round_id]:
+
+                    self.duplicates += 1
+
+                    continue
+
+                self.done[round_id] = 1
+                self.outcomes[round_id] = outcome
+                self.guesses[round_id] = guesses
+                self.durations[round_id] = duration
+                self.num_done += 1
+                self.remaining[batch_id] -= 1
+
+            if self.remaining[batch_id] == 0:
+
+                self.leases.pop(batch_id, None)
+
+            if self.num_done == self.num_rounds:
+
+                self.condition.notify_all()
+
+        return
+
+    def wait(self, timeout: float = None) -> bool:
+        """Waits until the result of every round is in
+
+        Args:
+            timeout (float, optional): Seconds to wait at most, None to wait forever. Defaults to None.
+
+        Returns:
+            bool: Returns whether every round is in.
+        """
+
+        with self.condition:
+
+            return self.condition.wait_for(
+                lambda: self.num_done == self.num_rounds, timeout
+            )
+
+    def results(self) -> Results:
+        """Aggregates the rounds recorded so far in round order, which does not depend on the workers
+
+        Returns:
+            Results: Returns results of the recorded rounds.
+        """
+
+        results = Results()
+
+        with self.condition:
+
+            for round_id in range(self.num_rounds):
+
+                if not self.done[round_id]:
+
+                    continue
+
+                result = Result(self.outcomes[round_id])
+                guesses = self.guesses[round_id]
+
+                results.record_result(
+                    result,
+                    guesses,
+                    self.durations[round_id],
+                    self.mastermind.score_round(result, guesses),
+                )
+
+        return results
+
+
+def run_worker(address: tuple[str, int], max_batches: int = None) -> int:
+    """Plays batches served by a coordinator until it has none left
+
+    A worker that loses its connection stops, and the coordinator serves its batch again after the lease expires.
+
+    Args:
+        address (tuple[str, int]): (host, port) of the coordinator.
+        max_batches (int, optional): Number of batches after which the worker stops, None for no limit.
+                                     Defaults to None.
+
+    Returns:
+        int: Returns number of batches played.
+    """
+
+    played = 0
+
+    with socket.create_connection(address) as connection:
+
+        file = connection.makefile("rb")
+
+        try:
+
+            while max_batches is None or played < max_batches:
+
+                send_message(connection, {"type": "request"})
+                message = receive_message(file)
+
+                if message is None or message["type"] == "done":
+
+                    break
+
+                if message["type"] == "wait":
+
+                    time.sleep(message["seconds"])
+
+                    continue
+
+                rounds = play_batch(
+                    message["config"],
+                    message["start"],
+                    message["stop"],
+                    message["seed"],
+                )
+                results = {
+                    "type": "results",
+                    "batch_id": message["batch_id"],
+                    "rounds": rounds,
+                }
+
+                send_message(connection, results)
+
+                if receive_message(file) is None:
+
+                    break
+
+                played += 1
+
+        # The coordinator stops serving once all rounds are in
+        except ConnectionError:
+
+            pass
+
+    return played
+
+
+def play_distributed(
+    mastermind: Mastermind,
+    player_name: str,
+    scsa_name: str,
+    num_rounds: int,
+    num_workers: int = 2,
+    batch_size: int = 100,
+    seed: int = 0,
+) -> Results:
+    """Plays a tournament with worker processes on this machine, through a coordinator on localhost
+
+    Args:
+        mastermind (Mastermind): Game that is played.
+        player_name (str): Name of player, see main.PLAYERS.
+        scsa_name (str): Name of SCSA used to generate secret codes.
+        num_rounds (int): Number of rounds of the tournament.
+        num_workers (int, optional): Number of worker processes. Defaults to 2.
+        batch_size (int, optional): Number of rounds per batch. Defaults to 100.
+        seed (int, optional): Seed of the tournament, see round_seed. Defaults to 0.
+
+    Returns:
+        Results: Returns results of every round in round order, which only depend on the seed.
+    """
+
+    with Coordinator(
+        mastermind, player_name, scsa_name, num_rounds, batch_size, seed
+    ) as coordinator:
+
+        workers = [
+            multiprocessing.Process(target=run_worker, args=(coordinator.address,))
+            for _ in range(num_workers)
+        ]
+
+        for worker in workers:
+
+            worker.start()
+
+        coordinator.wait()
+
+        for worker in workers:
+
+            worker.join()
+
+    return coordinator.results()
+
+
+def build_parser() -> argparse.ArgumentParser:
+
+    from main import PLAYER_NAMES, SCSA_NAMES
+    from alphabet import DEFAULT_SYMBOLS
+
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Play a tournament of Mastermind on many machines.",
+    )
+    subparsers = parser.add_subparsers(dest="role", required=True)
+
+    coordinator = subparsers.add_parser("coordinator", help="Hand out the rounds.")
+    coordinator.add_argument("--board_length", nargs="?", type=int, required=True)
+    coordinator.add_argument(
+        "--num_colors",
+        nargs="?",
+        type=int,
+        required=True,
+        choices=range(1, len(DEFAULT_SYMBOLS) + 1),
+        metavar="{1.." + str(len(DEFAULT_SYMBOLS)) + "}",
+    )
+    coordinator.add_argument(
+        "--player_name", nargs="?", type=str, required=True, choices=PLAYER_NAMES
+    )
+    coordinator.add_argument(
+        "--scsa_name", nargs="?", type=str, required=True, choices=SCSA_NAMES
+    )
+    coordinator.add_argument("--num_rounds", nargs="?", type=int, required=True)
+    coordinator.add_argument("--batch_size", nargs="?", type=int, default=100)
+    coordinator.add_argument("--seed", nargs="?", type=int, default=0)
+    coordinator.add_argument("--host", nargs="?", type=str, default="0.0.0.0")
+    coordinator.add_argument("--port", nargs="?", type=int, default=5555)
+    coordinator.add_argument("--lease_timeout", nargs="?", type=float, default=300)
+    coordinator.add_argument(
+        "--output",
+        nargs="?",
+        type=str,
+        help="CSV file to write the result of every round to.",
+    )
+
+    worker = subparsers.add_parser("worker", help="Play rounds of a coordinator.")
+    worker.add_argument("--host", nargs="?", type=str, default="127.0.0.1")
+    worker.add_argument("--port", nargs="?", type=int, default=5555)
+
+    return parser
+
+
+def run_distributed(argv: list[str]) -> None:
+
+    args = build_parser().parse_args(argv)
+
+    if args.role == "worker":
+
+        run_worker((args.host, args.port))
+
+        return
+
+    from alphabet import default_colors
+
+    mastermind = Mastermind(args.board_length, default_colors(args.num_colors))
+
+    with Coordinator(
+        mastermind,
+        args.player_name,
+        args.scsa_name,
+        args.num_rounds,
+        args.batch_size,
+        args.seed,
+        args.host,
+        args.port,
+        args.lease_timeout,
+    ) as coordinator:
+
+        coordinator.wait()
+
+    results = coordinator.results()
+
+    print("Player:", args.player_name)
+    print("SCSA Name:", args.scsa_name)
+    print("Game:", args.board_length, "Pegs", args.num_colors, "Colors")
+    print("Rounds:", results.get_number_of_rounds(), "out of", args.num_rounds)
+    print("Results:", results)
+
+    if args.output is not None:
+
+        results.to_csv(args.output)
+
+    return
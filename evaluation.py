@@ -0,0 +1,369 @@
+# File contains stratified evaluation of a player, which needs fewer rounds than a tournament for the same precision.
+# Codes of an SCSA are grouped into strata of similar difficulty (number of distinct colors, most repeats of a color),
+# the weight of each stratum is its share of a large sample of codes, and rounds are spent where scores vary most.
+# The weighted mean of the per-stratum means estimates the mean score per round of a tournament on the SCSA.
+# Example: evaluate_stratified(Mastermind(7, list("ABCDE")), LMU(), InsertColors(), relative_half_width=0.02)
+
+import math
+import random
+import statistics
+import time
+from mastermind import Mastermind, Results, Round
+from player import Player
+from scsa import SCSA
+
+
+def code_features(code: str) -> tuple[int, int]:
+    """Computes the difficulty features of a code
+
+    Args:
+        code (str): Secret code.
+
+    Returns:
+        tuple[int, int]: Returns (number of distinct colors, largest number of pegs of one color).
+    """
+
+    counts = {}
+
+    for peg in code:
+
+        counts[peg] = counts.get(peg, 0) + 1
+
+    return (len(counts), max(counts.values()))
+
+
+class StratifiedCorpus:
+    """Codes sampled from an SCSA, grouped into strata by their features"""
+
+    def __init__(
+        self,
+        scsa: SCSA,
+        board_length: int,
+        colors: list[str],
+        num_samples: int = 10000,
+        min_stratum_size: int = 50,
+        features=code_features,
+    ):
+        """Constructor for StratifiedCorpus, which samples the codes
+
+        Args:
+            scsa (SCSA): SCSA whose distribution of codes is sampled.
+            board_length (int): Number of pegs.
+            colors (list[str]): All possible colors that can be used to generate a code.
+            num_samples (int, optional): Number of codes sampled to weigh the strata. Defaults to 10000.
+            min_stratum_size (int, optional): Strata with fewer sampled codes are pooled into the stratum None.
+                                              Defaults to 50.
+            features (function, optional): Stratum of a code. Defaults to code_features.
+
+        Raises:
+            ValueError: SCSA generates no codes for the geometry.
+        """
+
+        codes = scsa.generate_codes(board_length, colors, num_samples)
+
+        if len(codes) == 0:
+
+            raise ValueError("SCSA generates no codes for this geometry.")
+
+        strata = {}
+
+        for code in codes:
+
+            strata.setdefault(features(code), []).append(code)
+
+        small = [
+            key for key, members in strata.items() if len(members) < min_stratum_size
+        ]
+
+        # A single small stratum is kept, pooling it would only rename it
+        if len(small) > 1:
+
+            strata[None] = [code for key in small for code in strata.pop(key)]
+
+        self.strata = strata
+        self.weights = {
+            key: len(members) / len(codes) for key, members in strata.items()
+        }
+
+    def draw(self, stratum, rng: random.Random) -> str:
+        """Draws a code of a stratum, as the SCSA would generate it given the stratum
+
+        Args:
+            stratum (tuple or None): Stratum to draw from.
+            rng (random.Random): Source of randomness.
+
+        Returns:
+            str: Returns code.
+        """
+
+        return rng.choice(self.strata[stratum])
+
+
+class StratifiedEstimate:
+    """Weighted estimate of the mean score per round from the scores of the rounds of each stratum"""
+
+    def __init__(self, weights: dict):
+        """Constructor for StratifiedEstimate
+
+        Args:
+            weights (dict): Weight of every stratum, summing to 1.
+        """
+
+        self.weights = weights
+        self.scores = {stratum: [] for stratum in weights}
+
+    def add(self, stratum, score: float) -> None:
+        """Adds the score of a round
+
+        Args:
+            stratum (tuple or None): Stratum of the answer of the round.
+            score (float): Score of the round.
+        """
+
+        self.scores[stratum].append(score)
+
+    def num_rounds(self) -> int:
+
+        return sum(len(scores) for scores in self.scores.values())
+
+    def mean(self) -> float:
+        """Computes the weighted mean of the per-stratum means
+
+        Returns:
+            float: Returns estimate of the mean score per round, nan if a stratum has no rounds.
+        """
+
+        if any(len(scores) == 0 for scores in self.scores.values()):
+
+            return math.nan
+
+        return math.fsum(
+            weight * math.fsum(self.scores[stratum]) / len(self.scores[stratum])
+            for stratum, weight in self.weights.items()
+        )
+
+    def variance(self) -> float:
+        """Computes the variance of the estimate, sum of weight ** 2 * variance / rounds over strata
+
+        Returns:
+            float: Returns variance of the estimate, nan if a stratum has fewer than 2 rounds.
+        """
+
+        if any(len(scores) < 2 for scores in self.scores.values()):
+
+            return math.nan
+
+        return math.fsum(
+            weight**2
+            * statistics.variance(self.scores[stratum])
+            / len(self.scores[stratum])
+            for stratum, weight in self.weights.items()
+        )
+
+    def interval(self, confidence: float = 0.95) -> tuple[float, float]:
+        """Computes a normal-approximation confidence interval of the estimate
+
+        Args:
+            confidence (float, optional): Confidence level of the interval. Defaults to 0.95.
+
+        Returns:
+            tuple[float, float]: (lower bound, upper bound) of mean score per round, (nan, nan) if a stratum
+                                 has fewer than 2 rounds.
+        """
+
+        mean = self.mean()
+        z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+        half_width = z * math.sqrt(self.variance())
+
+        return (mean - half_width, mean + half_width)
+
+    def allocate(self, num_rounds: int, min_rounds: int = 1) -> dict:
+        """Splits rounds over the strata in proportion to weight * standard deviation (Neyman allocation)
+
+        Strata are weighted by weight alone while some stratum has fewer than 2 rounds or no stratum varies.
+        Every stratum keeps min_rounds rounds if there are enough, as a stratum whose scores did not vary so
+        far would otherwise never be played again and its variance would stay 0.
+
+        Args:
+            num_rounds (int): Number of rounds to split.
+            min_rounds (int, optional): Rounds of every stratum before the rest is split. Defaults to 1.
+
+        Returns:
+            dict: Returns number of rounds of every stratum.
+        """
+
+        shares = dict(self.weights)
+
+        if all(len(scores) >= 2 for scores in self.scores.values()):
+
+            neyman = {
+                stratum: weight * statistics.stdev(self.scores[stratum])
+                for stratum, weight in self.weights.items()
+            }
+
+            if sum(neyman.values()) > 0:
+
+                shares = neyman
+
+        if num_rounds < min_rounds * len(shares):
+
+            min_rounds = 0
+
+        rest = num_rounds - min_rounds * len(shares)
+        total = sum(shares.values())
+        exact = {stratum: rest * share / total for stratum, share in shares.items()}
+        counts = {stratum: int(rounds) for stratum, rounds in exact.items()}
+
+        # The rounds lost to rounding down go to the largest remainders
+        remainders = sorted(exact, key=lambda stratum: counts[stratum] - exact[stratum])
+
+        for stratum in remainders[: rest - sum(counts.values())]:
+
+            counts[stratum] += 1
+
+        return {stratum: count + min_rounds for stratum, count in counts.items()}
+
+    def summary(self, confidence: float = 0.95) -> dict:
+        """Summarizes the estimate
+
+        Args:
+            confidence (float, optional): Confidence level of the interval. Defaults to 0.95.
+
+        Returns:
+            dict: Returns estimate, interval, number of rounds, and weight, rounds and mean of every stratum.
+        """
+
+        low, high = self.interval(confidence)
+
+        return {
+            "estimate": self.mean(),
+            "interval": [low, high],
+            "rounds": self.num_rounds(),
+            "strata": {
+                str(stratum): {
+                    "weight": weight,
+                    "rounds": len(self.scores[stratum]),
+                    "mean": (
+                        math.fsum(self.scores[stratum]) / len(self.scores[stratum])
+                        if len(self.scores[stratum])
+                        else math.nan
+                    ),
+                }
+                for stratum, weight in self.weights.items()
+            },
+        }
+
+
+def evaluate_stratified(
+    mastermind: Mastermind,
+    player: Player,
+    scsa: SCSA,
+    half_width: float = None,
+    relative_half_width: float = 0.02,
+    confidence: float = 0.95,
+    batch_size: int = 50,
+    min_rounds_per_stratum: int = 2,
+    min_rounds: int = 100,
+    max_rounds: int = 10000,
+    num_samples: int = 10000,
+    seed: int = None,
+    metric=None,
+    corpus: StratifiedCorpus = None,
+) -> tuple[StratifiedEstimate, Results]:
+    """Plays rounds stratified by difficulty until the confidence interval of the mean score is tight enough
+
+    After min_rounds_per_stratum rounds of every stratum and min_rounds rounds in all, rounds are played in batches allocated by
+    StratifiedEstimate.allocate, and the run stops once the half-width of the interval is at most half_width
+    (or relative_half_width times the absolute estimate), or after max_rounds rounds. Unlike a tournament,
+    rounds continue after a failure and the tournament time cutoff does not apply.
+
+    Args:
+        mastermind (Mastermind): Game that is played.
+        player (Player): Player to evaluate.
+        scsa (SCSA): SCSA whose codes are the answers.
+        half_width (float, optional): Largest half-width of the interval, in score units. Defaults to None.
+        relative_half_width (float, optional): Largest half-width relative to the estimate, used when half_width
+                                               is None. Defaults to 0.02.
+        confidence (float, optional): Confidence level of the interval. Defaults to 0.95.
+        batch_size (int, optional): Number of rounds between checks of the stopping rule. Defaults to 50.
+        min_rounds_per_stratum (int, optional): Rounds of every stratum before the rule is checked, at least 2.
+                                                Defaults to 2.
+        min_rounds (int, optional): Rounds before the rule is checked, as the variances of a few rounds per
+                                    stratum are often 0. Defaults to 100.
+        max_rounds (int, optional): Number of rounds after which the run stops. Defaults to 10000.
+        num_samples (int, optional): Number of codes sampled to weigh the strata. Defaults to 10000.
+        seed (int, optional): Seed of the draws of answers from the strata. Two players evaluated with the same
+                              seed and corpus are compared on the same answers. Defaults to None.
+        metric (function, optional): Score of a round from its Result and number of guesses.
+                                     Defaults to mastermind.score_round.
+        corpus (StratifiedCorpus, optional): Strata to draw answers from, None to sample num_samples codes of
+                                             the SCSA. Defaults to None.
+
+    Returns:
+        tuple[StratifiedEstimate, Results]: Returns (estimate, results of every round played).
+    """
+
+    if metric is None:
+
+        metric = mastermind.score_round
+
+    if corpus is None:
+
+        corpus = StratifiedCorpus(
+            scsa, mastermind.board_length, mastermind.colors, num_samples
+        )
+
+    mastermind.configure_player(player)
+
+    rng = random.Random(seed)
+    estimate = StratifiedEstimate(corpus.weights)
+    results = Results()
+
+    def play(stratum) -> None:
+
+        round = Round(
+            mastermind.board_length,
+            mastermind.colors,
+            corpus.draw(stratum, rng),
+            scsa.name,
+            mastermind.guess_cutoff,
+            mastermind.round_time_cutoff,
+        )
+
+        start = time.time()
+        result, guesses = round.play_round(player)
+        end = time.time()
+
+        results.record_result(
+            result, guesses, end - start, mastermind.score_round(result, guesses)
+        )
+        estimate.add(stratum, metric(result, guesses))
+
+    for stratum in corpus.strata:
+
+        for _ in range(max(2, min_rounds_per_stratum)):
+
+            play(stratum)
+
+    while estimate.num_rounds() < max_rounds:
+
+        low, high = estimate.interval(confidence)
+        limit = half_width
+
+        if limit is None:
+
+            limit = relative_half_width * abs(estimate.mean())
+
+        if estimate.num_rounds() >= min_rounds and (high - low) / 2 <= limit:
+
+            break
+
+        batch = min(batch_size, max_rounds - estimate.num_rounds())
+
+        for stratum, count in estimate.allocate(batch).items():
+
+            for _ in range(count):
+
+                play(stratum)
+
+    return estimate, results
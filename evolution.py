@@ -0,0 +1,228 @@
+# File contains a player that searches for codes consistent with all feedback with an evolutionary algorithm.
+# It is meant for boards whose codes are far too many to enumerate, e.g. 20 pegs and 26 colors.
+
+import random
+import time
+from consistent import ConsistentSearchPlayer
+
+
+class Genetic(ConsistentSearchPlayer):
+    """Mastermind Player that guesses codes consistent with all feedback, found by a genetic algorithm
+
+    Once the colors are counted, codes are bred as permutations of the known colors, the best code of each
+    generation is improved by swapping pegs, and the first code that is consistent with every response is
+    guessed. If the time budget runs out first, the code that is closest to consistent is guessed instead.
+    """
+
+    # Children bred per code of a generation before it is left smaller, as the known colors may have fewer
+    # distinct permutations than population_size
+    BREEDING_ATTEMPTS = 10
+
+    def __init__(
+        self,
+        population_size: int = 50,
+        elite_size: int = 5,
+        mutation_rate: float = 0.5,
+        time_budget: float = 0.04,
+        count_colors: bool = True,
+        improve_swaps: int = 200,
+    ):
+        """Constructor for Genetic
+
+        Args:
+            population_size (int, optional): Number of codes per generation. Defaults to 50.
+            elite_size (int, optional): Number of best codes that survive into the next generation. Defaults to 5.
+            mutation_rate (float, optional): Probability of each further mutation of a child. Defaults to 0.5.
+            time_budget (float, optional): Seconds per guess after which the search stops. Defaults to 0.04.
+            count_colors (bool, optional): Whether to learn the count of every color first. Defaults to True.
+            improve_swaps (int, optional): Number of swaps tried to improve the best code of each generation,
+                                           once the counts of the colors are known. Defaults to 200.
+        """
+
+        super().__init__(count_colors)
+
+        self.player_name = "Genetic"
+        self.population_size = population_size
+        self.elite_size = elite_size
+        self.mutation_rate = mutation_rate
+        self.time_budget = time_budget
+        self.improve_swaps = improve_swaps
+
+        self.population = []
+
+    def start_round(self) -> None:
+        """Forgets the previous round"""
+
+        super().start_round()
+
+        self.population = []
+
+        return
+
+    def start_search(self) -> None:
+        """Starts a new population of permutations of the known colors"""
+
+        self.population = []
+
+        return
+
+    def crossover(
+        self, first: list[str], second: list[str], colors: list[str]
+    ) -> list[str]:
+        """Breeds a child that keeps the pegs its parents agree on
+
+        Args:
+            first (list[str]): First parent.
+            second (list[str]): Second parent.
+            colors (list[str]): All possible colors that can be used to generate a code.
+
+        Returns:
+            list[str]: Returns child, which uses the known colors if the parents do.
+        """
+
+        if not self.colors_left:
+
+            return [random.choice(pair) for pair in zip(first, second)]
+
+        child = [a if a == b else None for a, b in zip(first, second)]
+        remaining = dict(self.colors_left)
+
+        for peg in child:
+
+            if peg is not None:
+
+                remaining[peg] -= 1
+
+        # The other pegs get the remaining colors in random order, so that the child is a permutation as well
+        rest = [color for color, count in remaining.items() for _ in range(count)]
+        random.shuffle(rest)
+
+        return [peg if peg is not None else rest.pop() for peg in child]
+
+    def mutate(self, code: list[str], colors: list[str]) -> None:
+        """Swaps pegs of a code, and recolors a peg if the counts of the colors are not known
+
+        Args:
+            code (list[str]): Code to change in place.
+            colors (list[str]): All possible colors that can be used to generate a code.
+        """
+
+        while random.random() < self.mutation_rate:
+
+            i = random.randrange(len(code))
+            j = random.randrange(len(code))
+            code[i], code[j] = code[j], code[i]
+
+            if not self.colors_left:
+
+                code[random.randrange(len(code))] = random.choice(colors)
+
+    def improve(self, code: str, num_swaps: int) -> str:
+        """Climbs from a permutation of the known colors by swapping pegs, keeping swaps that are not worse
+
+        A swap only changes the exact pins of positions i and j, so it is scored in O(history).
+
+        Args:
+            code (str): Code that uses the known colors.
+            num_swaps (int): Number of swaps to try.
+
+        Returns:
+            str: Returns code that is at most as far from consistent as the given code.
+        """
+
+        missing = self.missing_exact(code)
+        code = list(code)
+        board_length = len(code)
+
+        for _ in range(num_swaps):
+
+            i = random.randrange(board_length)
+            j = random.randrange(board_length)
+            a = code[i]
+            b = code[j]
+
+            if a == b:
+
+                continue
+
+            change, moves = self.swap_change(missing, i, j, a, b)
+
+            if change <= 0:
+
+                code[i] = b
+                code[j] = a
+                missing = moves
+
+        return "".join(code)
+
+    def search(self, board_length: int, colors: list[str]) -> str:
+        """Evolves the population until a consistent code is found or the time budget runs out
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]): All possible colors that can be used to generate a code.
+
+        Returns:
+            str: Returns consistent code, or the best code that has not been guessed.
+        """
+
+        deadline = time.perf_counter() + self.time_budget
+        guessed = {guess for guess, _, _, _ in self.history}
+        scores = {}  # Fitness of every code seen this turn
+
+        population = self.population
+
+        while len(population) < self.population_size:
+
+            population.append("".join(self.random_code(board_length, colors)))
+
+        while True:
+
+            for code in population:
+
+                if code not in scores:
+
+                    scores[code] = self.fitness(code)
+
+                    if scores[code] == 0:
+
+                        self.population = population
+
+                        return code
+
+            ranked = sorted(population, key=scores.get)
+
+            if time.perf_counter() > deadline:
+
+                break
+
+            parents = ranked[: max(2, self.population_size // 2)]
+            children = dict.fromkeys(ranked[: self.elite_size])
+
+            if self.colors_left:
+
+                children[self.improve(ranked[0], self.improve_swaps)] = None
+
+            for _ in range(self.BREEDING_ATTEMPTS * self.population_size):
+
+                if len(children) >= self.population_size:
+
+                    break
+
+                child = self.crossover(
+                    random.choice(parents), random.choice(parents), colors
+                )
+                self.mutate(child, colors)
+                children["".join(child)] = None
+
+            population = list(children)
+
+        self.population = population
+
+        for code in ranked:
+
+            if code not in guessed:
+
+                return code
+
+        return "".join(self.random_code(board_length, colors))
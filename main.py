@@ -1,109 +1,230 @@
 # Main file to run game of Mastermind based on command-line arguments.
 # See example.ipynb for other ways to use the Mastermind representation.
-
-import argparse
-from scsa import *
-from player import *
-from mastermind import *
-from LMU import *
-
-parser = argparse.ArgumentParser(description="Play a game of Mastermind.")
-parser.add_argument("--board_length", nargs="?", type=int, required=True)
-parser.add_argument(
-    "--num_colors", nargs="?", type=int, required=True, choices=range(1, 27)
-)
-parser.add_argument(
-    "--player_name",
-    nargs="?",
-    type=str,
-    required=True,
-    choices=["RandomFolks", "Boring", "LMU"],
-)
-parser.add_argument(
-    "--scsa_name",
-    nargs="?",
-    type=str,
-    required=True,
-    choices=[
-        "InsertColors",
-        "TwoColor",
-        "ABColor",
-        "TwoColorAlternating",
-        "OnlyOnce",
-        "FirstLast",
-        "UsuallyFewer",
-        "PreferFewer",
-    ],
-)
-parser.add_argument("--num_rounds", nargs="?", type=int, required=True)
-
-args = parser.parse_args()
-
-
-def str_to_player(player_name: str) -> Player:
-
-    if player_name == "RandomFolks":
-
-        player = RandomFolks()
-
-    elif player_name == "Boring":
-
-        player = Boring()
-        
-    elif player_name == "LMU":
-
-        player = LMU()
-
-    else:
+# Use "python main.py sweep ..." to play many configurations at once (see sweep.py).
+# Use "python main.py coordinator ..." and "python main.py worker ..." to play on many machines (see distributed.py).
+
+# Modules are imported when they are needed, so that only the selected player and SCSA are loaded.
+# The import time of this module is tracked by perf_test.py, see python -X importtime main.py --help.
+
+import sys
+
+# Name of player: (module, class)
+PLAYERS = {
+    "RandomFolks": ("player", "RandomFolks"),
+    "Boring": ("player", "Boring"),
+    "LMU": ("LMU", "LMU"),
+    "Minimax": ("minimax", "Minimax"),
+    "Genetic": ("evolution", "Genetic"),
+    "Annealing": ("annealing", "Annealing"),
+    "Specialized": ("specialized", "Specialized"),
+    "Tree": ("solver", "TreePlayer"),
+}
+
+PLAYER_NAMES = list(PLAYERS)
+
+SCSA_NAMES = [
+    "InsertColors",
+    "TwoColor",
+    "ABColor",
+    "TwoColorAlternating",
+    "OnlyOnce",
+    "FirstLast",
+    "UsuallyFewer",
+    "PreferFewer",
+]
+
+
+def build_parser():
+
+    import argparse
+    from alphabet import DEFAULT_SYMBOLS
+
+    parser = argparse.ArgumentParser(description="Play a game of Mastermind.")
+    parser.add_argument("--board_length", nargs="?", type=int, required=True)
+    parser.add_argument(
+        "--num_colors",
+        nargs="?",
+        type=int,
+        required=True,
+        choices=range(1, len(DEFAULT_SYMBOLS) + 1),
+        metavar="{1.." + str(len(DEFAULT_SYMBOLS)) + "}",
+    )
+    parser.add_argument(
+        "--player_name",
+        nargs="?",
+        type=str,
+        required=True,
+        choices=PLAYER_NAMES,
+    )
+    parser.add_argument(
+        "--scsa_name",
+        nargs="?",
+        type=str,
+        required=True,
+        choices=SCSA_NAMES,
+    )
+    parser.add_argument("--num_rounds", nargs="?", type=int, required=True)
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        type=str,
+        choices=["cprofile", "sampling"],
+        help="Profile the player and the engine during the tournament.",
+    )
+    parser.add_argument(
+        "--profile_output",
+        nargs="?",
+        type=str,
+        help="File to write the profile report to instead of stdout.",
+    )
+    parser.add_argument(
+        "--trace_output",
+        nargs="?",
+        type=str,
+        help="Trace file to append every round to, see traces.py.",
+    )
+    parser.add_argument(
+        "--tree_solution",
+        nargs="?",
+        type=str,
+        help="Decision tree of the Tree player, written by GameTreeSolver.save. Without it, the game is solved "
+        + "before the tournament if it is small enough, see solver.py.",
+    )
+    parser.add_argument(
+        "--memory_budget",
+        nargs="?",
+        type=int,
+        help="Megabytes the player may use for codes, see planning.py. Logs the plan.",
+    )
+
+    return parser
+
+
+def str_to_player(player_name: str):
+
+    if player_name not in PLAYERS:
 
         raise ValueError("Unrecognized Player.")
 
+    module_name, class_name = PLAYERS[player_name]
+    player = getattr(__import__(module_name), class_name)()
+
     return player
 
 
-def str_to_scsa(scsa_name: str) -> SCSA:
+def str_to_scsa(scsa_name: str):
+
+    if scsa_name not in SCSA_NAMES:
+
+        raise ValueError("Unrecognized SCSA.")
+
+    import scsa
+
+    return getattr(scsa, scsa_name)()
+
+
+def main(argv: list[str]) -> None:
+
+    if len(argv) > 0 and argv[0] == "sweep":
+
+        from sweep import run_sweep
+
+        run_sweep(argv[1:])
+
+        return
+
+    if len(argv) > 0 and argv[0] in ["coordinator", "worker"]:
+
+        from distributed import run_distributed
+
+        run_distributed(argv)
+
+        return
 
-    if scsa_name == "InsertColors":
+    parser = build_parser()
+    args = parser.parse_args(argv)
 
-        scsa = InsertColors()
+    from mastermind import Mastermind
+    from alphabet import default_colors
 
-    elif scsa_name == "TwoColor":
+    player = str_to_player(args.player_name)
+    scsa = str_to_scsa(args.scsa_name)
+    colors = default_colors(args.num_colors)
+    planner = None
 
-        scsa = TwoColor()
+    # The decision tree is loaded and solved before the tournament, as the rounds are timed
+    if args.player_name == "Tree":
 
-    elif scsa_name == "ABColor":
+        try:
 
-        scsa = ABColor()
+            if args.tree_solution is not None:
 
-    elif scsa_name == "TwoColorAlternating":
+                from solver import TreePlayer
 
-        scsa = TwoColorAlternating()
+                player = TreePlayer(args.tree_solution)
 
-    elif scsa_name == "OnlyOnce":
+            player.solve(args.board_length, colors)
 
-        scsa = OnlyOnce()
+        except (OSError, ValueError) as error:
 
-    elif scsa_name == "FirstLast":
+            parser.error(str(error))
 
-        scsa = FirstLast()
+    if args.memory_budget is not None:
 
-    elif scsa_name == "UsuallyFewer":
+        import logging
+        from planning import MemoryPlanner
 
-        scsa = UsuallyFewer()
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+        planner = MemoryPlanner(args.memory_budget * 2**20)
 
-    elif scsa_name == "PreferFewer":
+    mastermind = Mastermind(args.board_length, colors, planner=planner)
 
-        scsa = PreferFewer()
+    recorder = None
+    profiler = None
+
+    if args.trace_output is not None:
+
+        from traces import TraceWriter
+
+        recorder = TraceWriter(args.trace_output)
+
+    if args.profile is not None:
+
+        from profiling import make_profiler
+
+        profiler = make_profiler(args.profile)
+
+    try:
+
+        mastermind.play_tournament(
+            player, scsa, args.num_rounds, profiler=profiler, recorder=recorder
+        )
+
+    finally:
+
+        if recorder is not None:
+
+            recorder.close()
+
+        if profiler is not None:
+
+            profiler.close()
+
+    if profiler is None:
+
+        return
+
+    if args.profile_output is None:
+
+        profiler.report()
 
     else:
 
-        raise ValueError("Unrecognized SCSA.")
+        with open(args.profile_output, "w") as file:
+
+            profiler.report(file)
 
-    return scsa
 
+if __name__ == "__main__":
 
-player = str_to_player(args.player_name)
-scsa = str_to_scsa(args.scsa_name)
-colors = [chr(i) for i in range(65, 91)][: args.num_colors]
-mastermind = Mastermind(args.board_length, colors)
-mastermind.play_tournament(player, scsa, args.num_rounds)
+    main(sys.argv[1:])
@@ -1,23 +1,63 @@
 # File contains implementation of a representation for Mastermind and Rounds of Mastermind.
 # See main.py or examples.ipynb for example usages.
 
+import array
+import math
+import struct
+import sys
 import time
+from collections import OrderedDict
 from enum import Enum
-from scsa import *
-from player import *
+from operator import eq
+from scsa import SCSA, read_from_file
+from player import Player
+from alphabet import Alphabet, DEFAULT_SYMBOLS
+
+
+# Typecode of 32-bit unsigned columns, as the size of array.array("I") depends on the platform
+UINT32 = "I" if array.array("I").itemsize == 4 else "L"
+
+if array.array(UINT32).itemsize != 4:
+
+    raise ImportError("No 32-bit unsigned array type on this platform.")
+
+
+def finite_or_none(value):
+    """Replaces NaN and infinite floats with None, which JSON can represent, in nested dicts and lists
+
+    Args:
+        value: Number, string, or dict or list of them.
+
+    Returns:
+        Returns value with every float that is not finite replaced by None.
+    """
+
+    if isinstance(value, float) and not math.isfinite(value):
+
+        return None
+
+    if isinstance(value, dict):
+
+        return {key: finite_or_none(item) for key, item in value.items()}
+
+    if isinstance(value, (list, tuple)):
+
+        return [finite_or_none(item) for item in value]
+
+    return value
 
 
 def letter_to_num(letter: str) -> int:
     """Converts letter to number based on position its in alphabet
 
     Args:
-        letter (str): Letter to convert to number.
+        letter (str): Letter to convert to number, one of DEFAULT_SYMBOLS.
 
     Returns:
-        int: Position of letter in alphabet.
+        int: Position of letter in alphabet (1 for "A", 26 for "Z", 27 for "a" and so on).
     """
 
-    return ord(letter) - 64
+    return DEFAULT_SYMBOLS.index(letter) + 1
 
 
 class Result(Enum):
@@ -30,7 +70,14 @@ class Result(Enum):
 
 
 class Results:
-    """Records number of wins, losses, and failures, and score of a tournament."""
+    """Records number of wins, losses, and failures, and score of a tournament.
+
+    Every recorded round is also stored in compact array-backed columns (guesses, duration, outcome
+    and score of the round), which are used for aggregate statistics and for exporting results.
+    """
+
+    BINARY_MAGIC = b"MMRS"
+    BINARY_VERSION = 1
 
     def __init__(self):
 
@@ -41,15 +88,37 @@ class Results:
         }  # Private field used to keep track of the result of a round.
         self.score = 0  # Public field used to keep track of score.
 
-    def record_result(self, result: Result) -> None:
+        # Columns with one entry per recorded round
+        self.guesses = array.array(UINT32)  # Number of guesses made in the round
+        self.durations = array.array("d")  # Seconds spent playing the round
+        self.outcomes = array.array("B")  # Value of the Result of the round
+        self.scores = array.array("d")  # Score awarded for the round
+
+    def record_result(
+        self,
+        result: Result,
+        guesses: int = 0,
+        duration: float = 0.0,
+        score: float = 0.0,
+    ) -> None:
         """Records result.
 
         Args:
             result (Result): Records a Result.WIN, Result.LOSS, or Result.FAILURE.
+            guesses (int, optional): Number of guesses made in the round. Defaults to 0.
+            duration (float, optional): Seconds spent playing the round. Defaults to 0.0.
+            score (float, optional): Score awarded for the round, added to self.score. Defaults to 0.0.
         """
 
         self.__results[result] += 1
 
+        self.guesses.append(guesses)
+        self.durations.append(duration)
+        self.outcomes.append(result.value)
+        self.scores.append(score)
+
+        self.score += score
+
     def get_number_of_wins(self) -> int:
 
         return self.__results[Result.WIN]
@@ -84,6 +153,275 @@ class Results:
 
         return 5 * self.get_number_of_wins() - 2 * self.get_number_of_losses()
 
+    def get_winning_guesses(self) -> list[int]:
+        """Gets number of guesses of every won round
+
+        Returns:
+            list[int]: Returns number of guesses for each won round, in the order they were recorded.
+        """
+
+        return [
+            guesses
+            for guesses, outcome in zip(self.guesses, self.outcomes)
+            if outcome == Result.WIN.value
+        ]
+
+    def mean_guesses(self) -> float:
+        """Computes mean number of guesses of won rounds
+
+        Returns:
+            float: Returns mean number of guesses, or nan if no round was won.
+        """
+
+        guesses = self.get_winning_guesses()
+
+        if len(guesses) == 0:
+
+            return math.nan
+
+        return math.fsum(guesses) / len(guesses)
+
+    def median_guesses(self) -> float:
+        """Computes median number of guesses of won rounds
+
+        Returns:
+            float: Returns median number of guesses, or nan if no round was won.
+        """
+
+        guesses = self.get_winning_guesses()
+
+        if len(guesses) == 0:
+
+            return math.nan
+
+        import statistics  # Imported on first use, to keep the start of the command line fast
+
+        return statistics.median(guesses)
+
+    def percentile_guesses(self, percentile: float = 95) -> float:
+        """Computes a percentile (nearest-rank) of the number of guesses of won rounds
+
+        Args:
+            percentile (float, optional): Percentile between 0 and 100. Defaults to 95.
+
+        Returns:
+            float: Returns percentile of number of guesses, or nan if no round was won.
+        """
+
+        guesses = sorted(self.get_winning_guesses())
+
+        if len(guesses) == 0:
+
+            return math.nan
+
+        rank = max(1, math.ceil(percentile / 100 * len(guesses)))
+
+        return guesses[rank - 1]
+
+    def score_confidence_interval(
+        self, confidence: float = 0.95
+    ) -> tuple[float, float]:
+        """Computes a normal-approximation confidence interval on the mean score per round
+
+        Args:
+            confidence (float, optional): Confidence level of the interval. Defaults to 0.95.
+
+        Returns:
+            tuple[float, float]: (lower bound, upper bound) of mean score per round, (nan, nan) if fewer than 2 rounds.
+        """
+
+        if len(self.scores) < 2:
+
+            return (math.nan, math.nan)
+
+        import statistics
+
+        mean = math.fsum(self.scores) / len(self.scores)
+        error = statistics.stdev(self.scores) / math.sqrt(len(self.scores))
+        z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+
+        return (mean - z * error, mean + z * error)
+
+    def get_score_decomposition(self) -> dict[str, float]:
+        """Splits the score into points earned by wins and penalties of failures
+
+        Returns:
+            dict[str, float]: Returns {"wins": points from won rounds, "failures": points from failed rounds}.
+        """
+
+        decomposition = {"wins": 0.0, "failures": 0.0}
+
+        for outcome, score in zip(self.outcomes, self.scores):
+
+            if outcome == Result.WIN.value:
+
+                decomposition["wins"] += score
+
+            elif outcome == Result.FAILURE.value:
+
+                decomposition["failures"] += score
+
+        return decomposition
+
+    def summary(self, confidence: float = 0.95) -> dict:
+        """Computes aggregate statistics of the recorded rounds
+
+        Args:
+            confidence (float, optional): Confidence level of the score interval. Defaults to 0.95.
+
+        Returns:
+            dict: Returns counts, score, score decomposition and guess/latency statistics.
+        """
+
+        low, high = self.score_confidence_interval(confidence)
+
+        return {
+            "rounds": self.get_number_of_rounds(),
+            "wins": self.get_number_of_wins(),
+            "losses": self.get_number_of_losses(),
+            "failures": self.get_number_of_failures(),
+            "score": self.score,
+            "score_decomposition": self.get_score_decomposition(),
+            "mean_round_score_interval": [low, high],
+            "mean_guesses": self.mean_guesses(),
+            "median_guesses": self.median_guesses(),
+            "p95_guesses": self.percentile_guesses(95),
+            "mean_duration": (
+                math.fsum(self.durations) / len(self.durations)
+                if len(self.durations)
+                else math.nan
+            ),
+        }
+
+    def to_csv(self, file_name: str) -> None:
+        """Writes one row per recorded round to a CSV file
+
+        Args:
+            file_name (str): Name of file to write to.
+        """
+
+        import csv
+
+        with open(file_name, "w", newline="") as file:
+
+            writer = csv.writer(file)
+            writer.writerow(["round", "result", "guesses", "duration", "score"])
+
+            for i in range(len(self.outcomes)):
+
+                writer.writerow(
+                    [
+                        i + 1,
+                        Result(self.outcomes[i]).name,
+                        self.guesses[i],
+                        self.durations[i],
+                        self.scores[i],
+                    ]
+                )
+
+        return
+
+    def to_json(self, file_name: str) -> None:
+        """Writes summary and columns of recorded rounds to a JSON file
+
+        Args:
+            file_name (str): Name of file to write to.
+        """
+
+        data = {
+            "summary": self.summary(),
+            "columns": {
+                "result": [Result(outcome).name for outcome in self.outcomes],
+                "guesses": self.guesses.tolist(),
+                "duration": self.durations.tolist(),
+                "score": self.scores.tolist(),
+            },
+        }
+
+        import json
+
+        with open(file_name, "w") as file:
+
+            # Statistics of too few rounds are NaN, which is written as null
+            json.dump(finite_or_none(data), file, allow_nan=False)
+
+        return
+
+    def to_binary(self, file_name: str) -> None:
+        """Writes recorded rounds to a columnar little-endian binary file
+
+        The file is a header (magic, version, number of rounds) followed by the raw guesses (uint32),
+        durations (float64), outcomes (uint8) and scores (float64) columns.
+
+        Args:
+            file_name (str): Name of file to write to.
+        """
+
+        with open(file_name, "wb") as file:
+
+            file.write(self.BINARY_MAGIC)
+            file.write(struct.pack("<HQ", self.BINARY_VERSION, len(self.outcomes)))
+
+            for column in (self.guesses, self.durations, self.outcomes, self.scores):
+
+                if sys.byteorder == "big":
+
+                    column = array.array(column.typecode, column)
+                    column.byteswap()
+
+                file.write(column.tobytes())
+
+        return
+
+    @classmethod
+    def from_binary(cls, file_name: str) -> "Results":
+        """Reads recorded rounds from a file written by to_binary
+
+        Args:
+            file_name (str): Name of file to read from.
+
+        Raises:
+            ValueError: File is not a results file of a supported version.
+
+        Returns:
+            Results: Returns Results containing the rounds of the file.
+        """
+
+        results = cls()
+
+        with open(file_name, "rb") as file:
+
+            if file.read(4) != cls.BINARY_MAGIC:
+
+                raise ValueError("Not a results file.")
+
+            version, num_rounds = struct.unpack("<HQ", file.read(10))
+
+            if version != cls.BINARY_VERSION:
+
+                raise ValueError("Unsupported results file version.")
+
+            for column in (
+                results.guesses,
+                results.durations,
+                results.outcomes,
+                results.scores,
+            ):
+
+                column.frombytes(file.read(num_rounds * column.itemsize))
+
+                if sys.byteorder == "big":
+
+                    column.byteswap()
+
+        for outcome in results.outcomes:
+
+            results.__results[Result(outcome)] += 1
+
+        results.score = math.fsum(results.scores)
+
+        return results
+
     def __str__(self) -> str:
         """String representation of a Results object."""
 
@@ -111,6 +449,7 @@ class Round:
         scsa_name: str,
         guess_cutoff: int = 100,
         time_cutoff: int = 5,
+        memo_size: int = 16,
     ):
         """Constuctor for Round
 
@@ -121,10 +460,14 @@ class Round:
             scsa_name (str): Name of SCSA used to generate secret code.
             guess_cutoff (int, optional): Number of guesses allowed per round. Defaults to 100.
             time_cutoff (int, optional): Amount of time in seconds allowed for the round. Defaults to 5.
+            memo_size (int, optional): Number of recent guesses whose feedback is remembered, 0 to disable. Defaults to 16.
         """
 
         self.board_length = board_length
         self.colors = colors
+        self.alphabet = Alphabet(colors)
+        self.memo_size = memo_size
+        self.memo = OrderedDict()  # Recent guesses -> (exact, other), least recently used first
         self.answer = answer
         self.scsa_name = scsa_name
         self.guesses = 0
@@ -133,6 +476,23 @@ class Round:
         self.time_buffer = 0.1  # Seconds
         self.time_used = 0
 
+    @property
+    def answer(self) -> str:
+        """Answer for the round that the player is trying to guess."""
+
+        return self._answer
+
+    @answer.setter
+    def answer(self, answer: str) -> None:
+
+        # The answer is fixed for the round, so everything derived from it is computed once here
+        self._answer = answer
+        self.answer_indices = self.encode(answer)
+        self.answer_color_count = [
+            self.answer_indices.count(i) for i in range(len(self.colors))
+        ]
+        self.memo.clear()
+
     def valid_guess(self, guess: str) -> bool:
         """Checks whether a guess is valid
 
@@ -147,13 +507,20 @@ class Round:
 
             return False
 
-        for peg in guess:
+        return self.alphabet.is_valid(guess)
+
+    def encode(self, guess: str):
+        """Converts a guess to the indices of its colors in a single pass
 
-            if peg not in self.colors:
+        Args:
+            guess (str): Guess of secret code.
 
-                return False
+        Returns:
+            bytes or list[int]: Returns index in self.colors of each peg, self.alphabet.invalid for pegs that are not
+                                a possible color.
+        """
 
-        return True
+        return self.alphabet.encode(guess)
 
     def count_colors(self, guess: str) -> list[int]:
         """Counts number of occurences for each color
@@ -161,15 +528,17 @@ class Round:
         Args:
             guess (str): Guess of secret code.
 
+        Raises:
+            IndexError: Guess contains a color that is not in self.colors.
+
         Returns:
             list[int]: Returns list of number of occurences for each color in self.color.
         """
 
         counts = [0] * len(self.colors)
 
-        for peg in guess:
-
-            idx = letter_to_num(peg) - 1
+        # self.alphabet.invalid is never a valid index, so unknown colors raise IndexError
+        for idx in self.encode(guess):
 
             counts[idx] += 1
 
@@ -186,42 +555,61 @@ class Round:
                             number of pegs that are the right color, but in the wrong location)
         """
 
-        guess_color_count = self.count_colors(guess)
-        answer_color_count = self.count_colors(self.answer)
+        if guess in self.memo:
 
-        exact = 0
-        other = 0
+            self.memo.move_to_end(guess)
 
-        for i in range(self.board_length):
+            return self.memo[guess]
 
-            if guess[i] == self.answer[i]:
+        guess_indices = self.encode(guess)
+        answer_color_count = self.answer_color_count.copy()
 
-                exact += 1
+        exact = sum(map(eq, guess_indices, self.answer_indices))
 
-                # Decrease color counts
-                guess_color_count[letter_to_num(guess[i]) - 1] -= 1
-                answer_color_count[letter_to_num(self.answer[i]) - 1] -= 1
+        # Pegs of the guess that match some unused peg of the answer, the exact matches included
+        common = 0
 
-        for i in range(len(self.colors)):
+        for idx in guess_indices:
 
-            if answer_color_count[i] <= guess_color_count[i]:
+            if answer_color_count[idx] > 0:
 
-                other += answer_color_count[i]
+                answer_color_count[idx] -= 1
+                common += 1
 
-            elif (
-                guess_color_count[i] < answer_color_count[i]
-                and guess_color_count[i] > 0
-            ):
+        response = (exact, common - exact)
+
+        if self.memo_size > 0:
+
+            self.memo[guess] = response
+
+            if len(self.memo) > self.memo_size:
+
+                self.memo.popitem(last=False)
+
+        return response
+
+    def process_exact(self, guess: str) -> int:
+        """Determines number of exactly correct pegs for a valid guess, without counting colors
+
+        Args:
+            guess (str): Guess of secret code, which is valid.
 
-                other += guess_color_count[i]
+        Returns:
+            int: Returns number of pegs that match exactly with the answer.
+        """
 
-        return (exact, other)
+        # Pegs are single characters, so a valid guess is compared with the answer without encoding it
+        return sum(map(eq, guess, self._answer))
 
-    def respond_to_guess(self, guess: str) -> tuple[Result, int, int, int]:
+    def respond_to_guess(
+        self, guess: str, exact_only: bool = False
+    ) -> tuple[Result, int, int, int]:
         """Responds with correctness of player's guess.
 
         Args:
             guess (str): Guess of secret code.
+            exact_only (bool, optional): Whether to only count exact pins and respond with 0 other pins,
+                                         for players that set Player.exact_only. Defaults to False.
 
         Returns:
             tuple[Result, int, int, int]: (result of round (WIN, LOSS, VALID, or FAILURE),
@@ -242,9 +630,15 @@ class Round:
 
         elif self.valid_guess(guess):
 
-            exact, other = self.process_guess(guess)
+            if exact_only:
+
+                response = (Result.VALID, self.process_exact(guess), 0, self.guesses)
 
-            response = (Result.VALID, exact, other, self.guesses)
+            else:
+
+                exact, other = self.process_guess(guess)
+
+                response = (Result.VALID, exact, other, self.guesses)
 
         else:
 
@@ -252,11 +646,17 @@ class Round:
 
         return response
 
-    def play_round(self, player: Player) -> tuple[Result, int]:
+    def play_round(
+        self, player: Player, profiler=None, recorder=None
+    ) -> tuple[Result, int]:
         """Plays out a round of Mastermind.
 
         Args:
             player (Player): Player to guess secret code.
+            profiler (RoundProfiler, optional): Profiler of the "make_guess" and "engine" phases, see profiling.py.
+                                                Its overhead is not counted in self.time_used. Defaults to None.
+            recorder (TraceWriter, optional): Recorder of the guesses, responses and time of every guess of
+                                              the round, see traces.py. Defaults to None.
 
         Returns:
             tuple[Result, int]: (result of round (WIN, LOSS, or FAILURE)
@@ -265,29 +665,63 @@ class Round:
 
         self.guesses = 0
         player_response = (0, 0, 0)
+        outcome = Result.LOSS
+        exact_only = getattr(player, "exact_only", False)
+
+        if recorder is not None:
+
+            guesses = []
+            responses = []
+            latencies = []
 
         while self.guesses < self.guess_cutoff:
 
+            if profiler is not None:
+
+                profiler.start("make_guess")
+
             start = time.time()
             guess = player.make_guess(
                 self.board_length, self.colors, self.scsa_name, player_response
             )
-            end = time.time()
 
-            duration = end - start
+            # Stopping is timed with the guess, since the profiler reports its own time as overhead
+            overhead = profiler.stop() if profiler is not None else 0.0
+            end = time.time()
 
+            duration = end - start - overhead
             self.time_used += duration
 
-            response = self.respond_to_guess(guess)
+            if profiler is not None:
+
+                profiler.start("engine")
+
+            response = self.respond_to_guess(guess, exact_only)
             player_response = response[1:]  # Remove result element
 
+            if profiler is not None:
+
+                profiler.stop()
+
             # print("Response:", response, "Time:", self.time_used)
 
+            if recorder is not None:
+
+                guesses.append(guess)
+                responses.append(response[1:3])
+                latencies.append(duration)
+
             if response[0] != Result.VALID:
 
-                return (response[0], self.guesses)
+                outcome = response[0]
+
+                break
+
+        if recorder is not None:
+
+            recorder.record(self, outcome, guesses, responses, latencies)
 
-        return (Result.LOSS, self.guesses)
+        return (outcome, self.guesses)
 
 
 class Mastermind:
@@ -300,6 +734,7 @@ class Mastermind:
         guess_cutoff: int = 100,
         round_time_cutoff: int = 5,
         tournament_time_cutoff: int = 300,
+        planner=None,
     ):
         """Constructor for Mastermind.
 
@@ -309,6 +744,8 @@ class Mastermind:
             guess_cutoff (int, optional): Number of guesses allowed per round. Defaults to 100.
             round_time_cutoff (int, optional):  Amount of time in seconds allowed for the round. Defaults to 5.
             tournament_time_cutoff (int, optional): Amount of time in seconds allowed for the round. Defaults to 300.
+            planner (MemoryPlanner, optional): Planner of the representation players use for the codes of this
+                                               geometry, see planning.py. Defaults to None.
         """
 
         self.board_length = board_length
@@ -317,8 +754,51 @@ class Mastermind:
         self.guess_cutoff = guess_cutoff
         self.round_time_cutoff = round_time_cutoff
         self.tournament_time_cutoff = tournament_time_cutoff
+        self.planner = planner
         self.time_used = 0
 
+    def configure_player(self, player: Player) -> None:
+        """Passes the plan of this geometry to a player that can follow it, if there is a planner
+
+        Args:
+            player (Player): Player about to play, configured if it has a configure(plan) method.
+        """
+
+        configure = getattr(player, "configure", None)
+
+        if self.planner is None or configure is None:
+
+            return
+
+        configure(
+            self.planner.plan(
+                self.board_length, self.num_colors, self.round_time_cutoff
+            )
+        )
+
+        return
+
+    def score_round(self, result: Result, guesses: int) -> float:
+        """Computes score awarded for a round
+
+        Args:
+            result (Result): Result of the round.
+            guesses (int): Number of guesses until that result was achieved.
+
+        Returns:
+            float: Returns score of the round (positive for a win, negative for a failure, otherwise 0).
+        """
+
+        if result == Result.WIN:
+
+            return self.board_length * len(self.colors) * (5 * guesses ** (-0.5))
+
+        elif result == Result.FAILURE:
+
+            return -2 * self.board_length * len(self.colors)
+
+        return 0
+
     def print_results(
         self, player: Player, scsa_name: str, results: Results, num_rounds: int
     ) -> None:
@@ -339,16 +819,32 @@ class Mastermind:
 
         return
 
-    def play_tournament(self, player: Player, scsa: SCSA, num_rounds: int) -> None:
+    def play_tournament(
+        self,
+        player: Player,
+        scsa: SCSA,
+        num_rounds: int,
+        verbose: bool = True,
+        profiler=None,
+        recorder=None,
+    ) -> Results:
         """Plays a tournament of Mastermind
 
         Args:
             player (Player): Player who plays in tournament, making guesses.
             scsa (SCSA): SCSA used to generate secret codes for player to guess.
             num_rounds (int): Number of rounds of Mastermind to play.
+            verbose (bool, optional): Whether to print the results of the tournament. Defaults to True.
+            profiler (RoundProfiler, optional): Profiler of every round, see profiling.py. Its overhead is not counted
+                                                in the time used by the tournament. Defaults to None.
+            recorder (TraceWriter, optional): Recorder of every round, see traces.py. Defaults to None.
+
+        Returns:
+            Results: Results of the tournament.
         """
 
         results = Results()
+        self.configure_player(player)
 
         for round in range(1, num_rounds + 1):
 
@@ -363,12 +859,18 @@ class Mastermind:
                 self.round_time_cutoff,
             )
 
+            overhead = 0 if profiler is None else profiler.overhead
+
             start = time.time()
-            result, guesses = round.play_round(player)
+            result, guesses = round.play_round(player, profiler, recorder)
             end = time.time()
 
             duration = end - start
 
+            if profiler is not None:
+
+                duration -= profiler.overhead - overhead
+
             self.time_used += duration
 
             if self.time_used > self.tournament_time_cutoff:
@@ -377,39 +879,49 @@ class Mastermind:
 
             # print("Round:", round, "|",  "Result:", result, "|", "Guesses:", guesses)
 
-            results.record_result(result)
-
-            if result == Result.WIN:
-
-                results.score += (
-                    self.board_length * len(self.colors) * (5 * guesses ** (-0.5))
-                )
-
-            elif result == Result.FAILURE:
+            results.record_result(
+                result, guesses, duration, self.score_round(result, guesses)
+            )
 
-                results.score -= 2 * self.board_length * len(self.colors)
+            if result == Result.FAILURE:
 
                 break
 
-        self.print_results(player, scsa.name, results, num_rounds)
+        if verbose:
 
-        return
+            self.print_results(player, scsa.name, results, num_rounds)
+
+        return results
 
     def practice_tournament(
-        self, player: Player, scsa_name: str, code_file: str
-    ) -> None:
+        self,
+        player: Player,
+        scsa_name: str,
+        code_file: str,
+        verbose: bool = True,
+        profiler=None,
+        recorder=None,
+    ) -> Results:
         """Plays a tournament of Mastermind using pregenerated codes from file
 
         Args:
             player (Player): Player who plays in tournament, making guesses.
             scsa_name (str): Name of SCSA used to generate codes in tournament.
             code_file (str): Name of file to read secret codes from.
+            verbose (bool, optional): Whether to print the results of the tournament. Defaults to True.
+            profiler (RoundProfiler, optional): Profiler of every round, see profiling.py. Its overhead is not counted
+                                                in the time used by the tournament. Defaults to None.
+            recorder (TraceWriter, optional): Recorder of every round, see traces.py. Defaults to None.
+
+        Returns:
+            Results: Results of the tournament.
         """
 
         codes = read_from_file(code_file)
         num_rounds = len(codes)
         results = Results()
         cur_round = 0
+        self.configure_player(player)
 
         for code in codes:
 
@@ -424,12 +936,18 @@ class Mastermind:
                 self.round_time_cutoff,
             )
 
+            overhead = 0 if profiler is None else profiler.overhead
+
             start = time.time()
-            result, guesses = round.play_round(player)
+            result, guesses = round.play_round(player, profiler, recorder)
             end = time.time()
 
             duration = end - start
 
+            if profiler is not None:
+
+                duration -= profiler.overhead - overhead
+
             self.time_used += duration
 
             if self.time_used > self.tournament_time_cutoff:
@@ -438,20 +956,16 @@ class Mastermind:
 
             # print("Round:", cur_round, "|", "Result:", result, "|", "Guesses:", guesses)
 
-            results.record_result(result)
-
-            if result == Result.WIN:
-
-                results.score += (
-                    self.board_length * len(self.colors) * (5 * guesses ** (-0.5))
-                )
-
-            elif result == Result.FAILURE:
+            results.record_result(
+                result, guesses, duration, self.score_round(result, guesses)
+            )
 
-                results.score -= 2 * self.board_length * len(self.colors)
+            if result == Result.FAILURE:
 
                 break
 
-        self.print_results(player, scsa_name, results, num_rounds)
+        if verbose:
 
-        return
+            self.print_results(player, scsa_name, results, num_rounds)
+
+        return results
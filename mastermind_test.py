@@ -1,7 +1,64 @@
+import csv
+import functools
+import io
+import itertools
+import json
+import os
+import random
+import sys
+import tempfile
 import unittest
 import time
 from mastermind import *
-from player import Player
+from player import (
+    Player,
+    BatchAdapter,
+    GameState,
+    RandomFolks,
+    StatefulAdapter,
+    StatelessAdapter,
+)
+from codes import *
+from alphabet import default_colors
+from simulation import simulate_rounds
+from evaluation import StratifiedEstimate, code_features, evaluate_stratified
+from scsa import InsertColors
+from LMU import LMU
+from minimax import Minimax
+from parallel import ParallelEvaluator
+from decision_cache import (
+    CachedPlayer,
+    DecisionCache,
+    canonical_colors,
+    make_key,
+)
+from solver import GameTreeSolver, TreePlayer
+from bitset import CandidateSet, CodeIndex
+from symmetry import GuessSymmetry
+from shared import SharedArray, SharedTables
+import multiprocessing
+import sweep
+from evolution import Genetic
+from annealing import Annealing
+from specialized import (
+    ABColorSolver,
+    AlternatingSolver,
+    Specialized,
+    SupportSolver,
+)
+from planning import MemoryPlanner
+from profiling import DeterministicProfiler, RoundProfiler, SamplingProfiler
+from traces import TraceWriter, read_traces, replay, rescore, verify
+from distributed import (
+    Coordinator,
+    play_batch,
+    play_distributed,
+    receive_message,
+    run_worker,
+    send_message,
+)
+import socket
+import threading
 
 
 class InvalidGuessFailureTestPlayer(Player):
@@ -68,6 +125,78 @@ class LossTestPlayer(Player):
         return self.incorrect_guess
 
 
+class CountingTestPlayer(Player):
+    """Player that guesses the number of guesses it made, including this one"""
+
+    def __init__(self):
+
+        self.num_guesses = 0
+
+    def make_guess(
+        self,
+        board_length: int,
+        colors: list[str],
+        scsa_name: str,
+        last_response: tuple[int, int, int],
+    ) -> str:
+
+        self.num_guesses += 1
+
+        return str(self.num_guesses)
+
+
+class SlowCountingTestProfiler(DeterministicProfiler):
+    """Profiler that sleeps whenever it counts the calls of a phase"""
+
+    def __init__(self, delay: float):
+
+        super().__init__(calibration_calls=1000)
+
+        self.delay = delay
+
+    def count_calls(self, phase: str) -> int:
+
+        time.sleep(self.delay)
+
+        return super().count_calls(phase)
+
+
+class SlowTracerTestProfiler(RoundProfiler):
+    """Profiler whose tracer sleeps on every call, reporting the sleep as overhead"""
+
+    def __init__(self, delay: float):
+
+        super().__init__()
+
+        self.delay = delay
+        self.slept = 0.0
+
+    def trace(self, frame, event, arg) -> None:
+
+        if event == "call":
+
+            time.sleep(self.delay)
+            self.slept += self.delay
+
+    def start(self, phase: str) -> None:
+
+        self.phase = phase
+        self.slept = 0.0
+        sys.setprofile(self.trace)
+
+    def stop(self) -> float:
+
+        sys.setprofile(None)
+        self.phase = None
+        self.overhead += self.slept
+
+        return self.slept
+
+    def report(self, stream=None, limit: int = 20) -> None:
+
+        return
+
+
 class TimeLossTestPlayer(Player):
     def __init__(self, sleep_time: float):
 
@@ -169,6 +298,54 @@ class TestRound(unittest.TestCase):
         response = round.process_guess(guess)
         self.assertEqual(response, correct_response)
 
+    def test_large_alphabets(self):
+
+        colors = default_colors(64)
+        round = Round(
+            board_length=4,
+            colors=colors,
+            answer="Zz+/",
+            scsa_name="InsertColors",
+        )
+
+        self.assertTrue(round.valid_guess("/+zZ"))
+        self.assertFalse(round.valid_guess("Zz+-"))
+        self.assertEqual(round.process_guess("/+zZ"), (0, 4))
+        self.assertEqual(round.count_colors("Z/")[25], 1)
+        self.assertEqual(round.count_colors("Z/")[63], 1)
+
+        # Symbols outside of latin-1 use the slower dictionary lookup
+        round = Round(
+            board_length=3,
+            colors=["α", "β", "γ"],
+            answer="αβγ",
+            scsa_name="InsertColors",
+        )
+
+        self.assertTrue(round.valid_guess("γβα"))
+        self.assertFalse(round.valid_guess("γβA"))
+        self.assertEqual(round.process_guess("γβα"), (1, 2))
+
+    def test_process_guess_memo(self):
+
+        round = Round(
+            board_length=5,
+            colors=["A", "B", "C", "D", "E"],
+            answer="ABCBA",
+            scsa_name="InsertColors",
+            memo_size=1,
+        )
+
+        self.assertEqual(round.process_guess("AACBB"), (3, 2))
+        self.assertEqual(round.process_guess("AACBB"), (3, 2))
+        self.assertEqual(round.process_guess("BCDEB"), (0, 3))
+        self.assertEqual(list(round.memo), ["BCDEB"])
+
+        # Changing the answer must not reuse feedback for the old answer
+        round.answer = "AACBB"
+        self.assertEqual(round.process_guess("AACBB"), (5, 0))
+        self.assertEqual(round.answer_color_count, [2, 2, 1, 0, 0])
+
     def test_respond_to_guess(self):
 
         round = Round(
@@ -208,6 +385,57 @@ class TestRound(unittest.TestCase):
         response = round.respond_to_guess(guess)
         self.assertEqual(response, correct_response)
 
+    def test_respond_to_guess_exact_only(self):
+
+        round = Round(
+            board_length=5,
+            colors=["A", "B", "C", "D", "E"],
+            answer="ABCBA",
+            scsa_name="InsertColors",
+        )
+
+        # Exact pins are the same as with colors counted, other pins are not counted
+        for guess in ["AAAAA", "ABCDE", "EDCBA", "BCBAD", "ABCBE"]:
+
+            exact, _ = round.process_guess(guess)
+            self.assertEqual(round.process_exact(guess), exact)
+            self.assertEqual(
+                round.respond_to_guess(guess, exact_only=True)[:3],
+                (Result.VALID, exact, 0),
+            )
+
+        self.assertEqual(
+            round.respond_to_guess("ABCBA", exact_only=True)[:3], (Result.WIN, 5, 0)
+        )
+        self.assertEqual(
+            round.respond_to_guess("ABCBF", exact_only=True)[:3],
+            (Result.FAILURE, 0, 0),
+        )
+
+        # Players that declare exact_only get responses without other pins
+        self.assertTrue(LMU.exact_only)
+        self.assertFalse(Player.exact_only)
+
+        responses = []
+
+        class ExactOnlyTestPlayer(WinTestPlayer):
+
+            exact_only = True
+
+            def make_guess(self, board_length, colors, scsa_name, last_response):
+
+                responses.append(last_response)
+
+                return super().make_guess(board_length, colors, scsa_name, last_response)
+
+        player = ExactOnlyTestPlayer(
+            regular_guess="BCBAD", winning_guess="ABCBA", num_guesses=3
+        )
+
+        # BCBAD has 4 pegs of the right color in the wrong location, which are not counted
+        self.assertEqual(round.play_round(player), (Result.WIN, 3))
+        self.assertEqual(responses, [(0, 0, 0), (0, 0, 1), (0, 0, 2)])
+
     def test_play_round(self):
 
         round = Round(
@@ -246,6 +474,965 @@ class TestRound(unittest.TestCase):
         response = round.play_round(time_loss_player)
         self.assertEqual(response, correct_response)
 
+    def test_play_round_profiled(self):
+
+        for profiler in [DeterministicProfiler(), SamplingProfiler()]:
+
+            round = Round(
+                board_length=5,
+                colors=["A", "B", "C", "D", "E"],
+                answer="ABCBA",
+                scsa_name="InsertColors",
+            )
+
+            winning_player = WinTestPlayer(
+                regular_guess="BCBAD", winning_guess="ABCBA", num_guesses=5
+            )
+            correct_response = (Result.WIN, 5)
+            response = round.play_round(winning_player, profiler)
+            profiler.close()
+            self.assertEqual(response, correct_response)
+            self.assertGreaterEqual(profiler.overhead, 0)
+            self.assertIsNone(profiler.phase)
+
+        # The time of the round excludes the overhead reported by the profiler
+        round = Round(5, ["A", "B", "C", "D", "E"], "ABCBA", "InsertColors")
+        profiler = SlowTracerTestProfiler(0.02)
+        winning_player = WinTestPlayer(
+            regular_guess="BCBAD", winning_guess="ABCBA", num_guesses=5
+        )
+
+        self.assertEqual(round.play_round(winning_player, profiler), (Result.WIN, 5))
+        self.assertGreaterEqual(profiler.overhead, 5 * 0.02)
+        self.assertLess(round.time_used, 0.02)
+
+        # Time spent stopping the profiler is overhead as well
+        round = Round(5, ["A", "B", "C", "D", "E"], "ABCBA", "InsertColors")
+        profiler = SlowCountingTestProfiler(0.02)
+        winning_player = WinTestPlayer(
+            regular_guess="BCBAD", winning_guess="ABCBA", num_guesses=5
+        )
+
+        self.assertEqual(round.play_round(winning_player, profiler), (Result.WIN, 5))
+        self.assertGreaterEqual(profiler.overhead, 10 * 0.02)
+        self.assertLess(round.time_used, 0.02)
+
+    def test_play_round_traced(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            file_name = os.path.join(directory, "rounds.trace")
+            mastermind = Mastermind(5, ["A", "B", "C", "D", "E"])
+            winning_player = WinTestPlayer(
+                regular_guess="BCBAD", winning_guess="ABCBA", num_guesses=5
+            )
+
+            with TraceWriter(file_name, queue_size=1) as writer:
+
+                round = Round(5, ["A", "B", "C", "D", "E"], "ABCBA", "InsertColors")
+                round.play_round(winning_player, recorder=writer)
+
+            # A second writer appends rounds of another geometry to the same file
+            with TraceWriter(file_name) as writer:
+
+                round = Round(3, ["A", "B"], "ABA", "TwoColor")
+                round.play_round(
+                    InvalidGuessFailureTestPlayer("AAA", "ABC", 2), recorder=writer
+                )
+
+            traces = list(read_traces(file_name))
+
+            self.assertEqual(len(traces), 2)
+            self.assertEqual(traces[0].answer, "ABCBA")
+            self.assertEqual(traces[0].result, Result.WIN)
+            self.assertEqual(traces[0].guesses, ["BCBAD"] * 4 + ["ABCBA"])
+            self.assertEqual(traces[0].responses, [(0, 4)] * 4 + [(5, 0)])
+            self.assertEqual(len(traces[0].latencies), 5)
+            self.assertEqual((traces[1].board_length, traces[1].colors), (3, ["A", "B"]))
+            self.assertEqual(traces[1].guesses, ["AAA", "ABC"])
+            self.assertEqual(traces[1].result, Result.FAILURE)
+
+            self.assertIsNone(replay(winning_player, traces[0]))
+            self.assertEqual(replay(LossTestPlayer("DABCE"), traces[0]), 0)
+            self.assertEqual(verify(winning_player, traces[:1]), [])
+
+            results = rescore(traces, mastermind.score_round)
+            self.assertEqual(results.get_number_of_wins(), 1)
+            self.assertEqual(results.get_number_of_failures(), 1)
+            self.assertEqual(list(results.guesses), [5, 2])
+
+            # A round cut off while it is written ends the stream
+            with open(file_name, "ab") as file:
+
+                file.write(b"R\xff\x00\x00\x00R")
+
+            self.assertEqual(len(list(read_traces(file_name))), 2)
+
+            # The next writer drops the cut off round, and stores an invalid guess that is not a string as text
+            with TraceWriter(file_name) as writer:
+
+                round = Round(3, ["A", "B"], "ABA", "TwoColor")
+                round.play_round(
+                    InvalidGuessFailureTestPlayer("AAA", ("A", "B"), 2),
+                    recorder=writer,
+                )
+                round.play_round(WinTestPlayer("AAA", "ABA", 2), recorder=writer)
+
+            traces = list(read_traces(file_name))
+
+            self.assertEqual(len(traces), 4)
+            self.assertEqual(traces[2].guesses, ["AAA", "('A', 'B')"])
+            self.assertEqual(traces[2].result, Result.FAILURE)
+            self.assertEqual(traces[3].result, Result.WIN)
+
+
+class TestStatelessPlayers(unittest.TestCase):
+    def test_shared_player(self):
+
+        colors = ["A", "B", "C", "D"]
+        answers = ["ABCD", "DDAA"]
+        player = Minimax()
+
+        # Interleave two rounds that share one player
+        states = [GameState(), GameState()]
+        won = [False, False]
+
+        for _ in range(10):
+
+            for i, answer in enumerate(answers):
+
+                if won[i]:
+
+                    continue
+
+                guess, states[i] = player.next_guess(4, colors, "InsertColors", states[i])
+                exact, other = feedback(guess, answer)
+                states[i] = states[i].record(guess, exact, other)
+                won[i] = guess == answer
+
+        self.assertEqual(won, [True, True])
+
+        # Without cached data the state is rebuilt from the history alone
+        history_only = GameState(states[0].history[:1])
+        guess, state = player.next_guess(4, colors, "InsertColors", history_only)
+        self.assertIn("ABCD", state.data)
+
+    def test_parallel_evaluator(self):
+
+        colors = ["A", "B", "C", "D", "E"]
+        state = GameState((("AABB", 1, 1),))
+        evaluator = ParallelEvaluator(num_workers=2, kind="thread")
+
+        try:
+
+            sequential = Minimax(time_budget=60)
+            parallel = Minimax(time_budget=60, evaluator=evaluator)
+
+            self.assertEqual(
+                parallel.next_guess(4, colors, "InsertColors", state)[0],
+                sequential.next_guess(4, colors, "InsertColors", state)[0],
+            )
+
+        finally:
+
+            evaluator.close()
+
+        # Chunks running at the deadline are left unscored, and the next call only waits for them until its
+        # own deadline, as its chunks queue behind them
+        evaluator = ParallelEvaluator(num_workers=2, kind="thread")
+
+        def slow_kernel(guesses, candidates):
+
+            time.sleep(0.3)
+
+            return [len(candidates)] * len(guesses)
+
+        try:
+
+            for _ in range(2):
+
+                start = time.perf_counter()
+                scores = evaluator.score(
+                    slow_kernel, ["AAAA", "BBBB"], ["CCCC"], start + 0.05
+                )
+
+                self.assertEqual(scores, [None, None])
+                self.assertLess(time.perf_counter() - start, 0.25)
+                self.assertEqual(len(evaluator.running), 2)
+
+            self.assertEqual(
+                evaluator.score(slow_kernel, ["AAAA", "BBBB"], ["CCCC"]), [1, 1]
+            )
+            self.assertTrue(all(future.done() for future in evaluator.running))
+
+        finally:
+
+            evaluator.close()
+
+    def test_decision_cache(self):
+
+        mastermind = Mastermind(4, ["A", "B", "C", "D"])
+        answers = ["ABCD", "DDAA", "CCCB"]
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            path = os.path.join(directory, "minimax.cache")
+            code_file = os.path.join(directory, "codes.txt")
+            guesses = []
+
+            with open(code_file, "w") as file:
+
+                file.write("\n".join(answers))
+
+            for _ in range(2):
+
+                cache = DecisionCache(path)
+                player = CachedPlayer(Minimax(time_budget=None), cache)
+                results = mastermind.practice_tournament(
+                    player, "InsertColors", code_file, verbose=False
+                )
+                guesses.append(list(results.guesses))
+                cache.save()
+                cache.close()
+
+            # The second run only replays decisions of the first
+            self.assertEqual(guesses[0], guesses[1])
+            self.assertEqual(cache.misses, 0)
+
+            cache = DecisionCache(path, max_entries=2)
+            cache.save()
+            self.assertEqual(len(cache), 2)
+            cache.close()
+
+            # A player that disagrees with a stale decision overwrites it and starts the round over, and
+            # players with random choices or time budgets are refused
+            cache = DecisionCache(os.path.join(directory, "solver.cache"))
+            key = make_key(ABColorSolver().player_name, 4, ["A", "B"], "ABColor", ())
+            cache.put(key, "BBBB")
+            round = Round(
+                board_length=4, colors=["A", "B"], answer="ABBA", scsa_name="ABColor"
+            )
+
+            with self.assertLogs("decision_cache", level="WARNING"):
+
+                result = round.play_round(CachedPlayer(ABColorSolver(), cache))
+
+            # The stale guess, then the guesses of a round of the solver
+            self.assertEqual(result, (Result.WIN, 5))
+            self.assertEqual(cache.get(key), "AAAA")
+            cache.close()
+            self.assertRaises(ValueError, CachedPlayer, Minimax(), cache)
+            self.assertRaises(ValueError, CachedPlayer, LMU(), cache)
+            self.assertRaises(ValueError, CachedPlayer, RandomFolks(), cache)
+
+        # Colors are relabeled in the order of their first use
+        self.assertEqual(
+            canonical_colors(["A", "B", "C", "D"], (("CCAD", 1, 0),)),
+            {"C": "A", "A": "B", "D": "C", "B": "D"},
+        )
+
+    def test_game_tree_solver(self):
+
+        for board_length, num_colors in [(2, 2), (2, 3), (3, 2), (3, 3), (2, 4)]:
+
+            colors = default_colors(num_colors)
+            codes = list(itertools.chain(*iterate_codes(board_length, colors)))
+            solution = GameTreeSolver(board_length, colors).solve()
+
+            # Mean number of guesses of the best guess, trying every code without pruning or symmetry
+            @functools.lru_cache(maxsize=None)
+            def brute_force(candidates: frozenset) -> float:
+
+                best = float("inf")
+
+                for guess in codes:
+
+                    parts = {}
+
+                    for code in candidates:
+
+                        parts.setdefault(feedback(guess, code), []).append(code)
+
+                    if len(parts) == 1 and guess not in candidates:
+
+                        continue
+
+                    total = sum(
+                        len(part) * (1 + brute_force(frozenset(part)))
+                        for response, part in parts.items()
+                        if response != (board_length, 0)
+                    )
+                    best = min(best, (total + (guess in candidates)) / len(candidates))
+
+                return best
+
+            self.assertAlmostEqual(solution["expected"], brute_force(frozenset(codes)))
+
+            # Replaying the tree wins every answer, taking the expected number of guesses on average
+            player = TreePlayer(solution)
+            guesses = []
+
+            for answer in codes:
+
+                result, num_guesses = Round(
+                    board_length, colors, answer, "InsertColors"
+                ).play_round(player)
+
+                self.assertEqual(result, Result.WIN)
+
+                guesses.append(num_guesses)
+
+            self.assertAlmostEqual(sum(guesses) / len(guesses), solution["expected"])
+
+        # Sets that are the same up to relabeling share an entry of the transposition table
+        solver = GameTreeSolver(3, ["A", "B", "C"])
+
+        self.assertEqual(
+            solver.canonicalize(("AAB", "ABA"))[0],
+            solver.canonicalize(("CCA", "CAC"))[0],
+        )
+
+        # Without a solution the player solves small games before the rounds are played
+        player = TreePlayer()
+
+        with self.assertRaises(ValueError):
+
+            player.make_guess(2, ["A", "B"], "InsertColors", (0, 0, 0))
+
+        player.solve(2, ["A", "B"])
+        self.assertEqual(
+            Round(2, ["A", "B"], "BA", "InsertColors").play_round(player)[0],
+            Result.WIN,
+        )
+
+        with self.assertRaises(ValueError):
+
+            player.solve(3, ["A", "B"])
+
+        with self.assertRaises(ValueError):
+
+            TreePlayer().solve(5, default_colors(5))
+
+    def test_genetic(self):
+
+        round = Round(
+            board_length=6,
+            colors=["A", "B", "C", "D", "E", "F", "G"],
+            answer="GABBFA",
+            scsa_name="InsertColors",
+        )
+        player = Genetic(time_budget=1)
+
+        self.assertEqual(player.fitness("GABBFA"), 0)
+        self.assertEqual(round.play_round(player)[0], Result.WIN)
+
+        # The guesses of one color each counted every color of the answer
+        self.assertEqual(player.colors_left, {"A": 2, "B": 2, "F": 1, "G": 1})
+
+        # The 35 permutations of the known colors are fewer than a generation, which is then left smaller
+        for seed in range(10):
+
+            random.seed(seed)
+            round = Round(
+                board_length=7,
+                colors=["A", "B", "C", "D", "E"],
+                answer="CDCDCDD",
+                scsa_name="TwoColor",
+            )
+            player = Genetic(time_budget=1)
+
+            self.assertEqual(round.play_round(player)[0], Result.WIN)
+            self.assertEqual(player.colors_left, {"C": 3, "D": 4})
+
+    def test_annealing(self):
+
+        round = Round(
+            board_length=6,
+            colors=["A", "B", "C", "D", "E", "F", "G"],
+            answer="GABBFA",
+            scsa_name="InsertColors",
+        )
+        player = Annealing(cooling="linear", turn_share=0.5)
+
+        self.assertEqual(player.temperature(0), player.initial_temperature)
+        self.assertAlmostEqual(player.temperature(1), player.final_temperature)
+        self.assertEqual(round.play_round(player)[0], Result.WIN)
+        self.assertLess(player.time_used, player.time_cutoff)
+
+        with self.assertRaises(ValueError):
+
+            Annealing(cooling="exponential")
+
+        # A planner passes the time per round, and a round whose share is used up still gets guesses
+        player = Annealing()
+        player.configure(MemoryPlanner().plan(6, 7, round_time=2))
+        self.assertEqual(player.time_cutoff, 2)
+
+        player = Annealing(time_cutoff=0)
+        round = Round(
+            board_length=6,
+            colors=["A", "B", "C", "D", "E", "F", "G"],
+            answer="GABBFA",
+            scsa_name="InsertColors",
+        )
+        self.assertIn(round.play_round(player)[0], [Result.WIN, Result.LOSS])
+
+    def test_specialized(self):
+
+        # Every answer of the structured SCSAs is found within the bound of its solver
+        for num_colors in range(2, 9):
+
+            colors = default_colors(num_colors)
+            solver = AlternatingSolver()
+
+            for board_length, x, y in itertools.product(range(2, 6), colors, colors):
+
+                if x != y:
+
+                    answer = ((x + y) * board_length)[:board_length]
+                    result, guesses = Round(
+                        board_length, colors, answer, "TwoColorAlternating"
+                    ).play_round(solver)
+
+                    self.assertEqual(result, Result.WIN)
+                    self.assertLessEqual(
+                        guesses, solver.max_guesses(board_length, num_colors)
+                    )
+
+        solver = ABColorSolver()
+
+        for code in itertools.product("AB", repeat=6):
+
+            if len(set(code)) == 2:
+
+                result, guesses = Round(
+                    6, ["A", "B", "C"], "".join(code), "ABColor"
+                ).play_round(solver)
+
+                self.assertEqual(result, Result.WIN)
+                self.assertLessEqual(guesses, solver.max_guesses(6, 3))
+
+        # Rounds are dispatched by the name of the SCSA and the geometry
+        player = Specialized()
+        colors = ["A", "B", "C", "D", "E"]
+
+        self.assertIsInstance(
+            player.select(4, colors, "TwoColorAlternating"), AlternatingSolver
+        )
+        self.assertIs(player.select(4, colors, "InsertColors"), player.fallback)
+        self.assertIs(player.select(12, default_colors(20), "OnlyOnce"), player.fallback)
+
+        for scsa_name, answer in [
+            ("ABColor", "ABBAB"),
+            ("FirstLast", "ABCDA"),
+            ("OnlyOnce", "EDCAB"),
+        ]:
+
+            round = Round(5, colors, answer, scsa_name)
+
+            self.assertIsNot(player.select(5, colors, scsa_name), player.fallback)
+            self.assertEqual(round.play_round(player)[0], Result.WIN)
+
+    def test_memory_planner(self):
+
+        planner = MemoryPlanner(2**30)
+
+        self.assertEqual(planner.plan(4, 3).representation, "bitset")
+        self.assertEqual(planner.plan(40, 26).representation, "sampling")
+        self.assertEqual(planner.plan(9, 6).representation, "sampling")  # Too slow
+        self.assertIn("bitset needs", planner.plan(40, 26).reason)
+        self.assertEqual(planner.plan(1000, 64).representation, "sampling")
+        self.assertIn("list needs inf s", MemoryPlanner(2**7000).plan(1000, 64).reason)
+
+        # A list of the codes fits where their bitsets do not
+        memory, _ = MemoryPlanner().estimate("list", 4, 6)
+
+        self.assertEqual(MemoryPlanner(memory).plan(4, 6).representation, "list")
+
+        with self.assertRaises(ValueError):
+
+            MemoryPlanner(1000, representations=["bitset", "list"]).plan(5, 4)
+
+        # Players follow the plan of the tournament, one without enumeration plays through the sampler
+        player = Minimax()
+        mastermind = Mastermind(4, default_colors(6), planner=MemoryPlanner(memory))
+        mastermind.configure_player(player)
+
+        self.assertFalse(player.bitsets)
+
+        player = Minimax()
+        mastermind = Mastermind(5, default_colors(4), planner=MemoryPlanner(1000))
+        results = mastermind.play_tournament(player, InsertColors(), 3, verbose=False)
+
+        self.assertIn((5, 4), player.sampled)
+        self.assertIsInstance(player.sampler, Annealing)
+        self.assertIsNone(player.index)
+        self.assertEqual(results.get_number_of_wins(), 3)
+
+    def test_adapters(self):
+
+        round = Round(
+            board_length=5,
+            colors=["A", "B", "C", "D", "E"],
+            answer="ABCBA",
+            scsa_name="InsertColors",
+        )
+
+        winning_player = StatelessAdapter(
+            StatefulAdapter(
+                lambda: WinTestPlayer(
+                    regular_guess="BCBAD", winning_guess="ABCBA", num_guesses=5
+                )
+            )
+        )
+        correct_response = (Result.WIN, 5)
+        response = round.play_round(winning_player)
+        self.assertEqual(response, correct_response)
+
+        # Branches of a state do not share the Player of the round
+        adapter = StatefulAdapter(CountingTestPlayer)
+        guess, state = adapter.next_guess(1, ["1", "2"], "InsertColors", GameState())
+        state = state.record(guess, 0, 0)
+
+        for _ in range(2):
+
+            guess, _ = adapter.next_guess(1, ["1", "2"], "InsertColors", state)
+            self.assertEqual(guess, "2")
+
+
+class TestSimulation(unittest.TestCase):
+    def test_sweep(self):
+
+        self.assertEqual(sweep.parse_values(["4", "6-8", "7"]), [4, 6, 7, 8])
+        self.assertEqual(
+            sweep.parse_names(["all"], ["LMU", "Boring"]), ["LMU", "Boring"]
+        )
+
+        with self.assertRaises(ValueError):
+
+            sweep.parse_names(["Unknown"], ["LMU", "Boring"])
+
+        jobs = [
+            (board_length, 3, player_name, "InsertColors", 2)
+            for board_length in [3, 4]
+            for player_name in ["LMU", "Minimax"]
+        ]
+
+        # Every task holds jobs of a single geometry
+        for task in sweep.make_tasks(jobs, 2):
+
+            self.assertEqual(len({job[:2] for job in task}), 1)
+
+        output = io.StringIO()
+        num_jobs = sweep.sweep(
+            [3, 4], [3], ["LMU", "Minimax"], ["InsertColors"], 2, output, num_workers=2
+        )
+        rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+
+        self.assertEqual(num_jobs, 4)
+        self.assertEqual(
+            sorted((row["board_length"], row["player_name"]) for row in rows),
+            [("3", "LMU"), ("3", "Minimax"), ("4", "LMU"), ("4", "Minimax")],
+        )
+
+        for row in rows:
+
+            self.assertEqual(row["error"], "")
+            self.assertEqual(row["rounds"], "2")
+            self.assertEqual(row["wins"], "2")
+
+    def test_simulate_rounds(self):
+
+        mastermind = Mastermind(board_length=5, colors=["A", "B", "C", "D", "E"])
+
+        # Same players as test_play_round, one answer per player
+        players = [
+            InvalidGuessFailureTestPlayer(
+                regular_guess="CBCDA", invalid_guess="ABCFEE", num_guesses=10
+            ),
+            WinTestPlayer(regular_guess="BCBAD", winning_guess="ABCBA", num_guesses=5),
+            LossTestPlayer(incorrect_guess="DABCE"),
+        ]
+        batch_player = BatchAdapter(lambda: players.pop(0))
+
+        outcomes = simulate_rounds(
+            mastermind, batch_player, "InsertColors", ["ABCBA", "ABCBA", "ABCBA"]
+        )
+
+        self.assertEqual(
+            [(result, guesses) for result, guesses, _ in outcomes],
+            [(Result.FAILURE, 10), (Result.WIN, 5), (Result.LOSS, 100)],
+        )
+
+        # The player of every round is dropped when the round ends
+        self.assertEqual(batch_player.players, {})
+
+    def test_evaluate_stratified(self):
+
+        self.assertEqual(code_features("ABCBA"), (3, 2))
+
+        estimate = StratifiedEstimate({"easy": 0.75, "hard": 0.25})
+
+        for score in [10, 10, 10]:
+
+            estimate.add("easy", score)
+
+        for score in [0, 4]:
+
+            estimate.add("hard", score)
+
+        self.assertAlmostEqual(estimate.mean(), 0.75 * 10 + 0.25 * 2)
+        self.assertAlmostEqual(estimate.variance(), 0.25**2 * 8 / 2)
+
+        # The stratum whose scores vary gets the rounds beyond the minimum of every stratum
+        self.assertEqual(estimate.allocate(10), {"easy": 1, "hard": 9})
+        self.assertEqual(estimate.allocate(10, min_rounds=0), {"easy": 0, "hard": 10})
+        self.assertEqual(estimate.allocate(1), {"easy": 0, "hard": 1})
+
+        mastermind = Mastermind(board_length=4, colors=["A", "B", "C"])
+        estimate, results = evaluate_stratified(
+            mastermind,
+            LMU(),
+            InsertColors(),
+            relative_half_width=0.05,
+            min_rounds=50,
+            max_rounds=1000,
+            seed=1,
+        )
+        low, high = estimate.interval()
+
+        # A win scores 4 * 3 * 5 / sqrt(guesses), so at most 60 on the first guess
+        self.assertEqual(results.get_number_of_wins(), estimate.num_rounds())
+        self.assertGreaterEqual(estimate.num_rounds(), 50)
+        self.assertLess(low, estimate.mean())
+        self.assertLess(estimate.mean(), high)
+
+        # The run stopped once the half-width was 5% of the estimate
+        self.assertLess(estimate.num_rounds(), 1000)
+        self.assertLessEqual((high - low) / 2, 0.05 * estimate.mean())
+
+    def test_distributed(self):
+
+        mastermind = Mastermind(4, default_colors(3))
+        expected = play_distributed(
+            mastermind, "LMU", "InsertColors", 100, num_workers=2, batch_size=10, seed=3
+        )
+
+        self.assertEqual(expected.get_number_of_rounds(), 100)
+
+        with Coordinator(
+            mastermind,
+            "LMU",
+            "InsertColors",
+            100,
+            batch_size=10,
+            seed=3,
+            lease_timeout=0.2,
+            poll_interval=0.05,
+        ) as coordinator:
+
+            # A worker that takes a batch and dies before reporting it
+            with socket.create_connection(coordinator.address) as connection:
+
+                send_message(connection, {"type": "request"})
+                batch = receive_message(connection.makefile("rb"))
+
+            worker = threading.Thread(target=run_worker, args=(coordinator.address,))
+            worker.start()
+
+            self.assertTrue(coordinator.wait(30))
+
+            worker.join()
+
+            # The batch is served again after its lease expires, and late results are ignored
+            rounds = play_batch(
+                batch["config"], batch["start"], batch["stop"], batch["seed"]
+            )
+            coordinator.record(batch["batch_id"], rounds)
+
+            self.assertEqual(coordinator.duplicates, 10)
+
+        results = coordinator.results()
+
+        # Rounds are aggregated in round order, whichever worker played them
+        self.assertEqual(list(results.guesses), list(expected.guesses))
+        self.assertEqual(list(results.outcomes), list(expected.outcomes))
+        self.assertEqual(results.score, expected.score)
+
+
+class TestResults(unittest.TestCase):
+    def test_statistics(self):
+
+        results = Results()
+
+        for guesses in [1, 4, 9, 16]:
+
+            results.record_result(Result.WIN, guesses, 0.5, 10 / guesses)
+
+        results.record_result(Result.FAILURE, 3, 0.5, -20)
+
+        self.assertEqual(results.get_number_of_rounds(), 5)
+        self.assertAlmostEqual(results.score, 10 + 2.5 + 10 / 9 + 0.625 - 20)
+        self.assertEqual(results.mean_guesses(), 7.5)
+        self.assertEqual(results.median_guesses(), 6.5)
+        self.assertEqual(results.percentile_guesses(95), 16)
+
+        decomposition = results.get_score_decomposition()
+        self.assertAlmostEqual(decomposition["wins"], results.score + 20)
+        self.assertEqual(decomposition["failures"], -20)
+
+        low, high = results.score_confidence_interval()
+        self.assertLess(low, results.score / 5)
+        self.assertGreater(high, results.score / 5)
+
+    def test_binary_round_trip(self):
+
+        results = Results()
+        results.record_result(Result.WIN, 6, 0.25, 12.5)
+        results.record_result(Result.LOSS, 100, 5.0, 0)
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            file_name = os.path.join(directory, "results.bin")
+            results.to_binary(file_name)
+            loaded = Results.from_binary(file_name)
+
+        self.assertEqual(loaded.guesses, results.guesses)
+        self.assertEqual(loaded.durations, results.durations)
+        self.assertEqual(loaded.outcomes, results.outcomes)
+        self.assertEqual(loaded.get_number_of_losses(), 1)
+        self.assertEqual(loaded.score, 12.5)
+
+    def test_text_exports(self):
+
+        results = Results()
+        results.record_result(Result.WIN, 6, 0.25, 12.5)
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            csv_name = os.path.join(directory, "results.csv")
+            json_name = os.path.join(directory, "results.json")
+            results.to_csv(csv_name)
+            results.to_json(json_name)
+
+            with open(csv_name, newline="") as file:
+
+                rows = list(csv.DictReader(file))
+
+            with open(json_name) as file:
+
+                text = file.read()
+
+        self.assertEqual(
+            rows,
+            [
+                {
+                    "round": "1",
+                    "result": "WIN",
+                    "guesses": "6",
+                    "duration": "0.25",
+                    "score": "12.5",
+                }
+            ],
+        )
+
+        # The interval of a single round is NaN, which is not valid JSON
+        self.assertNotIn("NaN", text)
+
+        data = json.loads(text)
+
+        self.assertEqual(data["columns"]["guesses"], [6])
+        self.assertEqual(data["columns"]["result"], ["WIN"])
+        self.assertIsNone(data["summary"]["mean_round_score_interval"][0])
+
+
+class TestCodes(unittest.TestCase):
+    def test_rank_unrank(self):
+
+        colors = ["A", "B", "C", "D", "E"]
+
+        for rank in [0, 1, 4, 5, 1234, 5**7 - 1]:
+
+            self.assertEqual(rank_code(unrank_code(rank, 7, colors), colors), rank)
+
+        self.assertEqual(unrank_code(7, 3, colors), "ABC")
+
+        # Ranges start at the code of their first rank, in rank order up to the end of the space
+        codes = list(itertools.chain(*iterate_codes(4, colors)))
+
+        for start in [0, 1, 4, 5, 24, 312, 624, 625]:
+
+            self.assertEqual(
+                list(itertools.chain(*iterate_codes(4, colors, 7, start))),
+                codes[start:],
+            )
+            self.assertEqual(
+                list(itertools.chain(*iterate_codes(4, colors, 7, start, start + 30))),
+                codes[start : start + 30],
+            )
+
+        blocks = b"".join(iterate_code_blocks(4, 5, 7, 100, 130))
+
+        self.assertEqual(
+            [unrank_code(rank, 4, colors) for rank in range(100, 130)],
+            ["".join(colors[i] for i in blocks[j : j + 4]) for j in range(0, 120, 4)],
+        )
+
+    def test_restricted_enumeration(self):
+
+        colors = ["A", "B", "C", "D"]
+
+        self.assertEqual(
+            sum(len(chunk) for chunk in iterate_codes(5, colors, chunk_size=100)),
+            code_space_size(5, 4),
+        )
+        self.assertEqual(
+            len(set(codes_without_repeats(3, colors))),
+            count_codes_without_repeats(3, 4),
+        )
+        self.assertEqual(
+            len(list(codes_with_k_colors(4, colors, 2))),
+            count_codes_with_k_colors(4, 4, 2),
+        )
+        self.assertTrue(all(code[0] == code[-1] for code in codes_first_last(4, colors)))
+
+    def test_feedback(self):
+
+        round = Round(
+            board_length=5,
+            colors=["A", "B", "C", "D", "E"],
+            answer="ABCBA",
+            scsa_name="InsertColors",
+        )
+
+        for guess in ["DEDED", "AACBB", "BCDEB", "AECBD", "ABCBA"]:
+
+            self.assertEqual(feedback(guess, "ABCBA"), round.process_guess(guess))
+
+        answers = ["ABCBA", "EDCBA", "AAAAA", "BACBA"]
+        self.assertEqual(
+            partition_counts("ABCBA", answers), {(5, 0): 1, (3, 0): 1, (2, 0): 1, (3, 2): 1}
+        )
+
+    def test_guess_symmetry(self):
+
+        colors = ["A", "B", "C", "D"]
+        codes = list(itertools.chain(*iterate_codes(4, colors)))
+
+        for history in [[], ["AABB"], ["AABB", "ACDA"]]:
+
+            symmetry = GuessSymmetry(4, colors, history)
+            responses = [(guess, feedback(guess, "BCAD")) for guess in history]
+            candidates = [
+                code
+                for code in codes
+                if all(feedback(guess, code) == pins for guess, pins in responses)
+            ]
+
+            # Every guess is equivalent to exactly one kept guess, and kept guesses are not equivalent
+            reduced = symmetry.reduce(codes)
+            classes = [symmetry.canonicalize(guess) for guess in reduced]
+
+            self.assertEqual(len(set(classes)), len(reduced))
+            self.assertEqual(
+                set(classes), {symmetry.canonicalize(code) for code in codes}
+            )
+            self.assertEqual(set(symmetry.canonical_guesses()), set(classes))
+
+            # Equivalent guesses split the candidates alike, so the minimax value is unchanged
+            def split(guess):
+
+                return sorted(partition_counts(guess, candidates).values())
+
+            for guess in codes:
+
+                self.assertEqual(split(guess), split(symmetry.canonicalize(guess)))
+
+            self.assertEqual(
+                min(max(split(guess)) for guess in reduced),
+                min(max(split(guess)) for guess in codes),
+            )
+
+        # Guesses of players whose codes are restricted by an SCSA are not reduced
+        solver = SupportSolver(codes_first_last, count_codes_first_last)
+        support = list(codes_first_last(5, default_colors(6)))
+
+        self.assertEqual(
+            solver.candidate_guesses(5, default_colors(6), (), support),
+            support[: solver.max_guesses_scored],
+        )
+
+    def test_candidate_set(self):
+
+        colors = ["A", "B", "C", "D", "E"]
+        index = CodeIndex(5, colors)
+        codes = list(CandidateSet(index))
+        self.assertEqual(codes, list(itertools.chain(*iterate_codes(5, colors))))
+
+        for guess in ["AABBC", "EDCBA", "CCCCC"]:
+
+            for response in [(0, 0), (1, 2), (2, 1), (0, 5)]:
+
+                candidates = CandidateSet(index).filter(guess, *response)
+                expected = [code for code in codes if feedback(guess, code) == response]
+
+                self.assertEqual(candidates.codes(), expected)
+                self.assertEqual(len(candidates), len(expected))
+                self.assertEqual(
+                    candidates.filter_codes(guess, *response).bits, candidates.bits
+                )
+
+    def test_shared_tables(self):
+
+        colors = ["A", "B", "C"]
+        codes = list(itertools.chain(*iterate_codes(4, colors)))
+
+        with SharedTables() as tables:
+
+            tables.publish(4, colors)
+            descriptors = tables.descriptors()
+
+            # Workers attach the code space when they start and read it through their geometry cache
+            with multiprocessing.Pool(2, sweep.attach_tables, (descriptors,)) as pool:
+
+                shared = pool.map(read_shared_codes, [(4, 3)] * 2)
+
+            self.assertEqual(shared, [codes, codes])
+
+            # A CodeIndex over the shared codes filters like one that enumerates its own
+            sweep.attach_tables(descriptors)
+            index = CodeIndex(4, colors, sweep.get_geometry_cache(4, 3)["codes"])
+            self.assertEqual(
+                CandidateSet(index).filter("AABC", 1, 2).codes(),
+                CandidateSet(CodeIndex(4, colors)).filter("AABC", 1, 2).codes(),
+            )
+
+            # The list player filters the shared codes without copying them first
+            player = Minimax(time_budget=None, bitsets=False)
+            player.set_codes(4, colors, index.codes)
+            state = GameState((("AABC", 1, 2),))
+
+            guess, next_state = player.next_guess(4, colors, "InsertColors", state)
+            expected, expected_state = Minimax(
+                time_budget=None, bitsets=False
+            ).next_guess(4, colors, "InsertColors", state)
+
+            self.assertIs(player.all_codes(4, colors), index.codes)
+            self.assertEqual(guess, expected)
+            self.assertEqual(next_state.data, expected_state.data)
+            index.codes.table.close()
+            del sweep.get_geometry_cache(4, 3)["codes"]
+
+        # The owner unlinked the block when the tables were closed
+        with self.assertRaises(FileNotFoundError):
+
+            SharedArray.attach(descriptors[(4, 3)])
+
+
+def read_shared_codes(geometry: tuple[int, int]) -> list[str]:
+
+    return list(sweep.get_geometry_cache(*geometry)["codes"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,507 @@
+# File contains implementations of players that score candidate guesses against the codes still possible.
+# See main.py or examples.ipynb for example usages.
+
+import random
+import time
+from abc import abstractmethod
+from player import GameState, Player, StatelessPlayer
+from codes import code_space_size, feedback, iterate_codes, partition_counts
+from symmetry import GuessSymmetry
+from bitset import CandidateSet, CodeIndex
+
+
+class ScoringPlayer(Player, StatelessPlayer):
+    """Mastermind Player that keeps the codes consistent with all feedback and guesses the best scoring guess
+
+    The player keeps no state of its own in next_guess, so one instance can serve many rounds concurrently.
+    make_guess plays one round at a time through the classic Player interface.
+    Subclasses that set score_kernel can have the guesses of a turn scored by a ParallelEvaluator.
+    """
+
+    # Module-level function kernel(guesses, candidates) -> list[float] equivalent to score_guess
+    score_kernel = None
+
+    # Whether all_codes enumerates every code, which the symmetry reduction of guesses requires
+    full_code_space = True
+
+    def __init__(
+        self,
+        max_code_space: int = 10**6,
+        max_guesses_scored: int = 2000,
+        sample_size: int = 1000,
+        time_budget: float = 0.25,
+        symmetry: bool = True,
+        evaluator=None,
+        bitsets: bool = True,
+        sampler: Player = None,
+    ):
+        """Constructor for ScoringPlayer
+
+        Args:
+            max_code_space (int, optional): Largest number of possible codes the player enumerates. Defaults to 10**6.
+            max_guesses_scored (int, optional): Largest number of guesses scored per turn. Defaults to 2000.
+            sample_size (int, optional): Largest number of possible codes a guess is scored against. Defaults to 1000.
+            time_budget (float, optional): Seconds per turn after which no further guesses are scored, None for no
+                                           limit. Defaults to 0.25.
+            symmetry (bool, optional): Whether to only score one guess per symmetry class, which is only done
+                                       if full_code_space is set. Defaults to True.
+            evaluator (ParallelEvaluator, optional): Workers that score the guesses of a turn, None to score them
+                                                     in this thread. Defaults to None.
+            bitsets (bool, optional): Whether to keep the possible codes as a bitset (see bitset.py) instead of
+                                      a list. Defaults to True.
+            sampler (Player, optional): Player of the rounds of geometries planned as "sampling" (see configure),
+                                        None for Annealing(). Defaults to None.
+        """
+
+        self.player_name = ""
+        self.max_code_space = max_code_space
+        self.max_guesses_scored = max_guesses_scored
+        self.sample_size = sample_size
+        self.time_budget = time_budget
+        self.symmetry = symmetry
+        self.evaluator = evaluator
+        self.bitsets = bitsets
+        self.index = None  # CodeIndex of the last geometry played
+        self.shared_codes = {}  # (board_length, colors) -> all codes in rank order, see set_codes
+        self.sampler = sampler
+        self.sampled = set()  # (board_length, num_colors) planned as "sampling", see configure
+
+        self.state = GameState()  # State of the round played through make_guess
+        self.last_guess = None
+
+    @property
+    def deterministic(self) -> bool:
+        """Whether guesses only depend on the history, see Player"""
+
+        # Without a time budget, the guesses scored do not depend on the speed of the machine, and the
+        # candidates are sampled by a generator seeded from the history (see choose_guess)
+        return self.time_budget is None
+
+    @abstractmethod
+    def score_guess(self, guess: str, candidates: list[str]) -> float:
+        """Scores a guess against the codes that are still possible
+
+        Args:
+            guess (str): Guess to score.
+            candidates (list[str]): Codes that are still possible (possibly a sample).
+
+        Raises:
+            NotImplementedError: Function must be implemented by subclasses.
+
+        Returns:
+            float: Returns score of the guess, lower is better.
+        """
+
+        raise NotImplementedError
+
+    def filter_candidates(
+        self, candidates: list[str], guess: str, exact: int, other: int
+    ) -> list[str]:
+        """Keeps the codes that would have given the same feedback
+
+        Args:
+            candidates (list[str]): Codes that were possible before the guess.
+            guess (str): Guess that was made.
+            exact (int): Number of pegs that matched exactly.
+            other (int): Number of pegs that were the right color, but in the wrong location.
+
+        Returns:
+            list[str]: Returns codes that are still possible.
+        """
+
+        response = (exact, other)
+
+        return [code for code in candidates if feedback(guess, code) == response]
+
+    def candidate_guesses(
+        self,
+        board_length: int,
+        colors: list[str],
+        history: tuple,
+        candidates: list[str],
+    ) -> list[str]:
+        """Selects the guesses to score this turn
+
+        Consistent codes come first so that a good guess is found even if the time budget runs out.
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]): All possible colors that can be used to generate a code.
+            history (tuple): (guess, exact, other) for every guess made so far.
+            candidates (list[str]): Codes consistent with the history.
+
+        Returns:
+            list[str]: Returns guesses to score.
+        """
+
+        consistent = candidates[: self.max_guesses_scored]
+
+        # Equivalent guesses only split the candidates alike if they are all codes consistent with the history
+        if not self.symmetry or not self.full_code_space:
+
+            return consistent
+
+        symmetry = GuessSymmetry(board_length, colors, [guess for guess, _, _ in history])
+        guesses = symmetry.reduce(consistent)
+
+        if symmetry.count_class_candidates() <= self.max_guesses_scored:
+
+            guesses += symmetry.canonical_guesses()
+
+        return list(dict.fromkeys(guesses))[: self.max_guesses_scored]
+
+    def choose_guess(
+        self,
+        board_length: int,
+        colors: list[str],
+        history: tuple,
+        candidates: list[str],
+    ) -> str:
+        """Picks the best scoring guess within the time budget
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]): All possible colors that can be used to generate a code.
+            history (tuple): (guess, exact, other) for every guess made so far.
+            candidates (list[str]): Codes consistent with the history.
+
+        Returns:
+            str: Returns guess.
+        """
+
+        if len(candidates) <= 2:
+
+            return candidates[0]
+
+        deadline = None
+
+        if self.time_budget is not None:
+
+            deadline = time.perf_counter() + self.time_budget
+
+        if len(candidates) > self.sample_size:
+
+            generator = random
+
+            if self.time_budget is None:
+
+                generator = random.Random(repr(history))
+
+            sample = generator.sample(candidates, self.sample_size)
+
+        else:
+
+            sample = candidates
+
+        consistent = set(candidates)
+        guesses = self.candidate_guesses(board_length, colors, history, candidates)
+        best_guess = None
+        best_key = None
+
+        if self.evaluator is not None and self.score_kernel is not None:
+
+            scores = self.evaluator.score(
+                self.score_kernel, guesses, sample, deadline
+            )
+
+        else:
+
+            scores = None
+
+        for i, guess in enumerate(guesses):
+
+            if scores is not None:
+
+                # The chunk of the guess was not scored before the deadline
+                if scores[i] is None:
+
+                    continue
+
+                score = scores[i]
+
+            elif (
+                best_guess is not None
+                and deadline is not None
+                and time.perf_counter() > deadline
+            ):
+
+                break
+
+            else:
+
+                score = self.score_guess(guess, sample)
+
+            # Ties are broken in favor of guesses that could be the answer
+            key = (score, guess not in consistent)
+
+            if best_key is None or key < best_key:
+
+                best_guess = guess
+                best_key = key
+
+        # No chunk was scored in time, and the first guess could be the answer
+        if best_guess is None:
+
+            return guesses[0]
+
+        return best_guess
+
+    def set_codes(self, board_length: int, colors: list[str], codes) -> None:
+        """Gives the player the enumeration of all codes of a geometry, so that it does not enumerate them itself
+
+        Args:
+            board_length (int): Number of pegs.
+            colors (list[str]): All possible colors that can be used to generate a code.
+            codes (sequence of str): All codes in rank order, e.g. SharedCodes attached from shared memory.
+        """
+
+        self.shared_codes[(board_length, tuple(colors))] = codes
+
+        return
+
+    def configure(self, plan) -> None:
+        """Follows the representation planned for a geometry, which overrides bitsets
+
+        Rounds of a geometry planned as "sampling", or with more codes than max_code_space, are played through
+        make_guess by the sampler, which does not enumerate the codes.
+
+        Args:
+            plan (Plan): Representation planned for the geometry, see planning.py.
+        """
+
+        geometry = (plan.board_length, plan.num_colors)
+
+        if plan.representation == "sampling" or plan.num_codes > self.max_code_space:
+
+            if self.sampler is None:
+
+                from annealing import Annealing
+
+                self.sampler = Annealing()
+
+            if hasattr(self.sampler, "configure"):
+
+                self.sampler.configure(plan)
+
+            self.sampled.add(geometry)
+
+            return
+
+        self.sampled.discard(geometry)
+        self.bitsets = plan.representation == "bitset"
+
+        return
+
+    def all_codes(self, board_length: int, colors: list[str]):
+        """Enumerates all possible codes
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]): All possible colors that can be used to generate a code.
+
+        Raises:
+            ValueError: There are more possible codes than max_code_space.
+
+        Returns:
+            iterable of str: Returns all codes in rank order, which are the codes given to set_codes without
+                             copying them, so that filtering reads a shared table lazily.
+        """
+
+        if code_space_size(board_length, len(colors)) > self.max_code_space:
+
+            raise ValueError("Too many possible codes for " + self.player_name + ".")
+
+        codes = self.shared_codes.get((board_length, tuple(colors)))
+
+        if codes is not None:
+
+            return codes
+
+        return [code for chunk in iterate_codes(board_length, colors) for code in chunk]
+
+    def code_index(self, board_length: int, colors: list[str]) -> CodeIndex:
+        """Gets the bitsets of all possible codes, which are kept for the next round of the same geometry
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]): All possible colors that can be used to generate a code.
+
+        Raises:
+            ValueError: There are more possible codes than max_code_space.
+
+        Returns:
+            CodeIndex: Returns index of all codes.
+        """
+
+        index = self.index
+
+        if (
+            index is None
+            or index.board_length != board_length
+            or index.colors != list(colors)
+        ):
+
+            if code_space_size(board_length, len(colors)) > self.max_code_space:
+
+                raise ValueError("Too many possible codes for " + self.player_name + ".")
+
+            codes = self.shared_codes.get((board_length, tuple(colors)))
+            index = CodeIndex(board_length, colors, codes)
+            self.index = index
+
+        return index
+
+    def next_guess(
+        self,
+        board_length: int,
+        colors: list[str],
+        scsa_name: str,
+        state: GameState,
+    ) -> tuple[str, GameState]:
+        """Makes a guess of the secret code for Mastermind
+
+        The data of the state holds the codes consistent with all but the last response of its history,
+        as a CandidateSet if bitsets is set and as a list otherwise.
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]]): All possible colors that can be used to generate a code.
+            scsa_name (str): Name of SCSA used to generate secret code.
+            state (GameState): State of the round, GameState() before the first guess.
+
+        Returns:
+            tuple[str, GameState]: (guess, state to record the response of the guess in).
+        """
+
+        if self.bitsets:
+
+            if len(state.history) > 0 and state.data is not None:
+
+                candidate_set = state.data.filter(*state.history[-1])
+
+            else:
+
+                candidate_set = CandidateSet(self.code_index(board_length, colors))
+
+                for guess, exact, other in state.history:
+
+                    candidate_set = candidate_set.filter(guess, exact, other)
+
+            candidates = candidate_set.codes()
+            guess = self.choose_guess(board_length, colors, state.history, candidates)
+
+            return (guess, GameState(state.history, candidate_set))
+
+        if len(state.history) == 0:
+
+            candidates = self.all_codes(board_length, colors)
+
+            # The candidates of the first turn are all codes, which choose_guess needs as a list
+            if not isinstance(candidates, list):
+
+                candidates = list(candidates)
+
+        elif state.data is not None:
+
+            candidates = self.filter_candidates(state.data, *state.history[-1])
+
+        else:
+
+            candidates = self.all_codes(board_length, colors)
+
+            for guess, exact, other in state.history:
+
+                candidates = self.filter_candidates(candidates, guess, exact, other)
+
+        guess = self.choose_guess(board_length, colors, state.history, candidates)
+
+        return (guess, GameState(state.history, candidates))
+
+    def make_guess(
+        self,
+        board_length: int,
+        colors: list[str],
+        scsa_name: str,
+        last_response: tuple[int, int, int],
+    ) -> str:
+        """Makes a guess of the secret code for Mastermind
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]]): All possible colors that can be used to generate a code.
+            scsa_name (str): Name of SCSA used to generate secret code.
+            last_response (tuple[int, int, int]): (First element in tuple is the number of pegs that match exactly with the secret
+                                           code for the previous guess, the second element is the number of pegs that are
+                                           the right color, but in the wrong location for the previous guess, and the third
+                                           element is the number of guesses so far.)
+
+        Returns:
+            str: Returns guess
+        """
+
+        if (board_length, len(colors)) in self.sampled:
+
+            return self.sampler.make_guess(
+                board_length, colors, scsa_name, last_response
+            )
+
+        if last_response[2] == 0:
+
+            self.state = GameState()
+
+        else:
+
+            self.state = self.state.record(
+                self.last_guess, last_response[0], last_response[1]
+            )
+
+        self.last_guess, self.state = self.next_guess(
+            board_length, colors, scsa_name, self.state
+        )
+
+        return self.last_guess
+
+
+class Minimax(ScoringPlayer):
+    """Mastermind Player that minimizes the largest number of codes that could remain after its guess (Knuth)"""
+
+    def __init__(self, **kwargs):
+        """Constructor for Minimax
+
+        Args:
+            **kwargs: Keyword arguments of ScoringPlayer.
+        """
+
+        super().__init__(**kwargs)
+
+        self.player_name = "Minimax"
+
+    def score_guess(self, guess: str, candidates: list[str]) -> float:
+        """Scores a guess by the size of the largest partition of candidates it leaves
+
+        Args:
+            guess (str): Guess to score.
+            candidates (list[str]): Codes that are still possible (possibly a sample).
+
+        Returns:
+            float: Returns number of candidates giving the most common feedback.
+        """
+
+        return max(partition_counts(guess, candidates).values())
+
+
+def minimax_scores(guesses: list[str], candidates: list[str]) -> list[float]:
+    """Scores guesses like Minimax.score_guess, as a kernel for ParallelEvaluator
+
+    Args:
+        guesses (list[str]): Guesses to score.
+        candidates (list[str]): Codes that are still possible (possibly a sample).
+
+    Returns:
+        list[float]: Returns number of candidates giving the most common feedback, for each guess.
+    """
+
+    return [max(partition_counts(guess, candidates).values()) for guess in guesses]
+
+
+Minimax.score_kernel = staticmethod(minimax_scores)
@@ -0,0 +1,117 @@
+# File contains a pool of workers that scores the guesses of one turn in parallel.
+# Example: Minimax(evaluator=ParallelEvaluator(num_workers=4)) splits every make_guess across 4 processes.
+
+import concurrent.futures
+import os
+import time
+
+
+class ParallelEvaluator:
+    """Splits the guesses of one turn into chunks and scores the chunks on a persistent pool of workers
+
+    Kernels are module-level functions kernel(guesses, candidates) -> list[float], so that they can be sent
+    to worker processes. Thread workers only run kernels in parallel if the kernel releases the GIL (or on
+    a free-threaded build of Python); process workers always do, at the cost of sending the candidates along.
+    """
+
+    def __init__(
+        self, num_workers: int = None, kind: str = "process", chunks_per_worker: int = 4
+    ):
+        """Constructor for ParallelEvaluator
+
+        Args:
+            num_workers (int, optional): Number of workers, None for one per CPU. Defaults to None.
+            kind (str, optional): "process" or "thread". Defaults to "process".
+            chunks_per_worker (int, optional): Number of chunks the guesses are split into per worker. Defaults to 4.
+
+        Raises:
+            ValueError: Kind is not recognized.
+        """
+
+        self.num_workers = num_workers if num_workers is not None else os.cpu_count()
+        self.kind = kind
+        self.chunks_per_worker = chunks_per_worker
+
+        if kind == "process":
+
+            self.executor = concurrent.futures.ProcessPoolExecutor(self.num_workers)
+
+        elif kind == "thread":
+
+            self.executor = concurrent.futures.ThreadPoolExecutor(self.num_workers)
+
+        else:
+
+            raise ValueError("Unrecognized kind of workers.")
+
+        self.running = []  # Chunks of earlier calls still running at their deadline
+
+    def split(self, guesses: list[str]) -> list[list[str]]:
+        """Splits guesses into consecutive chunks
+
+        Args:
+            guesses (list[str]): Guesses to score.
+
+        Returns:
+            list[list[str]]: Returns chunks, small enough to balance the workers and to stop close to a deadline.
+        """
+
+        num_chunks = max(1, self.num_workers * self.chunks_per_worker)
+        chunk_size = max(1, -(-len(guesses) // num_chunks))
+
+        return [guesses[i : i + chunk_size] for i in range(0, len(guesses), chunk_size)]
+
+    def score(
+        self,
+        kernel,
+        guesses: list[str],
+        candidates: list[str],
+        deadline: float = None,
+    ) -> list[float]:
+        """Scores guesses against candidates with a kernel
+
+        Args:
+            kernel (function): Module-level function kernel(guesses, candidates) -> list[float].
+            guesses (list[str]): Guesses to score.
+            candidates (list[str]): Codes the guesses are scored against.
+            deadline (float, optional): time.perf_counter() after which no chunk is waited for, None for no
+                                        deadline. Defaults to None.
+
+        Returns:
+            list[float]: Returns score of each guess, None for guesses whose chunk was not scored before the deadline.
+        """
+
+        # Chunks of earlier calls that were already running at their deadline cannot be cancelled, so the
+        # chunks of this call queue behind them, and waiting for them is charged to the deadline of this call
+        self.running = [future for future in self.running if not future.done()]
+
+        chunks = self.split(guesses)
+        futures = [self.executor.submit(kernel, chunk, candidates) for chunk in chunks]
+        timeout = None
+
+        if deadline is not None:
+
+            timeout = max(0.0, deadline - time.perf_counter())
+
+        done, not_done = concurrent.futures.wait(futures, timeout)
+        self.running += [future for future in not_done if not future.cancel()]
+        scores = []
+
+        for chunk, future in zip(chunks, futures):
+
+            if future in done:
+
+                scores += future.result()
+
+            else:
+
+                scores += [None] * len(chunk)
+
+        return scores
+
+    def close(self) -> None:
+        """Shuts the workers down"""
+
+        self.executor.shutdown(cancel_futures=True)
+
+        return
@@ -0,0 +1,298 @@
+# Performance regression tests: fixed-seed workloads checked against the baseline in perf_baseline.json.
+# Timings are stored relative to a reference workload, so that the baseline carries over to other machines.
+# Run "python perf_test.py --update-baseline" after an intended change in performance to store a new baseline.
+# The tolerances can be loosened for noisy machines through MASTERMIND_PERF_TIME_TOLERANCE and MASTERMIND_PERF_GUESS_TOLERANCE.
+# Timings can be skipped on machines too loaded to time with MASTERMIND_PERF_SKIP_TIMINGS=1.
+
+import gc
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import unittest
+from mastermind import *
+from LMU import LMU
+from main import SCSA_NAMES, str_to_scsa
+from alphabet import default_colors
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(DIRECTORY, "perf_baseline.json")
+
+MISSING_BASELINE = "No baseline, run python perf_test.py --update-baseline."
+
+SEED = 2024
+BOARD_LENGTH = 7
+NUM_COLORS = 5
+NUM_ROUNDS = 50  # Rounds per SCSA for guess counts
+NUM_CODES = 1000  # Codes per workload of the microbenchmarks
+REPEATS = 7  # Timings are the fastest of this many runs
+ATTEMPTS = 3  # Timings above their threshold are measured again this many times before failing
+
+# A measured time may be this many times its baseline, and a mean number of guesses this many times its baseline
+TIME_TOLERANCE = float(os.environ.get("MASTERMIND_PERF_TIME_TOLERANCE", "2.0"))
+GUESS_TOLERANCE = float(os.environ.get("MASTERMIND_PERF_GUESS_TOLERANCE", "1.05"))
+SKIP_TIMINGS = os.environ.get("MASTERMIND_PERF_SKIP_TIMINGS", "0") == "1"
+
+
+def best_time(function, repeats: int = REPEATS) -> float:
+    """Times a function with the random module in the same state and without garbage collection for every run
+
+    Args:
+        function (function): Function without arguments to time.
+        repeats (int, optional): Number of runs. Defaults to REPEATS.
+
+    Returns:
+        float: Returns seconds of the fastest run.
+    """
+
+    times = []
+
+    for _ in range(repeats):
+
+        random.seed(SEED)
+        gc.collect()
+        gc.disable()
+
+        try:
+
+            start = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - start)
+
+        finally:
+
+            gc.enable()
+
+    return min(times)
+
+
+def reference_workload() -> None:
+
+    total = 0
+
+    for i in range(200000):
+
+        total += i * i % 7
+
+
+def import_time() -> float:
+    """Measures the imports of a short game through the command line with python -X importtime
+
+    Returns:
+        float: Returns total seconds of the imports made by the interpreter and main.py.
+    """
+
+    command = [sys.executable, "-X", "importtime", os.path.join(DIRECTORY, "main.py")]
+    command += ["--board_length", "4", "--num_colors", "6", "--player_name", "Boring"]
+    command += ["--scsa_name", "InsertColors", "--num_rounds", "1"]
+
+    output = subprocess.run(command, capture_output=True, text=True, check=True).stderr
+    total = 0
+
+    for line in output.splitlines():
+
+        # Lines are "import time: self | cumulative | name", nested imports have a longer indent of name
+        fields = line.split("|")
+
+        if len(fields) == 3 and fields[1].strip().isdigit():
+
+            if not fields[2].startswith("  "):
+
+                total += int(fields[1])
+
+    return total / 10**6
+
+
+def measure_guesses() -> dict[str, dict]:
+    """Plays a fixed-seed tournament of LMU for every SCSA
+
+    Returns:
+        dict[str, dict]: Returns {scsa_name: {"wins": number of wins, "mean_guesses": mean guesses of wins}}.
+    """
+
+    colors = default_colors(NUM_COLORS)
+    measurements = {}
+
+    for scsa_name in SCSA_NAMES:
+
+        random.seed(SEED)
+
+        mastermind = Mastermind(BOARD_LENGTH, colors)
+        results = mastermind.play_tournament(
+            LMU(), str_to_scsa(scsa_name), NUM_ROUNDS, verbose=False
+        )
+
+        measurements[scsa_name] = {
+            "wins": results.get_number_of_wins(),
+            "mean_guesses": results.mean_guesses(),
+        }
+
+    return measurements
+
+
+def measure_timings(names: list[str] = None) -> dict[str, float]:
+    """Times the microbenchmarks, relative to the reference workload
+
+    Args:
+        names (list[str], optional): Names of the benchmarks to time, None for all. Defaults to None.
+
+    Returns:
+        dict[str, float]: Returns {benchmark: seconds of benchmark / seconds of reference workload}.
+    """
+
+    random.seed(SEED)
+
+    colors = default_colors(NUM_COLORS)
+    scsa = str_to_scsa("InsertColors")
+    guesses = scsa.generate_codes(BOARD_LENGTH, colors, NUM_CODES)
+    round = Round(BOARD_LENGTH, colors, guesses[0], "InsertColors", memo_size=0)
+
+    benchmarks = {
+        "process_guess": lambda: [round.process_guess(guess) for guess in guesses],
+        "valid_guess": lambda: [round.valid_guess(guess) for guess in guesses],
+    }
+
+    for scsa_name in SCSA_NAMES:
+
+        scsa = str_to_scsa(scsa_name)
+        benchmarks["generate_codes_" + scsa_name] = (
+            lambda scsa=scsa: scsa.generate_codes(BOARD_LENGTH, colors, NUM_CODES)
+        )
+
+    timings = {}
+
+    for name, function in benchmarks.items():
+
+        if names is None or name in names:
+
+            # The reference is timed next to each benchmark, as the speed of a shared machine drifts
+            timings[name] = best_time(function) / best_time(reference_workload)
+
+    if names is None or "import_time" in names:
+
+        fastest = min(import_time() for _ in range(REPEATS))
+        timings["import_time"] = fastest / best_time(reference_workload)
+
+    return timings
+
+
+def load_baseline() -> dict:
+
+    with open(BASELINE_FILE, "r") as file:
+
+        return json.load(file)
+
+
+def update_baseline() -> None:
+
+    baseline = {
+        "seed": SEED,
+        "board_length": BOARD_LENGTH,
+        "num_colors": NUM_COLORS,
+        "num_rounds": NUM_ROUNDS,
+        "num_codes": NUM_CODES,
+        "guesses": measure_guesses(),
+        "timings": {},
+    }
+
+    # Medians of several measurements, so that the baseline is not an unusually fast run
+    measurements = [measure_timings() for _ in range(ATTEMPTS)]
+
+    for name in measurements[0]:
+
+        baseline["timings"][name] = statistics.median(
+            measurement[name] for measurement in measurements
+        )
+
+    with open(BASELINE_FILE, "w") as file:
+
+        json.dump(baseline, file, indent=4, sort_keys=True)
+        file.write("\n")
+
+
+class TestGuessCounts(unittest.TestCase):
+    def test_lmu_guesses(self):
+
+        baseline = load_baseline()["guesses"]
+
+        for scsa_name, measured in measure_guesses().items():
+
+            with self.subTest(scsa_name=scsa_name):
+
+                self.assertIn(scsa_name, baseline, MISSING_BASELINE)
+                self.assertGreaterEqual(
+                    measured["wins"], baseline[scsa_name]["wins"]
+                )
+                self.assertLessEqual(
+                    measured["mean_guesses"],
+                    baseline[scsa_name]["mean_guesses"] * GUESS_TOLERANCE,
+                    "LMU needs more guesses for " + scsa_name + " than in the baseline.",
+                )
+
+
+class TestTimings(unittest.TestCase):
+    def test_lazy_imports(self):
+
+        # Importing main must not load the players, the engine or the argument parser
+        code = "import sys, main; print(' '.join(sys.modules))"
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=DIRECTORY,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        modules = set(output.split())
+
+        for module in ["argparse", "mastermind", "LMU", "minimax", "scsa", "re"]:
+
+            with self.subTest(module=module):
+
+                self.assertNotIn(module, modules)
+
+    @unittest.skipIf(SKIP_TIMINGS, "MASTERMIND_PERF_SKIP_TIMINGS is set.")
+    def test_microbenchmarks(self):
+
+        baseline = load_baseline()["timings"]
+        timings = measure_timings()
+
+        for _ in range(ATTEMPTS - 1):
+
+            slow = [
+                name
+                for name, measured in timings.items()
+                if name in baseline and measured > baseline[name] * TIME_TOLERANCE
+            ]
+
+            if len(slow) == 0:
+
+                break
+
+            for name, measured in measure_timings(slow).items():
+
+                timings[name] = min(timings[name], measured)
+
+        for name, measured in timings.items():
+
+            with self.subTest(benchmark=name):
+
+                self.assertIn(name, baseline, MISSING_BASELINE)
+                self.assertLessEqual(
+                    measured,
+                    baseline[name] * TIME_TOLERANCE,
+                    name + " is slower than in the baseline.",
+                )
+
+
+if __name__ == "__main__":
+
+    if "--update-baseline" in sys.argv:
+
+        update_baseline()
+
+    else:
+
+        unittest.main()
@@ -0,0 +1,273 @@
+# File contains a planner that chooses how players represent the possible codes of a geometry within a budget.
+# Representations from fastest to cheapest: "bitset" keeps all codes and a CodeIndex (see bitset.py), "list"
+# keeps all codes and filters a list of them, and "sampling" enumerates nothing and searches for consistent codes.
+# Mastermind asks its planner for the plan of its geometry and passes it to the configure method of the player.
+# Example: Mastermind(40, default_colors(26), planner=MemoryPlanner(2**30)).play_tournament(Minimax(), InsertColors(), 100)
+
+import decimal
+import logging
+import math
+from codes import code_space_size
+
+logger = logging.getLogger(__name__)
+
+# Representations from fastest to cheapest, the planner picks the first that fits
+REPRESENTATIONS = ["bitset", "list", "sampling"]
+
+
+class Plan:
+    """Representation chosen for a geometry, with the estimates it was chosen by"""
+
+    __slots__ = (
+        "board_length",
+        "num_colors",
+        "representation",
+        "num_codes",
+        "memory",
+        "seconds",
+        "reason",
+        "round_time",
+    )
+
+    def __init__(
+        self,
+        board_length: int,
+        num_colors: int,
+        representation: str,
+        num_codes: int,
+        memory: int,
+        seconds: float,
+        reason: str,
+        round_time: float = 5,
+    ):
+        """Constructor for Plan
+
+        Args:
+            board_length (int): Number of pegs.
+            num_colors (int): Number of colors.
+            representation (str): One of REPRESENTATIONS.
+            num_codes (int): Number of possible codes.
+            memory (int): Estimated bytes the representation needs.
+            seconds (float): Estimated seconds the representation needs to set up a round.
+            reason (str): Why the representation was chosen.
+            round_time (float, optional): Seconds allowed per round, as Round.time_cutoff. Defaults to 5.
+        """
+
+        self.board_length = board_length
+        self.num_colors = num_colors
+        self.representation = representation
+        self.num_codes = num_codes
+        self.memory = memory
+        self.seconds = seconds
+        self.reason = reason
+        self.round_time = round_time
+
+    def __repr__(self) -> str:
+
+        return (
+            "Plan("
+            + str(self.board_length)
+            + "x"
+            + str(self.num_colors)
+            + ", "
+            + self.representation
+            + ": "
+            + self.reason
+            + ")"
+        )
+
+
+def format_megabytes(memory: int) -> str:
+
+    # Decimal, as the memory of a large code space does not fit in a float
+    megabytes = decimal.Decimal(memory) / 2**20
+
+    return format(megabytes, ".1f" if megabytes < 10**9 else ".2e") + " MB"
+
+
+class MemoryPlanner:
+    """Chooses the fastest representation whose estimated memory and setup time fit the budgets
+
+    The estimates are linear in the number of codes, with costs per code measured on CPython 3:
+    a code held in a list takes a str object and two references (all codes and the candidates of a turn),
+    and a CodeIndex adds one bit per code for every color at every position.
+    """
+
+    # Bytes per code besides its pegs: str header and references in the list of all codes and of candidates
+    BYTES_PER_CODE = 65
+
+    # Seconds per code to set up the first turn of a round: enumerating the codes, and either
+    # building the bitsets of a CodeIndex or filtering the list by the first response
+    SECONDS_PER_CODE = {"bitset": 2e-6, "list": 4.5e-6}
+
+    def __init__(
+        self,
+        memory_budget: int = 2**30,
+        time_budget: float = None,
+        time_share: float = 0.5,
+        representations: list[str] = REPRESENTATIONS,
+        seconds_per_code: dict = None,
+    ):
+        """Constructor for MemoryPlanner
+
+        Args:
+            memory_budget (int, optional): Bytes a player may use for the codes of a geometry. Defaults to 2**30.
+            time_budget (float, optional): Seconds a player may spend setting up a round, None for time_share of
+                                           the time allowed per round. Defaults to None.
+            time_share (float, optional): Share of the time per round used when time_budget is None. Defaults to 0.5.
+            representations (list[str], optional): Representations to choose from, fastest first.
+                                                   Defaults to REPRESENTATIONS.
+            seconds_per_code (dict, optional): Setup seconds per code of each representation, for other machines.
+                                               Defaults to SECONDS_PER_CODE.
+
+        Raises:
+            ValueError: A representation is not recognized.
+        """
+
+        if any(name not in REPRESENTATIONS for name in representations):
+
+            raise ValueError("Unrecognized representation.")
+
+        self.memory_budget = memory_budget
+        self.time_budget = time_budget
+        self.time_share = time_share
+        self.representations = list(representations)
+        self.seconds_per_code = dict(self.SECONDS_PER_CODE)
+
+        if seconds_per_code is not None:
+
+            self.seconds_per_code.update(seconds_per_code)
+
+        self.plans = {}  # (board_length, num_colors, time budget, round time) -> Plan
+
+    def estimate(
+        self, representation: str, board_length: int, num_colors: int
+    ) -> tuple[float, float]:
+        """Estimates the cost of a representation
+
+        Args:
+            representation (str): One of REPRESENTATIONS.
+            board_length (int): Number of pegs.
+            num_colors (int): Number of colors.
+
+        Returns:
+            tuple[int, float]: Returns (bytes, seconds to set up a round), with infinite seconds for
+                               more codes than a float can hold.
+        """
+
+        if representation == "sampling":
+
+            return (0, 0.0)
+
+        # Exact integers, as the size of a large code space does not fit in a float
+        num_codes = code_space_size(board_length, num_colors)
+        memory = num_codes * (self.BYTES_PER_CODE + board_length)
+
+        if representation == "bitset":
+
+            memory += board_length * num_colors * -(-num_codes // 8)
+
+        try:
+
+            seconds = float(num_codes) * self.seconds_per_code[representation]
+
+        except OverflowError:
+
+            seconds = math.inf
+
+        return (memory, seconds)
+
+    def plan(self, board_length: int, num_colors: int, round_time: float = 5) -> Plan:
+        """Chooses the representation of a geometry, and logs why
+
+        Args:
+            board_length (int): Number of pegs.
+            num_colors (int): Number of colors.
+            round_time (float, optional): Seconds allowed per round, as Round.time_cutoff. Defaults to 5.
+
+        Raises:
+            ValueError: No representation fits the budgets.
+
+        Returns:
+            Plan: Returns plan, which is computed once per geometry.
+        """
+
+        time_budget = self.time_budget
+
+        if time_budget is None:
+
+            time_budget = self.time_share * round_time
+
+        key = (board_length, num_colors, time_budget, round_time)
+
+        if key in self.plans:
+
+            return self.plans[key]
+
+        rejected = []
+
+        for representation in self.representations:
+
+            memory, seconds = self.estimate(representation, board_length, num_colors)
+
+            if memory > self.memory_budget:
+
+                rejected.append(
+                    representation
+                    + " needs "
+                    + format_megabytes(memory)
+                    + " of "
+                    + format_megabytes(self.memory_budget)
+                )
+
+            elif seconds > time_budget:
+
+                rejected.append(
+                    representation
+                    + " needs "
+                    + str(round(seconds, 2))
+                    + " s of "
+                    + str(round(time_budget, 2))
+                    + " s"
+                )
+
+            else:
+
+                break
+
+        else:
+
+            raise ValueError(
+                "No representation fits the budget: " + "; ".join(rejected) + "."
+            )
+
+        fits = (
+            representation
+            + " fits in "
+            + format_megabytes(memory)
+            + " and "
+            + str(round(seconds, 2))
+            + " s"
+        )
+        plan = Plan(
+            board_length,
+            num_colors,
+            representation,
+            code_space_size(board_length, num_colors),
+            memory,
+            seconds,
+            "; ".join(rejected + [fits]),
+            round_time,
+        )
+
+        logger.info(
+            "%d pegs, %d colors: %s (%s)",
+            board_length,
+            num_colors,
+            representation,
+            plan.reason,
+        )
+
+        self.plans[key] = plan
+
+        return plan
@@ -1,6 +1,7 @@
 # File contains implementations for the players for Mastermind.
 # See main.py or examples.ipynb for example usages.
 
+import copy
 import random
 from abc import ABC, abstractmethod
 from scsa import list_to_str, InsertColors
@@ -9,6 +10,14 @@ from scsa import list_to_str, InsertColors
 class Player(ABC):
     """Player for Mastermind"""
 
+    # Players that only read the exact pins of their responses set this, so that Round skips counting colors
+    # and responds with 0 other pins
+    exact_only = False
+
+    # Players that make no random choices and have no time budget set this, as their guesses only depend on
+    # the history, so that their decisions can be cached (see decision_cache.py)
+    deterministic = False
+
     def __init__(self):
         """Constructor for Player"""
 
@@ -40,7 +49,44 @@ class Player(ABC):
         raise NotImplementedError
 
 
-class RandomFolks(Player):
+class BatchPlayer(ABC):
+    """Player that makes guesses for many rounds of Mastermind at once (see simulation.py)"""
+
+    @abstractmethod
+    def make_guesses(
+        self,
+        board_length: int,
+        colors: list[str],
+        scsa_name: str,
+        round_ids: list[int],
+        last_responses: list[tuple[int, int, int]],
+    ) -> list[str]:
+        """Makes a guess of the secret code for every round that is still being played
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]]): All possible colors that can be used to generate a code.
+            scsa_name (str): Name of SCSA used to generate secret code.
+            round_ids (list[int]): Identifier of each round, the same for all guesses of a round.
+            last_responses (list[tuple[int, int, int]]): Last response of each round, as for Player.make_guess.
+
+        Raises:
+            NotImplementedError: Function must be implemented by subclasses.
+        """
+
+        raise NotImplementedError
+
+    def end_rounds(self, round_ids: list[int]) -> None:
+        """Forgets rounds that are over, which get no further guesses
+
+        Args:
+            round_ids (list[int]): Identifiers of the rounds that ended.
+        """
+
+        return
+
+
+class RandomFolks(Player, BatchPlayer):
     """Mastermind Player that makes random guesses"""
 
     def __init__(self):
@@ -76,8 +122,35 @@ class RandomFolks(Player):
 
         return guess
 
+    def make_guesses(
+        self,
+        board_length: int,
+        colors: list[str],
+        scsa_name: str,
+        round_ids: list[int],
+        last_responses: list[tuple[int, int, int]],
+    ) -> list[str]:
+        """Makes a random guess for every round that is still being played
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]]): All possible colors that can be used to generate a code.
+            scsa_name (str): Name of SCSA used to generate secret code.
+            round_ids (list[int]): Identifier of each round, the same for all guesses of a round.
+            last_responses (list[tuple[int, int, int]]): Last response of each round, as for Player.make_guess.
+
+        Returns:
+            list[str]: Returns one guess per round.
+        """
+
+        pegs = list_to_str(random.choices(colors, k=board_length * len(round_ids)))
 
-class Boring(Player):
+        return [
+            pegs[i : i + board_length] for i in range(0, len(pegs), board_length)
+        ]
+
+
+class Boring(Player, BatchPlayer):
     """Mastermind Player that guesses all the same color and chooses that color at random"""
 
     def __init__(self):
@@ -112,3 +185,285 @@ class Boring(Player):
         guess = list_to_str(color * board_length)
 
         return guess
+
+    def make_guesses(
+        self,
+        board_length: int,
+        colors: list[str],
+        scsa_name: str,
+        round_ids: list[int],
+        last_responses: list[tuple[int, int, int]],
+    ) -> list[str]:
+        """Guesses a single random color for every round that is still being played
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]]): All possible colors that can be used to generate a code.
+            scsa_name (str): Name of SCSA used to generate secret code.
+            round_ids (list[int]): Identifier of each round, the same for all guesses of a round.
+            last_responses (list[tuple[int, int, int]]): Last response of each round, as for Player.make_guess.
+
+        Returns:
+            list[str]: Returns one guess per round.
+        """
+
+        return [
+            color * board_length
+            for color in random.choices(colors, k=len(round_ids))
+        ]
+
+
+class BatchAdapter(BatchPlayer):
+    """Plays many rounds at once with a separate Player for every round"""
+
+    def __init__(self, make_player):
+        """Constructor for BatchAdapter
+
+        Args:
+            make_player (callable): Function without arguments that returns a new Player.
+        """
+
+        self.make_player = make_player
+        self.players = {}  # Round identifier -> Player of that round
+
+    def make_guesses(
+        self,
+        board_length: int,
+        colors: list[str],
+        scsa_name: str,
+        round_ids: list[int],
+        last_responses: list[tuple[int, int, int]],
+    ) -> list[str]:
+        """Asks the Player of every round that is still being played for a guess
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]]): All possible colors that can be used to generate a code.
+            scsa_name (str): Name of SCSA used to generate secret code.
+            round_ids (list[int]): Identifier of each round, the same for all guesses of a round.
+            last_responses (list[tuple[int, int, int]]): Last response of each round, as for Player.make_guess.
+
+        Returns:
+            list[str]: Returns one guess per round.
+        """
+
+        guesses = []
+
+        for round_id, last_response in zip(round_ids, last_responses):
+
+            if last_response[2] == 0:
+
+                self.players[round_id] = self.make_player()
+
+            guesses.append(
+                self.players[round_id].make_guess(
+                    board_length, colors, scsa_name, last_response
+                )
+            )
+
+        return guesses
+
+    def end_rounds(self, round_ids: list[int]) -> None:
+        """Drops the Players of rounds that are over
+
+        Args:
+            round_ids (list[int]): Identifiers of the rounds that ended.
+        """
+
+        for round_id in round_ids:
+
+            self.players.pop(round_id, None)
+
+        return
+
+
+class GameState:
+    """Immutable state of one round for a StatelessPlayer"""
+
+    __slots__ = ("history", "data")
+
+    def __init__(self, history: tuple = (), data=None):
+        """Constructor for GameState
+
+        Args:
+            history (tuple, optional): (guess, exact, other) for every guess made so far. Defaults to ().
+            data (optional): Anything the player derived from the history, which it must be able to rebuild
+                             from the history alone if data is None. Defaults to None.
+        """
+
+        self.history = history
+        self.data = data
+
+    def record(self, guess: str, exact: int, other: int) -> "GameState":
+        """Adds the response to a guess
+
+        Args:
+            guess (str): Guess that was made.
+            exact (int): Number of pegs that matched exactly.
+            other (int): Number of pegs that were the right color, but in the wrong location.
+
+        Returns:
+            GameState: Returns new state with the guess added to the history and the same data.
+        """
+
+        return GameState(self.history + ((guess, exact, other),), self.data)
+
+    def last_response(self) -> tuple[int, int, int]:
+        """Gets the last response in the format of Player.make_guess
+
+        Returns:
+            tuple[int, int, int]: (exact, other, number of guesses so far) of the last guess, (0, 0, 0) before the first.
+        """
+
+        if len(self.history) == 0:
+
+            return (0, 0, 0)
+
+        _, exact, other = self.history[-1]
+
+        return (exact, other, len(self.history))
+
+
+class StatelessPlayer(ABC):
+    """Player for Mastermind that keeps no state of its own, so one instance can play many rounds concurrently"""
+
+    # Whether guesses only depend on the history, see Player
+    deterministic = False
+
+    def __init__(self):
+        """Constructor for StatelessPlayer"""
+
+        self.player_name = ""
+
+    @abstractmethod
+    def next_guess(
+        self,
+        board_length: int,
+        colors: list[str],
+        scsa_name: str,
+        state: GameState,
+    ) -> tuple[str, GameState]:
+        """Makes a guess of the secret code for Mastermind
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]]): All possible colors that can be used to generate a code.
+            scsa_name (str): Name of SCSA used to generate secret code.
+            state (GameState): State of the round, GameState() before the first guess.
+
+        Raises:
+            NotImplementedError: Function must be implemented by subclasses.
+
+        Returns:
+            tuple[str, GameState]: (guess, state to record the response of the guess in).
+        """
+
+        raise NotImplementedError
+
+
+class StatefulAdapter(StatelessPlayer):
+    """Plays a Player through the StatelessPlayer interface, keeping a copy of the Player of the round in every state"""
+
+    def __init__(self, make_player, player_name: str = ""):
+        """Constructor for StatefulAdapter
+
+        Args:
+            make_player (callable): Function without arguments that returns a new Player.
+            player_name (str, optional): Name of the adapted player. Defaults to "".
+        """
+
+        self.make_player = make_player
+        self.player_name = player_name
+
+    def next_guess(
+        self,
+        board_length: int,
+        colors: list[str],
+        scsa_name: str,
+        state: GameState,
+    ) -> tuple[str, GameState]:
+        """Makes a guess with the Player of the round
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]]): All possible colors that can be used to generate a code.
+            scsa_name (str): Name of SCSA used to generate secret code.
+            state (GameState): State of the round, GameState() before the first guess.
+
+        Raises:
+            ValueError: State of a round that did not start with this adapter.
+
+        Returns:
+            tuple[str, GameState]: (guess, state to record the response of the guess in).
+        """
+
+        if len(state.history) == 0:
+
+            player = self.make_player()
+
+        elif state.data is None:
+
+            raise ValueError("Player of the round can not be rebuilt from the history.")
+
+        else:
+
+            # Guessing changes the Player, so a copy keeps the given state usable for other branches
+            player = copy.deepcopy(state.data)
+
+        guess = player.make_guess(board_length, colors, scsa_name, state.last_response())
+
+        return (guess, GameState(state.history, player))
+
+
+class StatelessAdapter(Player):
+    """Plays a StatelessPlayer through the Player interface, keeping the state of the current round"""
+
+    def __init__(self, player: StatelessPlayer):
+        """Constructor for StatelessAdapter
+
+        Args:
+            player (StatelessPlayer): Player to adapt, which may be shared with other adapters.
+        """
+
+        self.player = player
+        self.player_name = player.player_name
+        self.state = GameState()
+        self.last_guess = None
+
+    def make_guess(
+        self,
+        board_length: int,
+        colors: list[str],
+        scsa_name: str,
+        last_response: tuple[int, int, int],
+    ) -> str:
+        """Makes a guess of the secret code for Mastermind
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]]): All possible colors that can be used to generate a code.
+            scsa_name (str): Name of SCSA used to generate secret code.
+            last_response (tuple[int, int, int]): (First element in tuple is the number of pegs that match exactly with the secret
+                                           code for the previous guess, the second element is the number of pegs that are
+                                           the right color, but in the wrong location for the previous guess, and the third
+                                           element is the number of guesses so far.)
+
+        Returns:
+            str: Returns guess
+        """
+
+        if last_response[2] == 0:
+
+            self.state = GameState()
+
+        else:
+
+            self.state = self.state.record(
+                self.last_guess, last_response[0], last_response[1]
+            )
+
+        self.last_guess, self.state = self.player.next_guess(
+            board_length, colors, scsa_name, self.state
+        )
+
+        return self.last_guess
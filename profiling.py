@@ -0,0 +1,448 @@
+# File contains profilers that can be attached to rounds and tournaments of Mastermind.
+# Time spent by a profiler itself is reported back to the round, so that profiling does not cause time-out losses.
+# Example: python main.py --board_length 7 --num_colors 5 --player_name LMU --scsa_name InsertColors --num_rounds 100 --profile sampling
+
+import cProfile
+import pstats
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+
+
+class RoundProfiler(ABC):
+    """Profiler that attributes time to phases of a round ("make_guess" for the player, "engine" for the judge)"""
+
+    def __init__(self):
+        """Constructor for RoundProfiler"""
+
+        self.phase = None
+        self.overhead = 0.0  # Total seconds of instrumentation overhead so far
+
+    @abstractmethod
+    def start(self, phase: str) -> None:
+        """Starts profiling a phase
+
+        Args:
+            phase (str): Name of phase.
+
+        Raises:
+            NotImplementedError: Function must be implemented by subclasses.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def stop(self) -> float:
+        """Stops profiling the current phase
+
+        Raises:
+            NotImplementedError: Function must be implemented by subclasses.
+
+        Returns:
+            float: Returns estimated seconds of instrumentation overhead since the phase was started.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def report(self, stream=None, limit: int = 20) -> None:
+        """Writes a report for every phase
+
+        Args:
+            stream (file, optional): File to write to, None for stdout. Defaults to None.
+            limit (int, optional): Number of functions listed per phase. Defaults to 20.
+
+        Raises:
+            NotImplementedError: Function must be implemented by subclasses.
+        """
+
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Releases resources held by the profiler"""
+
+        return
+
+
+def _empty() -> None:
+
+    return
+
+
+class DeterministicProfiler(RoundProfiler):
+    """Profiler that records every function call with cProfile, using one profile per phase"""
+
+    def __init__(self, calibration_calls: int = 100000):
+        """Constructor for DeterministicProfiler
+
+        Args:
+            calibration_calls (int, optional): Number of calls used to measure the overhead of a profiled call. Defaults to 100000.
+        """
+
+        super().__init__()
+
+        self.profiles: dict[str, cProfile.Profile] = {}
+        self.calls: dict[str, int] = {}  # Number of calls of each phase as of the last stop
+        self.call_overhead = self.calibrate(calibration_calls)
+
+    def calibrate(self, num_calls: int) -> float:
+        """Measures the extra time of a function call while cProfile is enabled
+
+        Args:
+            num_calls (int): Number of calls to time.
+
+        Returns:
+            float: Returns seconds of overhead per profiled call.
+        """
+
+        start = time.perf_counter()
+
+        for _ in range(num_calls):
+
+            _empty()
+
+        plain = time.perf_counter() - start
+
+        profile = cProfile.Profile()
+        profile.enable()
+        start = time.perf_counter()
+
+        for _ in range(num_calls):
+
+            _empty()
+
+        profiled = time.perf_counter() - start
+        profile.disable()
+
+        return max(0.0, (profiled - plain) / num_calls)
+
+    def count_calls(self, phase: str) -> int:
+        """Counts calls recorded by the profile of a phase
+
+        Args:
+            phase (str): Name of phase.
+
+        Returns:
+            int: Returns total number of calls, including calls of built-in functions.
+        """
+
+        return sum(entry.callcount for entry in self.profiles[phase].getstats())
+
+    def start(self, phase: str) -> None:
+        """Starts profiling a phase
+
+        Args:
+            phase (str): Name of phase.
+        """
+
+        if phase not in self.profiles:
+
+            self.profiles[phase] = cProfile.Profile()
+            self.calls[phase] = 0
+
+        self.phase = phase
+        self.profiles[phase].enable()
+
+    def stop(self) -> float:
+        """Stops profiling the current phase
+
+        Returns:
+            float: Returns estimated seconds of instrumentation overhead since the phase was started, including the time of stopping.
+        """
+
+        begin = time.perf_counter()
+        phase = self.phase
+        self.profiles[phase].disable()
+        self.phase = None
+
+        # Counting the calls walks the whole profile, so the time of stopping is overhead as well
+        calls = self.count_calls(phase)
+        overhead = (calls - self.calls[phase]) * self.call_overhead
+        self.calls[phase] = calls
+        overhead += time.perf_counter() - begin
+        self.overhead += overhead
+
+        return overhead
+
+    def report(self, stream=None, limit: int = 20) -> None:
+        """Writes the cProfile statistics of every phase, sorted by cumulative time
+
+        Args:
+            stream (file, optional): File to write to, None for stdout. Defaults to None.
+            limit (int, optional): Number of functions listed per phase. Defaults to 20.
+        """
+
+        stream = sys.stdout if stream is None else stream
+
+        for phase, profile in self.profiles.items():
+
+            stream.write("Phase: " + phase + "\n")
+
+            stats = pstats.Stats(profile, stream=stream)
+            stats.sort_stats("cumulative").print_stats(limit)
+
+        stream.write(
+            "Estimated profiling overhead excluded from rounds: "
+            + str(round(self.overhead, 6))
+            + " seconds\n"
+        )
+
+        return
+
+
+class SamplingProfiler(RoundProfiler):
+    """Low-overhead profiler that periodically samples the stack of the profiled thread from a background thread"""
+
+    def __init__(self, interval: float = 0.001, calibration_calls: int = 500000):
+        """Constructor for SamplingProfiler
+
+        Args:
+            interval (float, optional): Seconds between samples. Defaults to 0.001.
+            calibration_calls (int, optional): Number of calls used to measure the delay a sample causes. Defaults to 500000.
+        """
+
+        super().__init__()
+
+        self.interval = interval
+        self.samples: dict[str, int] = Counter()  # Number of samples of each phase
+        self.own: dict[str, Counter] = {}  # Samples per function on top of the stack, per phase
+        self.total: dict[str, Counter] = {}  # Samples per function anywhere on the stack, per phase
+        self.window_overhead = 0.0
+        self.window_samples = 0
+
+        self.lock = threading.Lock()
+        self.thread_id = None
+        self.active = threading.Event()
+        self.closed = False
+        self.sampler = threading.Thread(target=self.run, daemon=True)
+        self.sampler.start()
+        self.sample_overhead = self.calibrate(calibration_calls)
+
+    def calibrate(self, num_calls: int) -> float:
+        """Measures how long a sample delays the profiled thread
+
+        The delay includes handing the interpreter to the sampler and back, which the sampler cannot time itself.
+
+        Args:
+            num_calls (int): Number of calls to time.
+
+        Returns:
+            float: Returns seconds of delay per sample.
+        """
+
+        start = time.perf_counter()
+
+        for _ in range(num_calls):
+
+            _empty()
+
+        plain = time.perf_counter() - start
+
+        self.start("calibration")
+        start = time.perf_counter()
+
+        for _ in range(num_calls):
+
+            _empty()
+
+        profiled = time.perf_counter() - start
+        self.active.clear()
+
+        # The faster of two plain runs is least disturbed by the rest of the machine
+        start = time.perf_counter()
+
+        for _ in range(num_calls):
+
+            _empty()
+
+        plain = min(plain, time.perf_counter() - start)
+
+        with self.lock:
+
+            self.phase = None
+            num_samples = self.samples.pop("calibration", 0)
+            self.own.pop("calibration", None)
+            self.total.pop("calibration", None)
+
+        if num_samples == 0:
+
+            return 0.0
+
+        return max(0.0, (profiled - plain) / num_samples)
+
+    @staticmethod
+    def describe(frame) -> str:
+        """Describes the function of a frame
+
+        Args:
+            frame (frame): Frame of the sampled stack.
+
+        Returns:
+            str: Returns "file:line(function)" of the start of the function.
+        """
+
+        code = frame.f_code
+
+        return code.co_filename + ":" + str(code.co_firstlineno) + "(" + code.co_name + ")"
+
+    def sample(self) -> None:
+        """Records the current stack of the profiled thread"""
+
+        frame = sys._current_frames().get(self.thread_id)
+
+        with self.lock:
+
+            phase = self.phase
+
+            if frame is None or phase is None:
+
+                return
+
+            self.samples[phase] += 1
+            self.own.setdefault(phase, Counter())[self.describe(frame)] += 1
+
+            stack = set()
+
+            while frame is not None:
+
+                stack.add(self.describe(frame))
+                frame = frame.f_back
+
+            self.total.setdefault(phase, Counter()).update(stack)
+
+    def run(self) -> None:
+        """Samples the profiled thread until the profiler is closed"""
+
+        while not self.closed:
+
+            self.active.wait()
+
+            if self.closed:
+
+                return
+
+            start = time.perf_counter()
+            self.sample()
+
+            # The sampler holds the interpreter while sampling, which delays the profiled thread
+            with self.lock:
+
+                self.window_overhead += time.perf_counter() - start
+                self.window_samples += 1
+
+            time.sleep(self.interval)
+
+    def start(self, phase: str) -> None:
+        """Starts profiling a phase
+
+        Args:
+            phase (str): Name of phase.
+        """
+
+        with self.lock:
+
+            self.thread_id = threading.get_ident()
+            self.phase = phase
+            self.window_overhead = 0.0
+            self.window_samples = 0
+
+        self.active.set()
+
+    def stop(self) -> float:
+        """Stops profiling the current phase
+
+        Returns:
+            float: Returns seconds the samples since the phase was started delayed the profiled thread, including the time of stopping.
+        """
+
+        begin = time.perf_counter()
+        self.active.clear()
+
+        with self.lock:
+
+            self.phase = None
+
+            # The calibrated delay also covers the interpreter handoffs that sampling itself does not see
+            overhead = max(
+                self.window_overhead, self.window_samples * self.sample_overhead
+            )
+            self.window_overhead = 0.0
+            self.window_samples = 0
+
+        overhead += time.perf_counter() - begin
+        self.overhead += overhead
+
+        return overhead
+
+    def report(self, stream=None, limit: int = 20) -> None:
+        """Writes the most sampled functions of every phase
+
+        Args:
+            stream (file, optional): File to write to, None for stdout. Defaults to None.
+            limit (int, optional): Number of functions listed per phase. Defaults to 20.
+        """
+
+        stream = sys.stdout if stream is None else stream
+
+        with self.lock:
+
+            for phase, samples in self.samples.items():
+
+                stream.write("Phase: " + phase + " (" + str(samples) + " samples)\n")
+                stream.write("   own%  total%  function\n")
+
+                for function, count in self.total[phase].most_common(limit):
+
+                    stream.write(
+                        "%7.1f %7.1f  %s\n"
+                        % (
+                            100 * self.own[phase][function] / samples,
+                            100 * count / samples,
+                            function,
+                        )
+                    )
+
+                stream.write("\n")
+
+        stream.write(
+            "Measured profiling overhead excluded from rounds: "
+            + str(round(self.overhead, 6))
+            + " seconds\n"
+        )
+
+        return
+
+    def close(self) -> None:
+        """Stops the sampling thread"""
+
+        self.closed = True
+        self.active.set()
+        self.sampler.join()
+
+        return
+
+
+def make_profiler(mode: str) -> RoundProfiler:
+    """Creates a profiler from its command-line name
+
+    Args:
+        mode (str): "cprofile" or "sampling".
+
+    Raises:
+        ValueError: Mode is not recognized.
+
+    Returns:
+        RoundProfiler: Returns new profiler.
+    """
+
+    if mode == "cprofile":
+
+        return DeterministicProfiler()
+
+    elif mode == "sampling":
+
+        return SamplingProfiler()
+
+    raise ValueError("Unrecognized profiling mode.")
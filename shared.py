@@ -0,0 +1,245 @@
+# File contains read-only tables that are published once in shared memory and attached without copying by workers.
+# A sweep over a process pool publishes the enumerated code space of every geometry before starting the workers,
+# so that N workers use about one copy of each table instead of N (see sweep.py).
+#
+# The process that publishes a table owns it and unlinks it when it is closed. If the owner crashes, the resource
+# tracker of multiprocessing, which is shared with the workers it started, unlinks the tables once they all exit.
+
+import array
+import os
+import sys
+from multiprocessing import resource_tracker, shared_memory
+from codes import iterate_codes
+
+
+class SharedArray:
+    """Flat array of numbers in a block of shared memory"""
+
+    def __init__(
+        self,
+        memory: shared_memory.SharedMemory,
+        typecode: str,
+        length: int,
+        owner_pid: int,
+        owned: bool,
+    ):
+        """Constructor for SharedArray, use create or attach instead
+
+        Args:
+            memory (SharedMemory): Block holding the array.
+            typecode (str): Type of the numbers, as for array.array.
+            length (int): Number of numbers.
+            owner_pid (int): Process that created the block.
+            owned (bool): Whether this object created the block and unlinks it.
+        """
+
+        self.memory = memory
+        self.typecode = typecode
+        self.length = length
+        self.owner_pid = owner_pid
+        self.owned = owned
+        self.itemsize = array.array(typecode).itemsize
+        self.array = memory.buf[: length * self.itemsize].cast(typecode)
+
+    @classmethod
+    def create(cls, typecode: str, values) -> "SharedArray":
+        """Publishes numbers in a new block of shared memory
+
+        Args:
+            typecode (str): Type of the numbers, as for array.array.
+            values (array.array or bytes): Numbers to copy into the block.
+
+        Returns:
+            SharedArray: Returns array owned by this process.
+        """
+
+        data = memoryview(values).cast("B")
+        itemsize = array.array(typecode).itemsize
+        memory = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+        memory.buf[: len(data)] = data
+
+        return cls(memory, typecode, len(data) // itemsize, os.getpid(), True)
+
+    @classmethod
+    def attach(cls, descriptor: tuple[str, str, int, int]) -> "SharedArray":
+        """Attaches an array published by another process, without copying it
+
+        Args:
+            descriptor (tuple[str, str, int, int]): Descriptor of the array, see SharedArray.descriptor.
+
+        Returns:
+            SharedArray: Returns array, which should only be read.
+        """
+
+        name, typecode, length, owner_pid = descriptor
+
+        if sys.version_info >= (3, 13):
+
+            memory = shared_memory.SharedMemory(name=name, track=False)
+
+        else:
+
+            memory = shared_memory.SharedMemory(name=name)
+
+            # Before Python 3.13 attaching registers the block with the resource tracker, which unlinks it when
+            # its processes exit. The owner and its children share a tracker, where the block is registered anyway,
+            # but the tracker of any other process must forget it.
+            if owner_pid not in (os.getpid(), os.getppid()):
+
+                resource_tracker.unregister(memory._name, "shared_memory")
+
+        return cls(memory, typecode, length, owner_pid, False)
+
+    @property
+    def descriptor(self) -> tuple[str, str, int, int]:
+        """(name of block, typecode, length, owner process) that attach needs, which can be pickled"""
+
+        return (self.memory.name, self.typecode, self.length, self.owner_pid)
+
+    def __len__(self) -> int:
+
+        return self.length
+
+    def __getitem__(self, index):
+
+        return self.array[index]
+
+    def close(self) -> None:
+        """Detaches the array, and unlinks the block if this object created it"""
+
+        if self.array is None:
+
+            return
+
+        self.array.release()
+        self.array = None
+        self.memory.close()
+
+        if self.owned:
+
+            self.memory.unlink()
+
+
+class SharedCodes:
+    """All codes of a geometry in rank order, read from a SharedArray of one byte per peg"""
+
+    def __init__(self, table: SharedArray, board_length: int):
+        """Constructor for SharedCodes
+
+        Args:
+            table (SharedArray): Codes as Latin-1 bytes, see publish_codes.
+            board_length (int): Number of pegs.
+        """
+
+        self.table = table
+        self.board_length = board_length
+
+    def __len__(self) -> int:
+
+        return len(self.table) // self.board_length
+
+    def __getitem__(self, rank: int) -> str:
+
+        start = rank * self.board_length
+
+        return bytes(self.table.array[start : start + self.board_length]).decode(
+            "latin-1"
+        )
+
+    def __iter__(self):
+
+        for rank in range(len(self)):
+
+            yield self[rank]
+
+
+def publish_codes(board_length: int, colors: list[str]) -> SharedArray:
+    """Publishes the enumeration of all codes of a geometry
+
+    Args:
+        board_length (int): Number of pegs.
+        colors (list[str]): All possible colors, each below code point 256.
+
+    Raises:
+        ValueError: A color cannot be stored in one byte.
+
+    Returns:
+        SharedArray: Returns codes in rank order, board_length bytes each.
+    """
+
+    if any(ord(color) >= 256 for color in colors):
+
+        raise ValueError("Colors must be below code point 256 to be shared.")
+
+    data = bytearray()
+
+    for chunk in iterate_codes(board_length, colors):
+
+        data += "".join(chunk).encode("latin-1")
+
+    return SharedArray.create("B", data)
+
+
+class SharedTables:
+    """Tables published by this process, by geometry, that are unlinked together"""
+
+    def __init__(self):
+        """Constructor for SharedTables"""
+
+        self.tables = {}  # (board_length, num_colors) -> SharedArray of codes
+
+    def __enter__(self) -> "SharedTables":
+
+        return self
+
+    def __exit__(self, *exc) -> None:
+
+        self.close()
+
+    def publish(self, board_length: int, colors: list[str]) -> None:
+        """Publishes the code space of a geometry, once
+
+        Args:
+            board_length (int): Number of pegs.
+            colors (list[str]): All possible colors that can be used to generate a code.
+        """
+
+        key = (board_length, len(colors))
+
+        if key not in self.tables:
+
+            self.tables[key] = publish_codes(board_length, colors)
+
+    def descriptors(self) -> dict:
+        """Describes the tables for attach_codes
+
+        Returns:
+            dict: Returns {(board_length, num_colors): descriptor of SharedArray of codes}.
+        """
+
+        return {key: table.descriptor for key, table in self.tables.items()}
+
+    def close(self) -> None:
+        """Unlinks every table"""
+
+        for table in self.tables.values():
+
+            table.close()
+
+        self.tables = {}
+
+
+def attach_codes(descriptors: dict) -> dict:
+    """Attaches the code spaces published by SharedTables
+
+    Args:
+        descriptors (dict): Descriptors from SharedTables.descriptors.
+
+    Returns:
+        dict: Returns {(board_length, num_colors): SharedCodes}.
+    """
+
+    return {
+        key: SharedCodes(SharedArray.attach(descriptor), key[0])
+        for key, descriptor in descriptors.items()
+    }
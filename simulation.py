@@ -0,0 +1,231 @@
+# File contains a batched simulation engine that plays many rounds of Mastermind in lock-step.
+# Instead of one Round object and one timed call per guess, every step asks a BatchPlayer for the guesses of all
+# unfinished rounds at once and scores them against answers that were encoded once per batch.
+# Example: simulate_tournament(Mastermind(7, list("ABCDE")), Boring(), InsertColors(), 100000)
+
+import time
+from operator import eq
+from mastermind import Mastermind, Result, Results
+from alphabet import Alphabet
+from player import BatchPlayer
+from scsa import SCSA
+
+
+def score_batch(
+    mastermind: Mastermind,
+    alphabet,
+    guesses: list[str],
+    answers: list[str],
+    answer_indices: list,
+    answer_counts: list[list[int]],
+) -> list[tuple[Result, int, int]]:
+    """Scores guesses against answers like Round.respond_to_guess, without the time check
+
+    Args:
+        mastermind (Mastermind): Game that is played.
+        alphabet (Alphabet): Alphabet of the colors of the game.
+        guesses (list[str]): Guess of every round.
+        answers (list[str]): Answer of every round.
+        answer_indices (list): Answer of every round, encoded by the alphabet.
+        answer_counts (list[list[int]]): Number of pegs of each color of the answer of every round.
+
+    Returns:
+        list[tuple[Result, int, int]]: Returns (result of guess (WIN, VALID, or FAILURE), exact, other) for every round.
+    """
+
+    board_length = mastermind.board_length
+    win = (Result.WIN, board_length, 0)
+    failure = (Result.FAILURE, 0, 0)
+    responses = []
+
+    for guess, answer, indices, counts in zip(
+        guesses, answers, answer_indices, answer_counts
+    ):
+
+        if guess == answer:
+
+            responses.append(win)
+
+            continue
+
+        if not isinstance(guess, str) or len(guess) != board_length:
+
+            responses.append(failure)
+
+            continue
+
+        guess_indices = alphabet.encode(guess)
+
+        if alphabet.invalid in guess_indices:
+
+            responses.append(failure)
+
+            continue
+
+        exact = sum(map(eq, guess_indices, indices))
+        counts = counts.copy()
+        common = 0
+
+        for idx in guess_indices:
+
+            if counts[idx] > 0:
+
+                counts[idx] -= 1
+                common += 1
+
+        responses.append((Result.VALID, exact, common - exact))
+
+    return responses
+
+
+def simulate_rounds(
+    mastermind: Mastermind,
+    player: BatchPlayer,
+    scsa_name: str,
+    answers: list[str],
+    first_round_id: int = 0,
+) -> list[tuple[Result, int, float]]:
+    """Plays a batch of rounds in lock-step
+
+    Args:
+        mastermind (Mastermind): Game that is played.
+        player (BatchPlayer): Player that guesses for all rounds.
+        scsa_name (str): Name of SCSA used to generate the answers.
+        answers (list[str]): Answer of every round.
+        first_round_id (int, optional): Identifier of the first round, the others follow in order. Defaults to 0.
+
+    Returns:
+        list[tuple[Result, int, float]]: Returns (result of round, number of guesses, seconds used) for every round.
+    """
+
+    alphabet = Alphabet(mastermind.colors)
+    answer_indices = [alphabet.encode(answer) for answer in answers]
+    answer_counts = []
+
+    for indices in answer_indices:
+
+        counts = [0] * len(mastermind.colors)
+
+        for idx in indices:
+
+            if idx != alphabet.invalid:
+
+                counts[idx] += 1
+
+        answer_counts.append(counts)
+
+    num_rounds = len(answers)
+    guesses_made = [0] * num_rounds
+    time_used = [0.0] * num_rounds
+    last_responses = [(0, 0, 0)] * num_rounds
+    outcomes = [None] * num_rounds
+    time_limit = mastermind.round_time_cutoff + 0.1  # Same buffer as Round.time_buffer
+    active = list(range(num_rounds))
+
+    while len(active) > 0:
+
+        start = time.time()
+        guesses = player.make_guesses(
+            mastermind.board_length,
+            mastermind.colors,
+            scsa_name,
+            [first_round_id + i for i in active],
+            [last_responses[i] for i in active],
+        )
+        end = time.time()
+
+        # The time of a step is shared equally by the rounds that were played in it
+        duration = (end - start) / len(active)
+
+        responses = score_batch(
+            mastermind,
+            alphabet,
+            guesses,
+            [answers[i] for i in active],
+            [answer_indices[i] for i in active],
+            [answer_counts[i] for i in active],
+        )
+        still_active = []
+        ended = []
+
+        for i, (result, exact, other) in zip(active, responses):
+
+            guesses_made[i] += 1
+            time_used[i] += duration
+
+            if time_used[i] > time_limit:
+
+                outcomes[i] = Result.LOSS
+
+            elif result != Result.VALID:
+
+                outcomes[i] = result
+
+            elif guesses_made[i] >= mastermind.guess_cutoff:
+
+                outcomes[i] = Result.LOSS
+
+            else:
+
+                last_responses[i] = (exact, other, guesses_made[i])
+                still_active.append(i)
+
+                continue
+
+            ended.append(first_round_id + i)
+
+        player.end_rounds(ended)
+        active = still_active
+
+    return list(zip(outcomes, guesses_made, time_used))
+
+
+def simulate_tournament(
+    mastermind: Mastermind,
+    player: BatchPlayer,
+    scsa: SCSA,
+    num_rounds: int,
+    batch_size: int = 4096,
+) -> Results:
+    """Plays a tournament of Mastermind in batches of rounds played in lock-step
+
+    Results are recorded in round order with the rules of Mastermind.play_tournament: the tournament stops at the
+    first failure or when the tournament time cutoff is exceeded.
+
+    Args:
+        mastermind (Mastermind): Game that is played.
+        player (BatchPlayer): Player that guesses for all rounds.
+        scsa (SCSA): SCSA used to generate secret codes for player to guess.
+        num_rounds (int): Number of rounds of Mastermind to play.
+        batch_size (int, optional): Number of rounds played in lock-step. Defaults to 4096.
+
+    Returns:
+        Results: Returns results of the tournament.
+    """
+
+    results = Results()
+
+    for first in range(0, num_rounds, batch_size):
+
+        size = min(batch_size, num_rounds - first)
+        answers = scsa.generate_codes(mastermind.board_length, mastermind.colors, size)
+
+        for result, guesses, duration in simulate_rounds(
+            mastermind, player, scsa.name, answers, first
+        ):
+
+            mastermind.time_used += duration
+
+            if mastermind.time_used > mastermind.tournament_time_cutoff:
+
+                return results
+
+            results.record_result(
+                result, guesses, duration, mastermind.score_round(result, guesses)
+            )
+
+            if result == Result.FAILURE:
+
+                return results
+
+    return results
@@ -0,0 +1,509 @@
+# File contains an exact game-tree solver for small games of Mastermind and a player that replays its solutions.
+# Example: GameTreeSolver(4, ["A", "B", "C", "D"]).save("tree_4_4.json"), then TreePlayer("tree_4_4.json").
+
+import itertools
+import json
+import math
+from collections import OrderedDict
+from player import Player
+from codes import code_space_size, feedback, iterate_codes
+from symmetry import GuessSymmetry
+
+
+class GameTreeSolver:
+    """Computes an optimal decision tree, assuming the secret code is any code with equal probability"""
+
+    # Largest number of orders of tied colors and positions canonicalize tries
+    MAX_ORDERS = 120
+
+    def __init__(
+        self,
+        board_length: int,
+        colors: list[str],
+        objective: str = "guesses",
+        max_table_size: int = 200000,
+        consistent_guesses_only: bool = False,
+    ):
+        """Constructor for GameTreeSolver
+
+        Args:
+            board_length (int): Number of pegs.
+            colors (list[str]): All possible colors that can be used to generate a code.
+            objective (str, optional): "guesses" to minimize the expected number of guesses, or "score" to maximize
+                                       the expected score of a won round as scored by Mastermind. Defaults to "guesses".
+            max_table_size (int, optional): Largest number of entries in the transposition table. Defaults to 200000.
+            consistent_guesses_only (bool, optional): Only guess codes that could be the answer, which is faster but
+                                                      may not be optimal. Defaults to False.
+
+        Raises:
+            ValueError: Objective is not recognized.
+        """
+
+        if objective not in ("guesses", "score"):
+
+            raise ValueError("Unrecognized objective.")
+
+        self.board_length = board_length
+        self.colors = colors
+        self.objective = objective
+        self.max_table_size = max_table_size
+        self.consistent_guesses_only = consistent_guesses_only
+
+        self.color_index = {color: i for i, color in enumerate(colors)}
+
+        # Transposition table, (canonical candidates, depth) -> (cost, best guess relabeled like the candidates),
+        # evicting the least recently used entry
+        self.table = OrderedDict()
+        self.table_hits = 0
+
+        self.codes = [
+            code for chunk in iterate_codes(board_length, colors) for code in chunk
+        ]
+
+    def win_cost(self, depth: int) -> float:
+        """Computes cost of winning with the given guess, lower is better
+
+        Args:
+            depth (int): Number of the winning guess.
+
+        Returns:
+            float: Returns the number of guesses, or the negated score of the round.
+        """
+
+        if self.objective == "guesses":
+
+            return depth
+
+        return -self.board_length * len(self.colors) * (5 * depth ** (-0.5))
+
+    def lower_bound(self, size: int, depth: int) -> float:
+        """Computes a lower bound on the mean cost of a set of candidates
+
+        At best one candidate is won with the next guess and all the others with the guess after that.
+
+        Args:
+            size (int): Number of candidates.
+            depth (int): Number of the next guess.
+
+        Returns:
+            float: Returns lower bound on the mean cost.
+        """
+
+        if size == 1:
+
+            return self.win_cost(depth)
+
+        return (self.win_cost(depth) + (size - 1) * self.win_cost(depth + 1)) / size
+
+    def canonicalize(
+        self, candidates: tuple[str]
+    ) -> tuple[tuple[str], tuple[int], dict]:
+        """Relabels colors and permutes positions of a set of candidates into a canonical form
+
+        Relabeled sets have the same cost, as every guess is relabeled along. Colors and positions are ordered
+        by how often each color appears at each position, and ties are broken by trying every order of the tied
+        colors and positions, keeping the smallest relabeled set, unless there are more than MAX_ORDERS orders.
+
+        Args:
+            candidates (tuple[str]): Codes that are still possible.
+
+        Returns:
+            tuple[tuple[str], tuple[int], dict]: (sorted relabeled candidates, position of the original code at
+                                                 each position of a relabeled code, relabeling of every color).
+        """
+
+        board_length = self.board_length
+        counts = {}
+
+        for code in candidates:
+
+            for i, peg in enumerate(code):
+
+                counts.setdefault(peg, [0] * board_length)[i] += 1
+
+        present = sorted(counts, key=self.color_index.get)
+
+        def group(items: list, invariant) -> list[list]:
+
+            groups = {}
+
+            for item in items:
+
+                groups.setdefault(invariant(item), []).append(item)
+
+            return [groups[key] for key in sorted(groups, reverse=True)]
+
+        color_groups = group(
+            present, lambda color: (sum(counts[color]), tuple(sorted(counts[color])))
+        )
+        position_groups = group(
+            range(board_length),
+            lambda i: tuple(sorted(counts[color][i] for color in present)),
+        )
+        groups = color_groups + position_groups
+
+        num_orders = math.prod(math.factorial(len(items)) for items in groups)
+
+        if num_orders > self.MAX_ORDERS:
+
+            orders = [[items] for items in groups]
+
+        else:
+
+            orders = [list(itertools.permutations(items)) for items in groups]
+
+        absent = [color for color in self.colors if color not in counts]
+        best = None
+
+        for choice in itertools.product(*orders):
+
+            colors = [color for items in choice[: len(color_groups)] for color in items]
+            positions = tuple(i for items in choice[len(color_groups) :] for i in items)
+            relabel = dict(zip(colors + absent, self.colors))
+            relabeled = tuple(
+                sorted(self.relabel(code, positions, relabel) for code in candidates)
+            )
+
+            if best is None or relabeled < best[0]:
+
+                best = (relabeled, positions, relabel)
+
+        return best
+
+    def relabel(self, guess: str, positions: tuple[int], relabel: dict) -> str:
+        """Relabels a guess like the candidates of canonicalize"""
+
+        return "".join([relabel[guess[i]] for i in positions])
+
+    def unlabel(self, guess: str, positions: tuple[int], relabel: dict) -> str:
+        """Undoes relabel"""
+
+        original = {label: color for color, label in relabel.items()}
+        code = [None] * self.board_length
+
+        for peg, i in zip(guess, positions):
+
+            code[i] = original[peg]
+
+        return "".join(code)
+
+    def partition(self, guess: str, candidates: tuple[str]) -> dict:
+        """Groups candidates by the feedback they give to a guess
+
+        Args:
+            guess (str): Guess of secret code.
+            candidates (tuple[str]): Codes that are still possible.
+
+        Returns:
+            dict: Returns {(exact, other): tuple of candidates}.
+        """
+
+        parts = {}
+
+        for code in candidates:
+
+            parts.setdefault(feedback(guess, code), []).append(code)
+
+        return {response: tuple(codes) for response, codes in parts.items()}
+
+    def guesses_to_try(self, candidates: tuple[str], history: list[str]) -> list[str]:
+        """Lists the guesses worth trying for a set of candidates
+
+        Args:
+            candidates (tuple[str]): Codes that are still possible.
+            history (list[str]): Guesses made so far.
+
+        Returns:
+            list[str]: Returns candidates first, followed by one guess per symmetry class of the other codes.
+        """
+
+        if self.consistent_guesses_only:
+
+            return list(candidates)
+
+        symmetry = GuessSymmetry(self.board_length, self.colors, history)
+
+        return list(dict.fromkeys(list(candidates) + symmetry.canonical_guesses()))
+
+    def search(
+        self, candidates: tuple[str], depth: int, history: list[str]
+    ) -> tuple[float, str]:
+        """Finds the guess with the lowest mean cost for a set of candidates
+
+        Args:
+            candidates (tuple[str]): Sorted codes that are still possible.
+            depth (int): Number of the next guess.
+            history (list[str]): Guesses made so far.
+
+        Returns:
+            tuple[float, str]: (mean cost over the candidates, best guess).
+        """
+
+        if len(candidates) == 1:
+
+            return (self.win_cost(depth), candidates[0])
+
+        # Sets that are the same up to relabeling colors and permuting positions share an entry
+        canonical, positions, relabel = self.canonicalize(candidates)
+
+        # Costs of the guesses objective only shift with depth, so one entry serves every depth
+        if self.objective == "guesses":
+
+            key = (canonical, 1)
+            shift = depth - 1
+
+        else:
+
+            key = (canonical, depth)
+            shift = 0
+
+        if key in self.table:
+
+            self.table_hits += 1
+            self.table.move_to_end(key)
+            cost, guess = self.table[key]
+
+            return (cost + shift, self.unlabel(guess, positions, relabel))
+
+        consistent = set(candidates)
+        win = (self.board_length, 0)
+        options = []
+
+        for guess in self.guesses_to_try(candidates, history):
+
+            parts = self.partition(guess, candidates)
+
+            # A guess that does not split the candidates can never help
+            if len(parts) == 1 and guess not in consistent:
+
+                continue
+
+            bound = self.win_cost(depth) if guess in consistent else 0
+
+            for response, part in parts.items():
+
+                if response != win:
+
+                    bound += len(part) * self.lower_bound(len(part), depth + 1)
+
+            options.append(
+                (bound / len(candidates), guess not in consistent, guess, parts)
+            )
+
+        options.sort(key=lambda option: option[:2])
+
+        best = (float("inf"), None)
+
+        for bound, _, guess, parts in options:
+
+            if bound >= best[0]:
+
+                break
+
+            # Replace the lower bound of each partition by its exact cost, giving up once the guess cannot win
+            total = bound * len(candidates)
+
+            for response, part in parts.items():
+
+                if response == win:
+
+                    continue
+
+                cost = self.search(part, depth + 1, history + [guess])[0]
+                total += len(part) * (cost - self.lower_bound(len(part), depth + 1))
+
+                if total / len(candidates) >= best[0]:
+
+                    break
+
+            if total / len(candidates) < best[0]:
+
+                best = (total / len(candidates), guess)
+
+        guess = self.relabel(best[1], positions, relabel)
+        self.table[key] = (best[0] - shift, guess)
+
+        if len(self.table) > self.max_table_size:
+
+            self.table.popitem(last=False)
+
+        return best
+
+    def build(self, candidates: tuple[str], depth: int, history: list[str]) -> dict:
+        """Builds the decision tree for a set of candidates
+
+        Args:
+            candidates (tuple[str]): Sorted codes that are still possible.
+            depth (int): Number of the next guess.
+            history (list[str]): Guesses made so far.
+
+        Returns:
+            dict: Returns {"guess": guess, "children": {"exact,other": subtree}}.
+        """
+
+        _, guess = self.search(candidates, depth, history)
+        children = {}
+
+        for response, part in self.partition(guess, candidates).items():
+
+            if response != (self.board_length, 0):
+
+                children["%d,%d" % response] = self.build(
+                    part, depth + 1, history + [guess]
+                )
+
+        return {"guess": guess, "children": children}
+
+    def solve(self) -> dict:
+        """Solves the game
+
+        Returns:
+            dict: Returns serializable solution with the game, objective, expected value and decision tree.
+        """
+
+        candidates = tuple(self.codes)
+        cost, _ = self.search(candidates, 1, [])
+
+        return {
+            "board_length": self.board_length,
+            "colors": list(self.colors),
+            "objective": self.objective,
+            "expected": cost if self.objective == "guesses" else -cost,
+            "tree": self.build(candidates, 1, []),
+        }
+
+    def save(self, file_name: str) -> dict:
+        """Solves the game and writes the solution to a JSON file
+
+        Args:
+            file_name (str): Name of file to write to.
+
+        Returns:
+            dict: Returns solution that was written.
+        """
+
+        solution = self.solve()
+
+        with open(file_name, "w") as file:
+
+            json.dump(solution, file)
+
+        return solution
+
+
+class TreePlayer(Player):
+    """Mastermind Player that follows a decision tree computed by GameTreeSolver
+
+    The tree is loaded or solved before the rounds are played, as solving takes longer than a timed guess.
+    """
+
+    deterministic = True
+
+    def __init__(self, solution=None, max_code_space: int = 81):
+        """Constructor for TreePlayer
+
+        Args:
+            solution (dict or str, optional): Solution returned by GameTreeSolver.solve, or name of file written by
+                                              GameTreeSolver.save. None to call solve before the first round, which
+                                              only takes a few seconds up to about 3 pegs and 4 colors.
+                                              Defaults to None.
+            max_code_space (int, optional): Largest number of possible codes of a game solved by solve.
+                                            Defaults to 81.
+        """
+
+        if isinstance(solution, str):
+
+            with open(solution, "r") as file:
+
+                solution = json.load(file)
+
+        self.player_name = "TreePlayer"
+        self.solution = solution
+        self.max_code_space = max_code_space
+        self.node = None if solution is None else solution["tree"]
+
+    def solve(self, board_length: int, colors: list[str]) -> None:
+        """Solves the game if there is no solution yet, and checks that the solution is for the game
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]): All possible colors that can be used to generate a code.
+
+        Raises:
+            ValueError: The game is too large to solve, or the solution is for a different game.
+        """
+
+        if self.solution is None:
+
+            if code_space_size(board_length, len(colors)) > self.max_code_space:
+
+                raise ValueError(
+                    "Too many possible codes for "
+                    + self.player_name
+                    + ", at most "
+                    + str(self.max_code_space)
+                    + " can be solved."
+                )
+
+            self.solution = GameTreeSolver(board_length, list(colors)).solve()
+
+        if (
+            board_length != self.solution["board_length"]
+            or list(colors) != self.solution["colors"]
+        ):
+
+            raise ValueError("Decision tree was solved for a different game.")
+
+        return
+
+    def make_guess(
+        self,
+        board_length: int,
+        colors: list[str],
+        scsa_name: str,
+        last_response: tuple[int, int, int],
+    ) -> str:
+        """Makes a guess of the secret code for Mastermind
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]]): All possible colors that can be used to generate a code.
+            scsa_name (str): Name of SCSA used to generate secret code.
+            last_response (tuple[int, int, int]): (First element in tuple is the number of pegs that match exactly with the secret
+                                           code for the previous guess, the second element is the number of pegs that are
+                                           the right color, but in the wrong location for the previous guess, and the third
+                                           element is the number of guesses so far.)
+
+        Raises:
+            ValueError: There is no decision tree, or the game or the response is not covered by it.
+
+        Returns:
+            str: Returns guess
+        """
+
+        if last_response[2] == 0:
+
+            if self.solution is None:
+
+                raise ValueError("No decision tree, call solve before the first round.")
+
+            if (
+                board_length != self.solution["board_length"]
+                or list(colors) != self.solution["colors"]
+            ):
+
+                raise ValueError("Decision tree was solved for a different game.")
+
+            self.node = self.solution["tree"]
+
+        else:
+
+            response = "%d,%d" % (last_response[0], last_response[1])
+
+            if response not in self.node["children"]:
+
+                raise ValueError("Response is not covered by the decision tree.")
+
+            self.node = self.node["children"][response]
+
+        return self.node["guess"]
@@ -0,0 +1,482 @@
+# File contains solvers for SCSAs whose codes have a known structure, and a player that dispatches to them.
+# ABColor codes only use "A" and "B", TwoColorAlternating codes are fixed by an ordered pair of colors,
+# FirstLast codes repeat the first color at the end and OnlyOnce codes do not repeat colors.
+# Example: Mastermind(7, list("ABCDE")).play_tournament(Specialized(), TwoColorAlternating(), 100)
+
+import math
+import random
+from player import Player
+from minimax import Minimax
+from codes import (
+    codes_first_last,
+    codes_with_k_colors,
+    codes_without_repeats,
+    count_codes_first_last,
+    count_codes_with_k_colors,
+    count_codes_without_repeats,
+)
+
+
+class ABColorSolver(Player):
+    """Solver for codes that only use "A" and "B"
+
+    The first guess is all "A"s, which counts the "A"s of the answer. Every further guess puts a "B" at the
+    first unknown position, the colors found so far at the known positions and "A" elsewhere, which tells the
+    color of that position. Once all "A"s or all "B"s are placed the answer is known, so a round takes at most
+    board_length + 1 guesses.
+    """
+
+    exact_only = True
+    deterministic = True
+
+    def __init__(self):
+        """Constructor for ABColorSolver"""
+
+        self.player_name = "ABColor Solver"
+        self.code = []  # Color of every position, None while unknown
+        self.a_left = 0  # Number of "A"s at unknown positions
+        self.known = 0  # Number of known positions
+        self.probe = None  # Position the last guess put a "B" at
+
+    def applies(self, board_length: int, colors: list[str]) -> bool:
+
+        return board_length >= 2 and "A" in colors and "B" in colors
+
+    def max_guesses(self, board_length: int, num_colors: int) -> int:
+
+        return board_length + 1
+
+    def make_guess(
+        self,
+        board_length: int,
+        colors: list[str],
+        scsa_name: str,
+        last_response: tuple[int, int, int],
+    ) -> str:
+        """Makes a guess of the secret code for Mastermind
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]]): All possible colors that can be used to generate a code.
+            scsa_name (str): Name of SCSA used to generate secret code.
+            last_response (tuple[int, int, int]): (First element in tuple is the number of pegs that match exactly with the secret
+                                           code for the previous guess, the second element is the number of pegs that are
+                                           the right color, but in the wrong location for the previous guess, and the third
+                                           element is the number of guesses so far.)
+
+        Returns:
+            str: Returns guess
+        """
+
+        exact = last_response[0]
+
+        if last_response[2] == 0:
+
+            self.code = [None] * board_length
+            self.known = 0
+            self.probe = None
+
+            return "A" * board_length
+
+        if self.probe is None:
+
+            self.a_left = exact
+
+        else:
+
+            # The other unknown positions add their "A"s, so exact is one more than that for a "B" at the probe
+            is_b = exact == self.known + self.a_left + 1
+            self.code[self.probe] = "B" if is_b else "A"
+            self.known += 1
+            self.a_left -= 0 if is_b else 1
+
+        unknown = [i for i, peg in enumerate(self.code) if peg is None]
+        b_left = len(unknown) - self.a_left
+
+        if self.a_left == 0 or b_left == 0:
+
+            fill = "A" if b_left == 0 else "B"
+
+            return "".join(fill if peg is None else peg for peg in self.code)
+
+        self.probe = unknown[0]
+        guess = [peg if peg is not None else "A" for peg in self.code]
+        guess[self.probe] = "B"
+
+        return "".join(guess)
+
+
+class AlternatingSolver(Player):
+    """Solver for codes that alternate between two distinct colors
+
+    The possible answers are the ordered pairs (x, y) of distinct colors, with x at the even positions and y at
+    the odd ones. The response of any guess to such an answer only depends on how often x and y are in the guess
+    and at which parity, so it is computed in O(1) per pair. Each guess is the one leaving the fewest pairs in
+    the worst case among the possible answers, random codes of the colors still possible at each parity, and
+    an alternating code of two colors that were not guessed yet. The latter alone finds the answer within
+    ceil(num_colors / 2) + 1 guesses, which the choice by the worst case keeps (checked exhaustively for up to
+    8 colors in mastermind_test.py), while long boards usually need about log2(num_colors ** 2) guesses.
+    """
+
+    def __init__(
+        self, num_random: int = 30, sample_size: int = 400, num_consistent: int = 20
+    ):
+        """Constructor for AlternatingSolver
+
+        Args:
+            num_random (int, optional): Number of random codes scored per guess. Defaults to 30.
+            sample_size (int, optional): Largest number of possible pairs a guess is scored against. Defaults to 400.
+            num_consistent (int, optional): Largest number of possible answers scored per guess. Defaults to 20.
+        """
+
+        self.player_name = "TwoColorAlternating Solver"
+        self.num_random = num_random
+        self.sample_size = sample_size
+        self.num_consistent = num_consistent
+
+        self.pairs = []  # Ordered pairs of colors still possible
+        self.untried = []  # Colors that were in no guess yet
+        self.last_guess = None
+
+    def applies(self, board_length: int, colors: list[str]) -> bool:
+
+        return board_length >= 2 and len(colors) >= 2
+
+    def max_guesses(self, board_length: int, num_colors: int) -> int:
+
+        return math.ceil(num_colors / 2) + 1
+
+    def alternate(self, pair: tuple[str, str], board_length: int) -> str:
+
+        x, y = pair
+
+        return (x + y) * (board_length // 2) + x * (board_length % 2)
+
+    def counts(self, guess: str) -> tuple[dict, dict, dict]:
+        """Counts the colors of a guess
+
+        Args:
+            guess (str): Guess of secret code.
+
+        Returns:
+            tuple[dict, dict, dict]: Returns number of pegs of each color in all, even and odd positions.
+        """
+
+        total = {}
+        even = {}
+        odd = {}
+
+        for i, peg in enumerate(guess):
+
+            total[peg] = total.get(peg, 0) + 1
+            parity = even if i % 2 == 0 else odd
+            parity[peg] = parity.get(peg, 0) + 1
+
+        return (total, even, odd)
+
+    def response(
+        self,
+        counts: tuple[dict, dict, dict],
+        pair: tuple[str, str],
+        board_length: int,
+    ) -> tuple[int, int]:
+        """Computes the response to a guess if the answer alternates between a pair of colors
+
+        Args:
+            counts (tuple[dict, dict, dict]): Counts of the colors of the guess, from self.counts.
+            pair (tuple[str, str]): Colors of the even and odd positions of the answer.
+            board_length (int): Number of pegs of secret code.
+
+        Returns:
+            tuple[int, int]: Returns (exact, other) like Round.process_guess.
+        """
+
+        total, even, odd = counts
+        x, y = pair
+
+        exact = even.get(x, 0) + odd.get(y, 0)
+        common = min(total.get(x, 0), (board_length + 1) // 2)
+        common += min(total.get(y, 0), board_length // 2)
+
+        return (exact, common - exact)
+
+    def choose_guess(self, colors: list[str], board_length: int) -> str:
+        """Picks the guess that leaves the fewest possible pairs in the worst case
+
+        Args:
+            colors (list[str]): All possible colors that can be used to generate a code.
+            board_length (int): Number of pegs of secret code.
+
+        Returns:
+            str: Returns guess.
+        """
+
+        if len(self.pairs) <= 2:
+
+            return self.alternate(self.pairs[0], board_length)
+
+        consistent = [self.alternate(pair, board_length) for pair in self.pairs]
+        guesses = consistent[: self.num_consistent]
+
+        if len(self.untried) > 1:
+
+            guesses.append(self.alternate(self.untried[:2], board_length))
+
+        evens = sorted({x for x, _ in self.pairs})
+        odds = sorted({y for _, y in self.pairs})
+
+        for _ in range(self.num_random):
+
+            guesses.append(
+                "".join(
+                    random.choice(evens if i % 2 == 0 else odds)
+                    for i in range(board_length)
+                )
+            )
+
+        if len(self.pairs) > self.sample_size:
+
+            sample = random.sample(self.pairs, self.sample_size)
+
+        else:
+
+            sample = self.pairs
+
+        consistent = set(consistent)
+        best_guess = None
+        best_key = None
+
+        for guess in guesses:
+
+            counts = self.counts(guess)
+            sizes = {}
+
+            for pair in sample:
+
+                response = self.response(counts, pair, board_length)
+                sizes[response] = sizes.get(response, 0) + 1
+
+            # Ties are broken in favor of guesses that could be the answer
+            key = (max(sizes.values()), guess not in consistent)
+
+            if best_key is None or key < best_key:
+
+                best_guess = guess
+                best_key = key
+
+        return best_guess
+
+    def make_guess(
+        self,
+        board_length: int,
+        colors: list[str],
+        scsa_name: str,
+        last_response: tuple[int, int, int],
+    ) -> str:
+        """Makes a guess of the secret code for Mastermind
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]]): All possible colors that can be used to generate a code.
+            scsa_name (str): Name of SCSA used to generate secret code.
+            last_response (tuple[int, int, int]): (First element in tuple is the number of pegs that match exactly with the secret
+                                           code for the previous guess, the second element is the number of pegs that are
+                                           the right color, but in the wrong location for the previous guess, and the third
+                                           element is the number of guesses so far.)
+
+        Returns:
+            str: Returns guess
+        """
+
+        if last_response[2] == 0:
+
+            self.pairs = [(x, y) for x in colors for y in colors if x != y]
+            self.untried = list(colors)
+
+        else:
+
+            response = last_response[:2]
+            counts = self.counts(self.last_guess)
+            self.pairs = [
+                pair
+                for pair in self.pairs
+                if self.response(counts, pair, board_length) == response
+            ]
+            self.untried = [color for color in self.untried if color not in counts[0]]
+
+        self.last_guess = self.choose_guess(colors, board_length)
+
+        return self.last_guess
+
+
+class SupportSolver(Minimax):
+    """Minimax player whose possible codes are only the codes an SCSA can generate
+
+    Every guess is chosen by Minimax from the codes that are still possible, so the round ends after at most
+    as many guesses as the SCSA has codes, and usually after a handful.
+    """
+
+    # The codes of an SCSA are not closed under relabeling colors and permuting positions
+    full_code_space = False
+
+    def __init__(
+        self,
+        enumerate_codes,
+        count_codes,
+        max_support: int = 10**5,
+        required_colors: list[str] = [],
+        **kwargs
+    ):
+        """Constructor for SupportSolver
+
+        Args:
+            enumerate_codes (function): Codes of the SCSA for (board_length, colors), e.g. codes_first_last.
+            count_codes (function): Number of codes of the SCSA for (board_length, num_colors).
+            max_support (int, optional): Largest number of codes the solver enumerates. Defaults to 10**5.
+            required_colors (list[str], optional): Colors the SCSA uses whatever the colors of the game. Defaults to [].
+            **kwargs: Keyword arguments of ScoringPlayer, bitsets is always False.
+        """
+
+        kwargs.setdefault("time_budget", 0.05)
+        kwargs["bitsets"] = False
+
+        super().__init__(**kwargs)
+
+        self.player_name = "Support Solver"
+        self.enumerate_codes = enumerate_codes
+        self.count_codes = count_codes
+        self.max_support = max_support
+        self.required_colors = required_colors
+
+    def applies(self, board_length: int, colors: list[str]) -> bool:
+
+        if any(color not in colors for color in self.required_colors):
+
+            return False
+
+        if board_length < 2:
+
+            return False
+
+        return self.count_codes(board_length, len(colors)) <= self.max_support
+
+    def max_guesses(self, board_length: int, num_colors: int) -> int:
+
+        return self.count_codes(board_length, num_colors)
+
+    def all_codes(self, board_length: int, colors: list[str]) -> list[str]:
+        """Enumerates the codes the SCSA can generate
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]): All possible colors that can be used to generate a code.
+
+        Returns:
+            list[str]: Returns codes of the SCSA.
+        """
+
+        return list(self.enumerate_codes(board_length, colors))
+
+
+class Specialized(Player):
+    """Mastermind Player that uses a solver for the structure of the SCSA of each round, if there is one
+
+    ABColor rounds are played by SupportSolver up to 2 ** 16 codes and by ABColorSolver beyond,
+    TwoColorAlternating rounds by AlternatingSolver, and FirstLast and OnlyOnce rounds by SupportSolver
+    up to 10 ** 5 codes. Rounds of other SCSAs, or of geometries no solver handles, are played by the
+    fallback player.
+    """
+
+    def __init__(self, fallback: Player = None):
+        """Constructor for Specialized
+
+        Args:
+            fallback (Player, optional): Player for SCSAs without a solver. Defaults to LMU().
+        """
+
+        if fallback is None:
+
+            from LMU import LMU
+
+            fallback = LMU()
+
+        self.player_name = "Specialized"
+        self.fallback = fallback
+        # Solvers of each SCSA, the first one that handles the geometry plays the round
+        self.solvers = {
+            "ABColor": [
+                SupportSolver(
+                    lambda length, colors: codes_with_k_colors(length, ["A", "B"], 2),
+                    lambda length, num_colors: count_codes_with_k_colors(length, 2, 2),
+                    required_colors=["A", "B"],
+                ),
+                ABColorSolver(),
+            ],
+            "TwoColorAlternating": [AlternatingSolver()],
+            "FirstLast": [SupportSolver(codes_first_last, count_codes_first_last)],
+            "OnlyOnce": [
+                SupportSolver(codes_without_repeats, count_codes_without_repeats)
+            ],
+        }
+        self.current = fallback  # Player of the round being played
+
+    def select(self, board_length: int, colors: list[str], scsa_name: str) -> Player:
+        """Picks the player for a round
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]): All possible colors that can be used to generate a code.
+            scsa_name (str): Name of SCSA used to generate secret code.
+
+        Returns:
+            Player: Returns solver of the SCSA if it handles the geometry, the fallback player otherwise.
+        """
+
+        for solver in self.solvers.get(scsa_name, []):
+
+            if solver.applies(board_length, colors):
+
+                return solver
+
+        return self.fallback
+
+    def configure(self, plan) -> None:
+        """Passes the plan of a geometry to the fallback player, the solvers enumerate far fewer codes
+
+        Args:
+            plan (Plan): Representation planned for the geometry, see planning.py.
+        """
+
+        if hasattr(self.fallback, "configure"):
+
+            self.fallback.configure(plan)
+
+        return
+
+    def make_guess(
+        self,
+        board_length: int,
+        colors: list[str],
+        scsa_name: str,
+        last_response: tuple[int, int, int],
+    ) -> str:
+        """Makes a guess of the secret code for Mastermind
+
+        Args:
+            board_length (int): Number of pegs of secret code.
+            colors (list[str]]): All possible colors that can be used to generate a code.
+            scsa_name (str): Name of SCSA used to generate secret code.
+            last_response (tuple[int, int, int]): (First element in tuple is the number of pegs that match exactly with the secret
+                                           code for the previous guess, the second element is the number of pegs that are
+                                           the right color, but in the wrong location for the previous guess, and the third
+                                           element is the number of guesses so far.)
+
+        Returns:
+            str: Returns guess
+        """
+
+        if last_response[2] == 0:
+
+            self.current = self.select(board_length, colors, scsa_name)
+
+        return self.current.make_guess(board_length, colors, scsa_name, last_response)
@@ -0,0 +1,527 @@
+# File contains implementation of sweeps, which play tournaments for many configurations at once.
+# Example: python main.py sweep --board_length 4-7 --num_colors 5 6 --player_name all --scsa_name all --num_rounds 100
+
+import argparse
+import csv
+import itertools
+import multiprocessing
+import os
+import sys
+import time
+from mastermind import Mastermind
+from alphabet import DEFAULT_SYMBOLS, default_colors
+from codes import code_space_size
+from planning import MemoryPlanner
+
+FIELDS = [
+    "board_length",
+    "num_colors",
+    "player_name",
+    "scsa_name",
+    "rounds",
+    "wins",
+    "losses",
+    "failures",
+    "score",
+    "seconds",
+    "error",
+]
+
+# Per-process caches. Workers keep these alive between jobs so that players, SCSAs and any
+# per-geometry structures (feedback tables, enumerated codes, opening books) are only built once.
+_players = {}
+_scsas = {}
+_geometry_caches = {}
+_planner = None  # MemoryPlanner of the sweep, see set_memory_budget
+
+# Largest code space that is published in shared memory for the workers of a sweep, as ScoringPlayer.max_code_space
+MAX_SHARED_CODES = 10**6
+
+
+def parse_values(values: list[str]) -> list[int]:
+    """Parses a list of integers and inclusive ranges
+
+    Args:
+        values (list[str]): Values such as ["4", "6-8"].
+
+    Returns:
+        list[int]: Returns sorted list of all integers described by values, e.g. [4, 6, 7, 8].
+    """
+
+    numbers = set()
+
+    for value in values:
+
+        if "-" in value:
+
+            low, high = value.split("-", 1)
+
+            numbers.update(range(int(low), int(high) + 1))
+
+        else:
+
+            numbers.add(int(value))
+
+    return sorted(numbers)
+
+
+def parse_names(values: list[str], choices: list[str]) -> list[str]:
+    """Parses a list of names, where "all" selects every choice
+
+    Args:
+        values (list[str]): Names given on the command line.
+        choices (list[str]): All recognized names.
+
+    Returns:
+        list[str]: Returns list of selected names.
+    """
+
+    if "all" in values:
+
+        return list(choices)
+
+    for value in values:
+
+        if value not in choices:
+
+            raise ValueError("Unrecognized name: " + value)
+
+    return list(dict.fromkeys(values))
+
+
+def get_geometry_cache(board_length: int, num_colors: int) -> dict:
+    """Gets the cache of the current process for a game geometry
+
+    Args:
+        board_length (int): Number of pegs.
+        num_colors (int): Number of colors.
+
+    Returns:
+        dict: Returns dictionary that persists between jobs with the same geometry in this process.
+    """
+
+    key = (board_length, num_colors)
+
+    if key not in _geometry_caches:
+
+        _geometry_caches[key] = {}
+
+    return _geometry_caches[key]
+
+
+def get_player(player_name: str, board_length: int, num_colors: int):
+    """Gets a (possibly warm) player from the cache of the current process
+
+    Args:
+        player_name (str): Name of player.
+        board_length (int): Number of pegs.
+        num_colors (int): Number of colors.
+
+    Returns:
+        Player: Returns player that is reused for all jobs with the same name and geometry.
+
+    Raises:
+        ValueError: Player can not play the geometry.
+    """
+
+    from main import str_to_player
+
+    key = (player_name, board_length, num_colors)
+
+    if key not in _players:
+
+        player = str_to_player(player_name)
+        codes = get_geometry_cache(board_length, num_colors).get("codes")
+
+        # Players that enumerate all codes read them from shared memory instead, if the sweep published them
+        if codes is not None and hasattr(player, "set_codes"):
+
+            player.set_codes(board_length, default_colors(num_colors), codes)
+
+        # Players that solve their game do it once per geometry, before the timed rounds
+        if hasattr(player, "solve"):
+
+            player.solve(board_length, default_colors(num_colors))
+
+        _players[key] = player
+
+    return _players[key]
+
+
+def get_scsa(scsa_name: str):
+    """Gets a SCSA from the cache of the current process
+
+    Args:
+        scsa_name (str): Name of SCSA.
+
+    Returns:
+        SCSA: Returns SCSA with the given name.
+    """
+
+    from main import str_to_scsa
+
+    if scsa_name not in _scsas:
+
+        _scsas[scsa_name] = str_to_scsa(scsa_name)
+
+    return _scsas[scsa_name]
+
+
+def attach_tables(descriptors: dict) -> None:
+    """Attaches the tables published by the sweep, as initializer of every worker process
+
+    Args:
+        descriptors (dict): Descriptors from SharedTables.descriptors.
+    """
+
+    from shared import attach_codes
+
+    for (board_length, num_colors), codes in attach_codes(descriptors).items():
+
+        get_geometry_cache(board_length, num_colors)["codes"] = codes
+
+
+def set_memory_budget(memory_budget: int) -> None:
+    """Sets up the planner of the representation of the codes for the jobs of the current process
+
+    Args:
+        memory_budget (int): Bytes a player may use for the codes of a geometry, None to not plan.
+    """
+
+    global _planner
+
+    _planner = None if memory_budget is None else MemoryPlanner(memory_budget)
+
+    return
+
+
+def init_worker(descriptors: dict, memory_budget: int) -> None:
+    """Initializer of every worker process, see attach_tables and set_memory_budget
+
+    Args:
+        descriptors (dict): Descriptors from SharedTables.descriptors.
+        memory_budget (int): Bytes a player may use for the codes of a geometry, None to not plan.
+    """
+
+    attach_tables(descriptors)
+    set_memory_budget(memory_budget)
+
+    return
+
+
+def play_job(job: tuple[int, int, str, str, int]) -> dict:
+    """Plays a tournament for one configuration
+
+    Args:
+        job (tuple[int, int, str, str, int]): (board_length, num_colors, player_name, scsa_name, num_rounds).
+
+    Returns:
+        dict: Returns row of results with the keys in FIELDS.
+    """
+
+    board_length, num_colors, player_name, scsa_name, num_rounds = job
+
+    row = dict.fromkeys(FIELDS, "")
+    row.update(
+        {
+            "board_length": board_length,
+            "num_colors": num_colors,
+            "player_name": player_name,
+            "scsa_name": scsa_name,
+        }
+    )
+
+    start = time.time()
+
+    try:
+
+        player = get_player(player_name, board_length, num_colors)
+        scsa = get_scsa(scsa_name)
+        colors = default_colors(num_colors)
+        mastermind = Mastermind(board_length, colors, planner=_planner)
+        results = mastermind.play_tournament(player, scsa, num_rounds, verbose=False)
+
+        row.update(
+            {
+                "rounds": results.get_number_of_rounds(),
+                "wins": results.get_number_of_wins(),
+                "losses": results.get_number_of_losses(),
+                "failures": results.get_number_of_failures(),
+                "score": results.score,
+            }
+        )
+
+    except Exception as error:  # A bad configuration must not stop the rest of the sweep.
+
+        row["error"] = type(error).__name__ + ": " + str(error)
+
+    row["seconds"] = round(time.time() - start, 6)
+
+    return row
+
+
+def play_jobs(jobs: list[tuple[int, int, str, str, int]]) -> list[dict]:
+    """Plays a batch of jobs that share the same geometry in one worker
+
+    Args:
+        jobs (list[tuple[int, int, str, str, int]]): Jobs to play.
+
+    Returns:
+        list[dict]: Returns one row of results per job.
+    """
+
+    return [play_job(job) for job in jobs]
+
+
+def make_tasks(
+    jobs: list[tuple[int, int, str, str, int]], num_workers: int
+) -> list[list[tuple[int, int, str, str, int]]]:
+    """Groups jobs into tasks so that each task only contains a single geometry
+
+    Args:
+        jobs (list[tuple[int, int, str, str, int]]): All jobs of the sweep.
+        num_workers (int): Number of worker processes.
+
+    Returns:
+        list[list[tuple[int, int, str, str, int]]]: Returns list of tasks, each a list of jobs.
+    """
+
+    # Small enough to keep every worker busy, large enough to reuse warm caches
+    task_size = max(1, len(jobs) // (4 * num_workers))
+    tasks = []
+
+    for _, group in itertools.groupby(jobs, key=lambda job: job[:2]):
+
+        group = list(group)
+
+        for i in range(0, len(group), task_size):
+
+            tasks.append(group[i : i + task_size])
+
+    return tasks
+
+
+def sweep(
+    board_lengths: list[int],
+    num_colors: list[int],
+    player_names: list[str],
+    scsa_names: list[str],
+    num_rounds: int,
+    output,
+    num_workers: int = 1,
+    share_tables: bool = True,
+    memory_budget: int = None,
+) -> int:
+    """Plays a tournament for every combination of the given configurations
+
+    Args:
+        board_lengths (list[int]): Numbers of pegs.
+        num_colors (list[int]): Numbers of colors.
+        player_names (list[str]): Names of players.
+        scsa_names (list[str]): Names of SCSAs.
+        num_rounds (int): Number of rounds per tournament.
+        output (file): File object that consolidated CSV results are streamed to.
+        num_workers (int, optional): Number of worker processes, 1 plays in this process. Defaults to 1.
+        share_tables (bool, optional): Whether to publish the code space of every geometry in shared memory once,
+                                       instead of letting each worker enumerate its own. Defaults to True.
+        memory_budget (int, optional): Bytes a player may use for the codes of a geometry, which picks their
+                                       representation (see planning.py), None to not plan. Defaults to None.
+
+    Returns:
+        int: Returns number of tournaments played.
+    """
+
+    jobs = [
+        (board_length, colors, player_name, scsa_name, num_rounds)
+        for board_length, colors, player_name, scsa_name in itertools.product(
+            board_lengths, num_colors, player_names, scsa_names
+        )
+    ]
+    tasks = make_tasks(jobs, num_workers)
+
+    writer = csv.DictWriter(output, fieldnames=FIELDS)
+    writer.writeheader()
+
+    tables = None
+    set_memory_budget(memory_budget)
+
+    if num_workers == 1:
+
+        batches = map(play_jobs, tasks)
+
+    else:
+
+        descriptors = {}
+
+        if share_tables:
+
+            from shared import SharedTables
+
+            tables = SharedTables()
+
+            try:
+
+                geometries = itertools.product(board_lengths, num_colors)
+
+                for board_length, colors in geometries:
+
+                    if code_space_size(board_length, colors) > MAX_SHARED_CODES:
+
+                        continue
+
+                    plan = None
+
+                    if _planner is not None:
+
+                        plan = _planner.plan(board_length, colors)
+
+                    # Players of geometries planned as sampling do not enumerate the codes
+                    if plan is not None and plan.representation == "sampling":
+
+                        continue
+
+                    tables.publish(board_length, default_colors(colors))
+
+            except BaseException:
+
+                tables.close()
+
+                raise
+
+            descriptors = tables.descriptors()
+
+        pool = multiprocessing.Pool(
+            num_workers, init_worker, (descriptors, memory_budget)
+        )
+        batches = pool.imap_unordered(play_jobs, tasks)
+
+    completed = False
+
+    try:
+
+        for rows in batches:
+
+            writer.writerows(rows)
+            output.flush()
+
+        completed = True
+
+    finally:
+
+        if num_workers != 1:
+
+            # A failed or interrupted sweep does not wait for the tasks still queued
+            if completed:
+
+                pool.close()
+
+            else:
+
+                pool.terminate()
+
+            pool.join()
+
+        # The workers have exited, so nothing is attached to the tables anymore
+        if tables is not None:
+
+            tables.close()
+
+    return len(jobs)
+
+
+def build_parser() -> argparse.ArgumentParser:
+
+    from main import PLAYER_NAMES, SCSA_NAMES
+
+    parser = argparse.ArgumentParser(
+        prog="main.py sweep",
+        description="Play tournaments of Mastermind for many configurations.",
+    )
+    parser.add_argument("--board_length", nargs="+", type=str, required=True)
+    parser.add_argument("--num_colors", nargs="+", type=str, required=True)
+    parser.add_argument(
+        "--player_name",
+        nargs="+",
+        type=str,
+        required=True,
+        help="Any of " + ", ".join(PLAYER_NAMES) + " or all.",
+    )
+    parser.add_argument(
+        "--scsa_name",
+        nargs="+",
+        type=str,
+        required=True,
+        help="Any of " + ", ".join(SCSA_NAMES) + " or all.",
+    )
+    parser.add_argument("--num_rounds", nargs="?", type=int, required=True)
+    parser.add_argument("--workers", nargs="?", type=int, default=os.cpu_count())
+    parser.add_argument("--output", nargs="?", type=str, default="-")
+    parser.add_argument(
+        "--no_shared_tables",
+        action="store_true",
+        help="Let every worker enumerate its own code spaces instead of sharing them.",
+    )
+    parser.add_argument(
+        "--memory_budget",
+        nargs="?",
+        type=int,
+        help="Megabytes a player may use for the codes of a geometry, see planning.py.",
+    )
+
+    return parser
+
+
+def run_sweep(argv: list[str]) -> None:
+
+    from main import PLAYER_NAMES, SCSA_NAMES
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    try:
+
+        board_lengths = parse_values(args.board_length)
+        num_colors = parse_values(args.num_colors)
+        player_names = parse_names(args.player_name, PLAYER_NAMES)
+        scsa_names = parse_names(args.scsa_name, SCSA_NAMES)
+
+    except ValueError as error:
+
+        parser.error(str(error))
+
+    if any(colors < 1 or colors > len(DEFAULT_SYMBOLS) for colors in num_colors):
+
+        parser.error(
+            "--num_colors must be between 1 and " + str(len(DEFAULT_SYMBOLS)) + "."
+        )
+
+    memory_budget = None
+
+    if args.memory_budget is not None:
+
+        import logging
+
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+        memory_budget = args.memory_budget * 2**20
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+
+    try:
+
+        sweep(
+            board_lengths,
+            num_colors,
+            player_names,
+            scsa_names,
+            args.num_rounds,
+            output,
+            max(1, args.workers),
+            not args.no_shared_tables,
+            memory_budget,
+        )
+
+    finally:
+
+        if output is not sys.stdout:
+
+            output.close()
@@ -0,0 +1,140 @@
+# File contains symmetry reduction of candidate guesses.
+# Two guesses are equivalent if one maps to the other by relabeling colors that have not been used in any
+# previous guess and by permuting positions that every previous guess treats the same way. When the possible
+# answers are all codes consistent with the history, equivalent guesses split them into partitions of the
+# same sizes, so a player that scores guesses only needs to score one guess per equivalence class.
+
+import itertools
+import math
+
+
+class GuessSymmetry:
+    """Canonicalizes guesses under the symmetries left by a history of guesses"""
+
+    def __init__(self, board_length: int, colors: list[str], history_guesses: list[str]):
+        """Constructor for GuessSymmetry
+
+        Args:
+            board_length (int): Number of pegs.
+            colors (list[str]): All possible colors that can be used to generate a code.
+            history_guesses (list[str]): Guesses made so far in the round.
+        """
+
+        self.board_length = board_length
+        self.colors = colors
+        self.color_index = {color: i for i, color in enumerate(colors)}
+
+        used = set("".join(history_guesses))
+        self.free_colors = [color for color in colors if color not in used]
+        self.free_set = set(self.free_colors)
+
+        # Positions with the same column across all previous guesses are interchangeable
+        classes = {}
+
+        for i in range(board_length):
+
+            column = tuple(guess[i] for guess in history_guesses)
+            classes.setdefault(column, []).append(i)
+
+        self.position_classes = list(classes.values())
+
+    def canonicalize(self, guess: str) -> str:
+        """Finds the canonical representative of the equivalence class of a guess
+
+        Args:
+            guess (str): Guess of secret code.
+
+        Returns:
+            str: Returns guess equivalent to the given guess, which is the same for every guess in its class.
+        """
+
+        class_colors = [[guess[i] for i in positions] for positions in self.position_classes]
+
+        # A free color is described by how often it appears in each position class; free colors with the
+        # same description are interchangeable, so sorting them by description fixes the relabeling
+        signatures = {}
+
+        for c, pegs in enumerate(class_colors):
+
+            for peg in pegs:
+
+                if peg in self.free_set:
+
+                    signature = signatures.setdefault(peg, [0] * len(class_colors))
+                    signature[c] += 1
+
+        order = sorted(signatures, key=lambda color: signatures[color], reverse=True)
+        relabel = dict(zip(order, self.free_colors))
+
+        canonical = [None] * self.board_length
+
+        for positions, pegs in zip(self.position_classes, class_colors):
+
+            pegs = sorted(
+                (relabel.get(peg, peg) for peg in pegs), key=self.color_index.get
+            )
+
+            for i, peg in zip(positions, pegs):
+
+                canonical[i] = peg
+
+        return "".join(canonical)
+
+    def count_class_candidates(self) -> int:
+        """Computes number of guesses canonical_guesses canonicalizes
+
+        Returns:
+            int: Returns product over position classes of the number of color multisets of the class.
+        """
+
+        num_colors = len(self.colors)
+
+        return math.prod(
+            math.comb(num_colors + len(positions) - 1, len(positions))
+            for positions in self.position_classes
+        )
+
+    def canonical_guesses(self) -> list[str]:
+        """Enumerates one representative guess for every equivalence class
+
+        Returns:
+            list[str]: Returns canonical guesses in a deterministic order.
+        """
+
+        multisets = [
+            itertools.combinations_with_replacement(self.colors, len(positions))
+            for positions in self.position_classes
+        ]
+        representatives = {}
+
+        for choice in itertools.product(*multisets):
+
+            guess = [None] * self.board_length
+
+            for positions, pegs in zip(self.position_classes, choice):
+
+                for i, peg in zip(positions, pegs):
+
+                    guess[i] = peg
+
+            representatives.setdefault(self.canonicalize("".join(guess)), None)
+
+        return list(representatives)
+
+    def reduce(self, guesses: list[str]) -> list[str]:
+        """Keeps the first guess of every equivalence class
+
+        Args:
+            guesses (list[str]): Candidate guesses.
+
+        Returns:
+            list[str]: Returns one guess per equivalence class among the candidate guesses.
+        """
+
+        representatives = {}
+
+        for guess in guesses:
+
+            representatives.setdefault(self.canonicalize(guess), guess)
+
+        return list(representatives.values())
@@ -0,0 +1,558 @@
+# File contains a compact binary format for traces of rounds: answer, guesses, responses and time of every guess.
+# Rounds are encoded and written by a background thread, so recording costs the playing thread one queue put per round.
+# Traces are replayed to check that a player still makes the same guesses, or re-scored without playing again.
+#
+# A trace file is a header (magic, version) followed by records that are appended and read as a stream.
+# Every record is a type byte and the uint32 length of its body, all numbers are little-endian:
+#   b"G": geometry of the rounds that follow, board_length (uint16), colors and SCSA name (length-prefixed UTF-8)
+#   b"R": one round, result (uint8), answer (length-prefixed UTF-8), number of guesses n (uint16), then the byte
+#         lengths of the n guesses (uint16), the guesses (UTF-8), n pairs of exact and other pins (uint16)
+#         and n seconds spent making the guesses (float32)
+
+import array
+import os
+import queue
+import struct
+import sys
+import threading
+from mastermind import Result, Results
+from player import Player
+
+MAGIC = b"MMTR"
+VERSION = 1
+
+HEADER = struct.Struct("<4sH")
+RECORD = struct.Struct("<cI")
+GEOMETRY = b"G"
+ROUND = b"R"
+
+
+class RoundTrace:
+    """Answer, guesses, responses and time of every guess of a round"""
+
+    __slots__ = (
+        "board_length",
+        "colors",
+        "scsa_name",
+        "answer",
+        "result",
+        "guesses",
+        "responses",
+        "latencies",
+    )
+
+    def __init__(
+        self,
+        board_length: int,
+        colors: list[str],
+        scsa_name: str,
+        answer: str,
+        result: Result,
+        guesses: list[str],
+        responses: list[tuple[int, int]],
+        latencies: list[float],
+    ):
+        """Constructor for RoundTrace
+
+        Args:
+            board_length (int): Number of pegs.
+            colors (list[str]): All possible colors that can be used to generate a code.
+            scsa_name (str): Name of SCSA used to generate secret code.
+            answer (str): Answer of the round.
+            result (Result): Result of the round (WIN, LOSS, or FAILURE).
+            guesses (list[str]): Guesses made in the round.
+            responses (list[tuple[int, int]]): (exact, other) response to each guess.
+            latencies (list[float]): Seconds spent making each guess.
+        """
+
+        self.board_length = board_length
+        self.colors = colors
+        self.scsa_name = scsa_name
+        self.answer = answer
+        self.result = result
+        self.guesses = guesses
+        self.responses = responses
+        self.latencies = latencies
+
+    def __eq__(self, other) -> bool:
+
+        if not isinstance(other, RoundTrace):
+
+            return NotImplemented
+
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+
+def little_endian(column: array.array) -> bytes:
+
+    if sys.byteorder == "big":
+
+        column = array.array(column.typecode, column)
+        column.byteswap()
+
+    return column.tobytes()
+
+
+def from_little_endian(typecode: str, data: bytes) -> array.array:
+
+    column = array.array(typecode, data)
+
+    if sys.byteorder == "big":
+
+        column.byteswap()
+
+    return column
+
+
+def pack_text(text: str) -> bytes:
+
+    data = text.encode("utf-8")
+
+    return struct.pack("<H", len(data)) + data
+
+
+def unpack_text(data: bytes, offset: int) -> tuple[str, int]:
+
+    (length,) = struct.unpack_from("<H", data, offset)
+    offset += 2
+
+    return data[offset : offset + length].decode("utf-8"), offset + length
+
+
+def encode_geometry(board_length: int, colors: list[str], scsa_name: str) -> bytes:
+    """Encodes the body of a geometry record
+
+    Args:
+        board_length (int): Number of pegs.
+        colors (list[str]): All possible colors that can be used to generate a code.
+        scsa_name (str): Name of SCSA used to generate secret code.
+
+    Returns:
+        bytes: Returns body of record.
+    """
+
+    return struct.pack("<H", board_length) + pack_text("".join(colors)) + pack_text(scsa_name)
+
+
+def encode_round(trace: RoundTrace) -> bytes:
+    """Encodes the body of a round record
+
+    Args:
+        trace (RoundTrace): Trace of round.
+
+    Returns:
+        bytes: Returns body of record.
+    """
+
+    # Invalid guesses of a FAILURE, which may not be strings, are stored as text
+    guesses = [
+        str(guess).encode("utf-8", "backslashreplace") for guess in trace.guesses
+    ]
+    pins = array.array("H", [pin for response in trace.responses for pin in response])
+
+    return b"".join(
+        [
+            struct.pack("<B", trace.result.value),
+            pack_text(trace.answer),
+            struct.pack("<H", len(guesses)),
+            little_endian(array.array("H", map(len, guesses))),
+            b"".join(guesses),
+            little_endian(pins),
+            little_endian(array.array("f", trace.latencies)),
+        ]
+    )
+
+
+def decode_round(
+    data: bytes, board_length: int, colors: list[str], scsa_name: str
+) -> RoundTrace:
+    """Decodes the body of a round record
+
+    Args:
+        data (bytes): Body of record.
+        board_length (int): Number of pegs, from the last geometry record.
+        colors (list[str]): All possible colors, from the last geometry record.
+        scsa_name (str): Name of SCSA, from the last geometry record.
+
+    Returns:
+        RoundTrace: Returns trace of round.
+    """
+
+    result = Result(data[0])
+    answer, offset = unpack_text(data, 1)
+    (num_guesses,) = struct.unpack_from("<H", data, offset)
+    offset += 2
+
+    lengths = from_little_endian("H", data[offset : offset + 2 * num_guesses])
+    offset += 2 * num_guesses
+
+    guesses = []
+
+    for length in lengths:
+
+        guesses.append(data[offset : offset + length].decode("utf-8"))
+        offset += length
+
+    pins = from_little_endian("H", data[offset : offset + 4 * num_guesses])
+    offset += 4 * num_guesses
+    latencies = from_little_endian("f", data[offset : offset + 4 * num_guesses])
+
+    return RoundTrace(
+        board_length,
+        colors,
+        scsa_name,
+        answer,
+        result,
+        guesses,
+        list(zip(pins[::2], pins[1::2])),
+        latencies.tolist(),
+    )
+
+
+class TraceWriter:
+    """Appends traces of rounds to a file from a background thread
+
+    Pass it as the recorder of Round.play_round or Mastermind.play_tournament. The queue of rounds that
+    are not written yet is bounded, so a playing thread that outruns the disk waits instead of filling memory.
+    """
+
+    def __init__(self, file_name: str, queue_size: int = 1024):
+        """Constructor for TraceWriter, which starts the writer thread
+
+        Args:
+            file_name (str): Name of file to append to, created if it does not exist.
+            queue_size (int, optional): Number of rounds that can wait to be written. Defaults to 1024.
+
+        Raises:
+            ValueError: File exists, but is not a trace file of a supported version.
+        """
+
+        if os.path.exists(file_name) and os.path.getsize(file_name) > 0:
+
+            read_header(file_name)
+
+            # A record cut off by a crash would make every record appended after it unreadable
+            size = complete_size(file_name)
+
+            if size < os.path.getsize(file_name):
+
+                os.truncate(file_name, size)
+
+        self.file = open(file_name, "ab")
+
+        if self.file.tell() == 0:
+
+            self.file.write(HEADER.pack(MAGIC, VERSION))
+
+        self.queue = queue.Queue(queue_size)
+        self.geometry = None  # Geometry of the last record written by this writer
+        self.error = None  # First exception raised by the writer thread
+        self.broken = False  # Whether writing to the file failed, after which nothing is written
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def __enter__(self) -> "TraceWriter":
+
+        return self
+
+    def __exit__(self, *exc) -> None:
+
+        self.close()
+
+    def record(
+        self,
+        round,
+        result: Result,
+        guesses: list[str],
+        responses: list[tuple[int, int]],
+        latencies: list[float],
+    ) -> None:
+        """Queues a round played by Round.play_round
+
+        Args:
+            round (Round): Round that was played.
+            result (Result): Result of the round (WIN, LOSS, or FAILURE).
+            guesses (list[str]): Guesses made in the round.
+            responses (list[tuple[int, int]]): (exact, other) response to each guess.
+            latencies (list[float]): Seconds spent making each guess.
+        """
+
+        self.write(
+            RoundTrace(
+                round.board_length,
+                round.colors,
+                round.scsa_name,
+                round.answer,
+                result,
+                guesses,
+                responses,
+                latencies,
+            )
+        )
+
+    def write(self, trace: RoundTrace) -> None:
+        """Queues a trace, waiting while the queue is full
+
+        Args:
+            trace (RoundTrace): Trace of round.
+
+        Raises:
+            ValueError: Writer is closed.
+        """
+
+        if self.file.closed:
+
+            raise ValueError("Trace writer is closed.")
+
+        self.queue.put(trace)
+
+    def run(self) -> None:
+
+        while True:
+
+            trace = self.queue.get()
+
+            if trace is None:
+
+                break
+
+            # After a failed write the rest of the queue is still taken, so that the playing thread does not wait forever
+            if self.broken:
+
+                continue
+
+            geometry = (trace.board_length, tuple(trace.colors), trace.scsa_name)
+            records = b""
+
+            # A round that can not be encoded is left out, the rounds after it are still written
+            try:
+
+                if geometry != self.geometry:
+
+                    body = encode_geometry(
+                        trace.board_length, trace.colors, trace.scsa_name
+                    )
+                    records += RECORD.pack(GEOMETRY, len(body)) + body
+
+                body = encode_round(trace)
+                records += RECORD.pack(ROUND, len(body)) + body
+
+            except Exception as error:
+
+                self.error = self.error or error
+
+                continue
+
+            try:
+
+                self.file.write(records)
+                self.geometry = geometry
+
+            except Exception as error:
+
+                self.error = self.error or error
+                self.broken = True
+
+    def close(self) -> None:
+        """Writes the queued rounds and closes the file
+
+        Raises:
+            Exception: First error of the writer thread, if a round could not be encoded or written.
+        """
+
+        if self.file.closed:
+
+            return
+
+        self.queue.put(None)
+        self.thread.join()
+        self.file.close()
+
+        if self.error is not None:
+
+            raise self.error
+
+
+def read_header(file_name: str) -> None:
+
+    with open(file_name, "rb") as file:
+
+        data = file.read(HEADER.size)
+
+    if len(data) < HEADER.size or HEADER.unpack(data)[0] != MAGIC:
+
+        raise ValueError("Not a trace file.")
+
+    if HEADER.unpack(data)[1] != VERSION:
+
+        raise ValueError("Unsupported trace file version.")
+
+
+def complete_size(file_name: str) -> int:
+    """Finds the size of the header and the records of a trace file that were written completely
+
+    Args:
+        file_name (str): Name of trace file.
+
+    Returns:
+        int: Returns offset of the end of the last complete record.
+    """
+
+    size = HEADER.size
+    file_size = os.path.getsize(file_name)
+
+    with open(file_name, "rb") as file:
+
+        while True:
+
+            file.seek(size)
+            head = file.read(RECORD.size)
+
+            if len(head) < RECORD.size:
+
+                return size
+
+            _, length = RECORD.unpack(head)
+
+            if size + RECORD.size + length > file_size:
+
+                return size
+
+            size += RECORD.size + length
+
+
+def read_traces(file_name: str):
+    """Reads the rounds of a trace file one at a time
+
+    A round that is cut off at the end of the file, as while it is still being written, ends the stream.
+
+    Args:
+        file_name (str): Name of file to read from.
+
+    Raises:
+        ValueError: File is not a trace file of a supported version, or a round has no geometry.
+
+    Yields:
+        RoundTrace: Trace of round, in the order they were written.
+    """
+
+    read_header(file_name)
+    geometry = None
+
+    with open(file_name, "rb") as file:
+
+        file.seek(HEADER.size)
+
+        while True:
+
+            head = file.read(RECORD.size)
+
+            if len(head) < RECORD.size:
+
+                return
+
+            kind, length = RECORD.unpack(head)
+            body = file.read(length)
+
+            if len(body) < length:
+
+                return
+
+            if kind == GEOMETRY:
+
+                (board_length,) = struct.unpack_from("<H", body)
+                colors, offset = unpack_text(body, 2)
+                scsa_name, _ = unpack_text(body, offset)
+                geometry = (board_length, list(colors), scsa_name)
+
+            elif kind == ROUND:
+
+                if geometry is None:
+
+                    raise ValueError("Round before geometry in trace file.")
+
+                yield decode_round(body, *geometry)
+
+            # Records of unknown types are skipped, so that later versions can add records to old readers
+
+
+def replay(player: Player, trace: RoundTrace):
+    """Drives a player with the responses of a trace and compares its guesses with the recorded ones
+
+    Args:
+        player (Player): Player to replay, which should make the recorded guesses.
+        trace (RoundTrace): Trace of round.
+
+    Returns:
+        int or None: Returns index of the first guess that differs from the trace, None if all are the same.
+    """
+
+    response = (0, 0, 0)
+
+    for i, guess in enumerate(trace.guesses):
+
+        made = player.make_guess(
+            trace.board_length, trace.colors, trace.scsa_name, response
+        )
+
+        if made != guess:
+
+            return i
+
+        response = (*trace.responses[i], i + 1)
+
+    return None
+
+
+def verify(player: Player, traces) -> list[tuple[int, int]]:
+    """Replays every round of a stream of traces
+
+    Args:
+        player (Player): Player to replay.
+        traces (iterable[RoundTrace]): Traces of rounds, e.g. read_traces(file_name).
+
+    Returns:
+        list[tuple[int, int]]: Returns (index of round, index of guess) of the first different guess of every round
+                               in which the player did not make the recorded guesses.
+    """
+
+    mismatches = []
+
+    for round_index, trace in enumerate(traces):
+
+        guess_index = replay(player, trace)
+
+        if guess_index is not None:
+
+            mismatches.append((round_index, guess_index))
+
+    return mismatches
+
+
+def rescore(traces, score_round) -> Results:
+    """Scores the rounds of a stream of traces again, without playing them
+
+    Args:
+        traces (iterable[RoundTrace]): Traces of rounds, e.g. read_traces(file_name).
+        score_round (function): Score of a round from its Result and number of guesses,
+                                e.g. Mastermind.score_round.
+
+    Returns:
+        Results: Returns results of the rounds, with the time spent making guesses as duration.
+    """
+
+    results = Results()
+
+    for trace in traces:
+
+        guesses = len(trace.guesses)
+        results.record_result(
+            trace.result,
+            guesses,
+            sum(trace.latencies),
+            score_round(trace.result, guesses),
+        )
+
+    return results